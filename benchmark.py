@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Benchmark do UT-SOCIOS com dados sintéticos
+UT-SOCIOS - Sistema de Gestão de Sócios
+
+Popula um banco local (vazio ou descartável) do backend configurado
+(DB_BACKEND: SQLite ou PostgreSQL) com volumes configuráveis e mede as
+funções de dados e a renderização das páginas. Os dados são gravados pelos
+métodos em lote do banco (execute_many, copy_from_rows), iguais nos dois
+backends e para a mesma seed. O relatório em JSON tem chaves ordenadas
+para ser comparado entre versões.
+
+Uso:
+    DB_BACKEND=sqlite DB_PATH=/tmp/ut_bench.db python benchmark.py --popular
+    DATABASE_URL=postgresql://postgres@localhost/ut_bench python benchmark.py --popular
+    python benchmark.py --socios 10000 --faturas 200000 --popular
+    python benchmark.py --saida depois.json --comparar antes.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+from datetime import date, datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import config.database
+from config.database import Database
+from config.dialeto import get_sql_dialect
+from config.migracoes import migrate, verify_indexes
+from utils.faturamento import add_months
+
+NOMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela", "João",
+         "Karina", "Lucas", "Mariana", "Nicolas", "Olívia", "Pedro", "Rafaela", "Sérgio", "Tatiane", "Vinícius"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+              "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa"]
+CIDADES = [("Florianópolis", "SC"), ("Joinville", "SC"), ("Porto Alegre", "RS"), ("Curitiba", "PR"), ("São Paulo", "SP")]
+TAMANHOS = ["PP", "P", "M", "G", "GG", "XG", "XXG"]
+FORMAS_PAGAMENTO = ["A vista", "Parcelado no Cartão", "Dinheiro", "Cartão a vista", "PIX", "Em mãos"]
+
+class BenchDatabase(Database):
+    """Database que conta consultas com erro (execute_query retorna None)"""
+
+    def __init__(self):
+        super().__init__()
+        self.erros = 0
+
+    def execute_query(self, query, params=None, fetch=False):
+        result = super().execute_query(query, params, fetch)
+        if result is None:
+            self.erros += 1
+        return result
+
+def gerar_cpf(base):
+    """CPF válido a partir de um número de 9 dígitos"""
+    digitos = [int(d) for d in f"{base:09d}"]
+    for peso in (10, 11):
+        soma = sum(d * (peso - i) for i, d in enumerate(digitos))
+        resto = soma % 11
+        digitos.append(0 if resto < 2 else 11 - resto)
+    return ''.join(str(d) for d in digitos)
+
+def aplicar_schema(db):
+    """Aplicar as migrações pendentes (pasta migrations/)"""
+    migrate(db, on_apply=lambda versao, nome: print(f"   📄 {versao:04d} {nome}"))
+
+def limpar(db):
+    """Apagar faturas, sócios e comandos, reiniciando os ids"""
+    if get_sql_dialect(db).nome == 'sqlite':
+        for tabela in ['faturas', 'socios', 'comandos', 'faturas_monthly']:
+            db.execute_query(f"DELETE FROM {tabela}")
+        db.execute_query("DELETE FROM sqlite_sequence WHERE name IN ('faturas', 'socios', 'comandos')")
+    else:
+        db.execute_query("TRUNCATE faturas, socios, comandos RESTART IDENTITY CASCADE")
+
+def popular(db, comandos, socios, faturas, seed):
+    """Apagar os dados e gerar comandos, sócios (CPFs válidos) e faturas"""
+    rnd = random.Random(seed)
+    limpar(db)
+    db.execute_many("INSERT INTO comandos (nome) VALUES (%s)", [(f"Comando {i}",) for i in range(1, comandos + 1)])
+    planos = [(p['id'], p['periodicidade']) for p in db.execute_query("SELECT id, periodicidade FROM planos ORDER BY id", fetch=True) or []]
+
+    # Sócios em lote (CPFs distintos e válidos), gerados sob demanda
+    inicio = time.time()
+    bases = rnd.sample(range(1, 999999999), socios)
+
+    def linhas_socios():
+        for i, base in enumerate(bases, start=1):
+            nome = f"{rnd.choice(NOMES)} {rnd.choice(SOBRENOMES)} {rnd.choice(SOBRENOMES)}"
+            cidade, estado = rnd.choice(CIDADES)
+            plano = rnd.choice(planos) if rnd.random() < 0.8 else None
+            adesao = date.fromordinal(date.today().toordinal() - rnd.randint(0, 1800))
+            vencimento = date.fromordinal(date.today().toordinal() + rnd.randint(-30, 330)) if plano else None
+            yield (
+                nome, gerar_cpf(base),
+                date(rnd.randint(1950, 2008), rnd.randint(1, 12), rnd.randint(1, 28)),
+                f"socio{i}@exemplo.com.br", f"479{rnd.randint(10000000, 99999999)}", rnd.choice(TAMANHOS),
+                rnd.randint(1, comandos), plano[0] if plano else None,
+                adesao if plano else None, vencimento,
+                f"{rnd.randint(10000000, 99999999)}", f"Rua {rnd.choice(SOBRENOMES)}", str(rnd.randint(1, 3000)),
+                f"Bairro {rnd.randint(1, 200)}", cidade, estado
+            )
+
+    db.copy_from_rows('socios', [
+        'nome_completo', 'cpf', 'data_nascimento', 'email', 'telefone', 'tamanho_camisa', 'comando_id',
+        'plano_id', 'data_adesao_plano', 'data_vencimento_plano', 'cep', 'endereco', 'numero', 'bairro',
+        'cidade', 'estado'
+    ], linhas_socios(), chunk_size=50000)
+    print(f"   👥 {socios} sócios em {time.time() - inicio:.1f}s")
+
+    # Faturas mensais por sócio (um período por mês, como o faturamento recorrente)
+    inicio = time.time()
+    cadastrados = [(s['id'], s['comando_id'], s['plano_id'])
+                   for s in db.execute_query("SELECT id, comando_id, plano_id FROM socios ORDER BY id", fetch=True) or []]
+    hoje = date.today()
+
+    def linhas_faturas():
+        for g in range(faturas if cadastrados else 0):
+            socio_id, comando_id, plano_id = cadastrados[g % len(cadastrados)]
+            vencimento = date.fromordinal(add_months(date(2020, 1, 1), g // len(cadastrados)).toordinal() + socio_id % 28)
+            sorteio = rnd.random()
+            pago = sorteio < 0.7
+            status = 'Pago' if pago else 'Atrasado' if vencimento < hoje else 'Pendente'
+            yield (
+                socio_id, comando_id, plano_id, [30, 50, 80, 100, 250][socio_id % 5], 'Mensalidade',
+                vencimento, add_months(vencimento, 1), vencimento,
+                date.fromordinal(vencimento.toordinal() - round(sorteio * 10)) if pago else None,
+                status, FORMAS_PAGAMENTO[g % 6] if pago else None
+            )
+
+    db.copy_from_rows('faturas', [
+        'socio_id', 'comando_id', 'plano_id', 'valor', 'descricao', 'data_vencimento', 'data_renovacao',
+        'periodo', 'data_pagamento', 'status', 'forma_pagamento'
+    ], linhas_faturas(), chunk_size=50000)
+    print(f"   💰 {faturas} faturas em {time.time() - inicio:.1f}s")
+
+    db.execute_query("REFRESH MATERIALIZED VIEW dashboard_resumo")
+    db.execute_query("ANALYZE")
+
+def versao_banco(db):
+    """Backend e versão do servidor para o relatório"""
+    if get_sql_dialect(db).nome == 'sqlite':
+        return f"sqlite {sqlite3.sqlite_version}"
+    return f"postgres {db.execute_query_one('SHOW server_version')['server_version']}"
+
+def medir(nome, func, repeticoes, db):
+    """Executar func (1 aquecimento + repetições) e resumir os tempos em ms"""
+    tempos, erros, mensagem = [], 0, None
+    for i in range(repeticoes + 1):
+        erros_antes = db.erros
+        inicio = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            erros += 1
+            mensagem = f"{type(e).__name__}: {e}"
+            if os.getenv('BENCH_DEBUG'):
+                traceback.print_exc()
+        duracao = (time.perf_counter() - inicio) * 1000
+        erros += db.erros - erros_antes
+        if i > 0:
+            tempos.append(duracao)
+
+    tempos.sort()
+    resultado = {
+        'min_ms': round(tempos[0], 2),
+        'mediana_ms': round(statistics.median(tempos), 2),
+        'p95_ms': round(tempos[min(len(tempos) - 1, int(len(tempos) * 0.95))], 2),
+        'max_ms': round(tempos[-1], 2),
+        'erros': erros
+    }
+    if mensagem:
+        resultado['ultimo_erro'] = mensagem
+    status = "❌" if erros else "✅"
+    print(f"   {status} {nome:<40} mediana {resultado['mediana_ms']:>9.2f} ms   p95 {resultado['p95_ms']:>9.2f} ms")
+    return resultado
+
+def renderizar(pagina, acao=None):
+    """Renderizar uma página completa com o AppTest do Streamlit"""
+    from streamlit.testing.v1 import AppTest
+
+    import streamlit as st
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+    def executar():
+        st.cache_data.clear()  # Medir a página sem cache de consultas
+        at = AppTest.from_file(main_path, default_timeout=120)
+        at.session_state['user_id'] = 1
+        at.session_state['username'] = 'benchmark'
+        if acao:
+            at.session_state[acao[0]] = acao[1]
+        at.run()
+        at.sidebar.selectbox[0].select(pagina).run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+    return executar
+
+def benchmarks(db):
+    """Funções medidas (nome -> função sem argumentos)"""
+    # Importar as páginas só depois de trocar config.database.db
+    from pages import dashboard, socios, planos, comandos, faturas
+    from utils.search_index import SearchIndex
+    from utils.faturamento import marcar_atrasadas
+    from utils.relatorios import get_comando_report, get_monthly_rollup, get_trends
+
+    primeiro_comando = (db.execute_query_one("SELECT MIN(id) AS id FROM comandos") or {}).get('id') or 0
+    amostra_ids = tuple(r['id'] for r in db.execute_query("SELECT id FROM socios ORDER BY id LIMIT 50", fetch=True) or [])
+    meio = db.execute_query_one(
+        "SELECT nome_completo, id FROM socios ORDER BY nome_completo, id LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM socios)"
+    )
+
+    indice = {}
+
+    def construir_indice():
+        index = SearchIndex()
+        for s in db.execute_query("SELECT id, nome_completo, cpf, email, telefone, comando_id FROM socios", fetch=True) or []:
+            index.add(s['id'], s['nome_completo'], s['cpf'], s['email'], s['telefone'], s['comando_id'])
+        indice['index'] = index
+
+    # Funções com cache: medir sempre a versão sem cache
+    return {
+        'dashboard.get_dashboard_data': dashboard.get_dashboard_data,
+        'socios.get_comandos': socios.get_comandos.uncached,
+        'socios.get_socios_page[primeira]': lambda: socios.get_socios_page.uncached(0, None, 50),
+        'socios.get_socios_page[meio]': lambda: socios.get_socios_page.uncached(0, (meio['nome_completo'], meio['id']) if meio else None, 50),
+        'socios.get_socios_page[comando]': lambda: socios.get_socios_page.uncached(primeiro_comando, None, 50),
+        'socios.get_socios_by_ids[50]': lambda: socios.get_socios_by_ids.uncached(amostra_ids),
+        'socios.get_report_data': socios.get_report_data.uncached,
+        'socios.get_planos_report_data': socios.get_planos_report_data.uncached,
+        'search_index.build': construir_indice,
+        'search_index.search[nome]': lambda: indice['index'].search("maria silva"),
+        'search_index.search[cpf]': lambda: indice['index'].search("123.456"),
+        'planos.get_planos': planos.get_planos.uncached,
+        'planos.get_socios_com_planos': planos.get_socios_com_planos.uncached,
+        'faturamento.marcar_atrasadas': marcar_atrasadas,
+        'relatorios.get_comando_report[tudo]': get_comando_report.uncached,
+        'relatorios.get_comando_report[mes]': lambda: get_comando_report.uncached(date(2020, 6, 1), date(2020, 7, 1)),
+        'relatorios.get_monthly_rollup': get_monthly_rollup.uncached,
+        'relatorios.get_trends[comando]': lambda: get_trends.uncached(date(2015, 1, 1), date(2030, 1, 1), 'comando'),
+        'pagina.dashboard': renderizar("🏠 Dashboard"),
+        'pagina.socios': renderizar("👥 Sócios"),
+        'pagina.faturas': renderizar("💰 Faturas"),
+        'pagina.faturas_relatorio': renderizar("💰 Faturas", ('fatura_action', 'report')),
+        'pagina.tendencias': renderizar("📈 Tendências"),
+        'pagina.planos': renderizar("🎫 Planos"),
+        'pagina.comandos': renderizar("🏛️ Comandos")
+    }
+
+def versao_git():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+def comparar(atual, anterior_path):
+    """Imprimir a variação da mediana em relação a um relatório anterior"""
+    with open(anterior_path, encoding='utf-8') as f:
+        anterior = json.load(f)
+    print(f"\n📊 Comparação com {anterior_path} ({anterior['ambiente'].get('versao')})")
+    for nome, medida in sorted(atual['resultados'].items()):
+        antes = anterior['resultados'].get(nome)
+        if not antes:
+            print(f"   🆕 {nome}")
+            continue
+        variacao = (medida['mediana_ms'] - antes['mediana_ms']) / antes['mediana_ms'] * 100 if antes['mediana_ms'] else 0
+        simbolo = "🔺" if variacao > 10 else "🔻" if variacao < -10 else "➖"
+        print(f"   {simbolo} {nome:<40} {antes['mediana_ms']:>9.2f} → {medida['mediana_ms']:>9.2f} ms ({variacao:+.0f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark com dados sintéticos")
+    parser.add_argument("--comandos", type=int, default=100)
+    parser.add_argument("--socios", type=int, default=100000)
+    parser.add_argument("--faturas", type=int, default=2000000)
+    parser.add_argument("--popular", action="store_true", help="Aplicar o schema e (re)gerar os dados (APAGA os dados do banco)")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--filtro", help="Executar só os benchmarks cujo nome contém este texto")
+    parser.add_argument("--saida", default="benchmark_report.json")
+    parser.add_argument("--comparar", help="Relatório anterior para comparação")
+    args = parser.parse_args()
+
+    db = BenchDatabase()
+    if not db.connect():
+        print("❌ Erro ao conectar com o banco de dados")
+        return 1
+    # As páginas importam config.database.db: usar o banco do benchmark
+    config.database.db = db
+
+    if args.popular:
+        print(f"🌱 Populando {getattr(db, 'path', None) or f'{db.host}/{db.database}'}...")
+        aplicar_schema(db)
+        popular(db, args.comandos, args.socios, args.faturas, args.seed)
+
+    volumes = {
+        tabela: db.execute_query_one(f"SELECT COUNT(*) AS total FROM {tabela}")['total']
+        for tabela in ['comandos', 'planos', 'socios', 'faturas']
+    }
+    print(f"\n⏱️ Medindo ({args.repeticoes} repetições): {volumes}")
+
+    resultados = {}
+    for nome, func in benchmarks(db).items():
+        if args.filtro and args.filtro not in nome:
+            continue
+        resultados[nome] = medir(nome, func, args.repeticoes, db)
+
+    relatorio = {
+        'ambiente': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'versao': versao_git(),
+            'python': platform.python_version(),
+            'banco': versao_banco(db),
+            'repeticoes': args.repeticoes,
+            'volumes': volumes
+        },
+        'resultados': resultados,
+        # Consultas de config.migracoes.VERIFICACOES que usam o índice esperado
+        'indices': {indice: ok for _, indice, ok, _ in verify_indexes(db)}
+    }
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(relatorio, f, ensure_ascii=False, indent=2, sort_keys=True)
+    print(f"\n📄 Relatório salvo em {args.saida}")
+
+    if args.comparar:
+        comparar(relatorio, args.comparar)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
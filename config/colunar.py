@@ -0,0 +1,66 @@
+"""
+Resultados de consultas em colunas (pandas.DataFrame ou pyarrow.Table)
+
+Os relatórios leem resultados inteiros para montar tabelas e gráficos. Em
+vez de um dict por linha (RealDictRow) convertido depois num DataFrame,
+as linhas do cursor são lidas em blocos como tuplas e transpostas em uma
+lista por coluna, que vira direto um array do pandas ou do Arrow. NUMERIC
+vira float64 e DATE vira datetime64 (no Arrow, date32).
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+
+def fetch_columns(cursor, chunk_size=5000):
+    """Ler o resultado do cursor (linhas como tupla) em (nomes, uma lista de valores por coluna)"""
+    nomes = [d[0] for d in cursor.description]
+    colunas = [[] for _ in nomes]
+    while True:
+        bloco = cursor.fetchmany(chunk_size)
+        if not bloco:
+            break
+        for coluna, valores in zip(colunas, zip(*bloco)):
+            coluna.extend(valores)
+    return nomes, colunas
+
+def _tipo(valores):
+    """Tipo do primeiro valor não nulo da coluna"""
+    return type(next((v for v in valores if v is not None), None))
+
+def _float(valores):
+    return np.array([np.nan if v is None else float(v) for v in valores], dtype='float64')
+
+def build_frame(nomes, colunas):
+    """DataFrame a partir das colunas de fetch_columns"""
+    series = {}
+    for i, valores in enumerate(colunas):
+        tipo = _tipo(valores)
+        if tipo is Decimal:
+            valores = _float(valores)
+        elif tipo is date:
+            valores = pd.to_datetime(valores)
+        series[i] = pd.Series(valores)
+    frame = pd.DataFrame(series, index=pd.RangeIndex(len(colunas[0]) if colunas else 0))
+    # Colunas por posição: nomes repetidos num SELECT não se sobrescrevem
+    frame.columns = nomes
+    return frame
+
+def build_arrow(nomes, colunas):
+    """pyarrow.Table a partir das colunas de fetch_columns"""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ValueError("Instale o pyarrow para ler resultados em Arrow: pip install pyarrow")
+
+    arrays = []
+    for valores in colunas:
+        tipo = _tipo(valores)
+        if tipo is Decimal:
+            arrays.append(pa.array(_float(valores), from_pandas=True))
+        elif tipo is datetime:
+            arrays.append(pa.array(valores, type=pa.timestamp('us')))
+        else:
+            arrays.append(pa.array(valores))
+    return pa.Table.from_arrays(arrays, names=nomes)
@@ -0,0 +1,33 @@
+"""
+Registro central das consultas mais frequentes
+
+Cada consulta é preparada (PREPARE) uma vez por conexão do pool e depois
+executada pelo nome com db.execute_prepared / db.execute_prepared_one,
+sem novo parse e planejamento no servidor a cada chamada.
+"""
+
+import re
+
+CONSULTAS = {
+    # Sócios
+    'socio_por_id': "SELECT * FROM socios WHERE id = %s",
+    'socio_cpf_em_uso': "SELECT id FROM socios WHERE cpf = %s AND id != %s",
+    'socio_email_em_uso': "SELECT id FROM socios WHERE email = %s AND id != %s",
+    'socio_foto_por_id': "SELECT foto FROM socios WHERE id = %s",
+
+    # Planos, comandos e faturas
+    'plano_por_id': "SELECT * FROM planos WHERE id = %s",
+    'comando_por_id': "SELECT * FROM comandos WHERE id = %s",
+    'fatura_por_id': "SELECT * FROM faturas WHERE id = %s",
+}
+
+def get_consulta(nome):
+    """SQL de uma consulta registrada (placeholders %s)"""
+    if nome not in CONSULTAS:
+        raise KeyError(f"Consulta não registrada: {nome}")
+    return CONSULTAS[nome]
+
+def to_positional(query):
+    """Converter placeholders %s em $1, $2... (sintaxe do PREPARE)"""
+    contador = iter(range(1, query.count('%s') + 1))
+    return re.sub(r'%s', lambda _: f"${next(contador)}", query)
@@ -1,32 +1,38 @@
-import streamlit as st
+"""
+Banco de dados da aplicação
+
+O backend vem de DB_BACKEND ('sqlite' ou 'postgres'). Sem ela, decide a
+DATABASE_URL (postgresql://... no Railway, sqlite:///arquivo.db); sem
+nenhuma das duas, usa o SQLite embutido em DB_PATH. As duas classes têm
+a mesma interface e as páginas só usam a instância global db.
+"""
+
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
-class Database:
-    def __init__(self):
-        # Modo offline - sem conexão com banco
-        self.connection = None
-        self.offline_mode = True
-    
-    def connect(self):
-        # Sempre retorna True em modo offline
-        return True
-    
-    def disconnect(self):
-        # Não faz nada em modo offline
-        pass
-    
-    def execute_query(self, query, params=None, fetch=False):
-        # Modo offline - retorna dados mock ou vazio
-        if fetch:
-            return []
-        return True
-    
-    def execute_query_one(self, query, params=None):
-        # Modo offline - retorna None
-        return None
+BACKENDS = {
+    'sqlite': 'sqlite',
+    'postgres': 'postgres',
+    'postgresql': 'postgres',
+}
+
+def get_backend():
+    """Nome do backend configurado ('sqlite' ou 'postgres')"""
+    backend = os.getenv('DB_BACKEND', '').strip().lower()
+    if not backend:
+        url = os.getenv('DATABASE_URL', '')
+        backend = 'postgres' if url and not url.startswith('sqlite:') else 'sqlite'
+    if backend not in BACKENDS:
+        raise ValueError(f"DB_BACKEND inválido: {backend} (use 'sqlite' ou 'postgres')")
+    return BACKENDS[backend]
+
+# O psycopg2 só é importado quando o PostgreSQL é usado
+if get_backend() == 'postgres':
+    from config.database_postgresql import Database
+else:
+    from config.database_sqlite import Database
 
 # Instância global do banco
 db = Database()
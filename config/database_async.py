@@ -0,0 +1,100 @@
+"""
+Acesso assíncrono ao banco para consultas independentes em paralelo
+
+Cada consulta roda numa thread do executor usando o pool de conexões do
+Database, então N consultas independentes custam a latência da mais lenta
+em vez da soma. Uso nas páginas:
+
+    fatura, socios = run_concurrently(
+        adb.execute_query_one("SELECT * FROM faturas WHERE id = %s", (fatura_id,)),
+        adb.execute_query("SELECT id, nome_completo FROM socios", fetch=True)
+    )
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config.database import db
+from config.instrumentacao import calling_function, set_origin, add_db_time
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+    try:
+        from streamlit.runtime.scriptrunner_utils.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+    except ImportError:  # Streamlit < 1.37
+        from streamlit.runtime.scriptrunner.script_run_context import SCRIPT_RUN_CONTEXT_ATTR_NAME
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
+
+# Página/função que chamou run_concurrently, repassada à instrumentação nas threads
+_origem = contextvars.ContextVar('origem', default=None)
+
+class AsyncDatabase:
+    def __init__(self, database, max_workers=None):
+        self.db = database
+        # Uma thread por conexão do pool; acima disso as consultas esperariam pelo pool mesmo
+        self.max_workers = max_workers or getattr(database, 'pool_max', 10)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db-async")
+
+    async def _run(self, func, *args):
+        """Executar uma chamada bloqueante do Database no executor"""
+        # Repassar o contexto do Streamlit para que st.error funcione na thread
+        ctx = get_script_run_ctx() if get_script_run_ctx else None
+        origem = _origem.get()
+
+        def call():
+            thread = threading.current_thread()
+            if ctx is not None:
+                add_script_run_ctx(thread, ctx)
+            set_origin(origem)
+            try:
+                return func(*args)
+            finally:
+                # A thread do executor é reutilizada por outras sessões: não deixar
+                # o contexto desta chamada para a próxima tarefa
+                set_origin(None)
+                if add_script_run_ctx is not None:
+                    setattr(thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+
+        loop = asyncio.get_running_loop()
+        # Contexto vazio por chamada: ContextVars definidas na thread (inclusive
+        # pelo Streamlit) não passam de uma tarefa para a outra
+        return await loop.run_in_executor(self._executor, contextvars.Context().run, call)
+
+    async def execute_query(self, query, params=None, fetch=False):
+        return await self._run(functools.partial(self.db.execute_query, fetch=fetch), query, params)
+
+    async def execute_query_one(self, query, params=None):
+        return await self._run(self.db.execute_query_one, query, params)
+
+    async def fetch_frame(self, query, params=None):
+        return await self._run(self.db.fetch_frame, query, params)
+
+    async def execute_prepared(self, nome, params=None):
+        return await self._run(self.db.execute_prepared, nome, params)
+
+    async def execute_prepared_one(self, nome, params=None):
+        return await self._run(self.db.execute_prepared_one, nome, params)
+
+    async def call(self, func, *args):
+        """Executar qualquer função bloqueante (ex.: funções com cache) no executor"""
+        return await self._run(func, *args)
+
+def run_concurrently(*coroutines):
+    """Executar as corrotinas em paralelo a partir de código síncrono (páginas)"""
+    async def gather():
+        return await asyncio.gather(*coroutines)
+    token = _origem.set(calling_function())
+    inicio = time.perf_counter()
+    try:
+        return asyncio.run(gather())
+    finally:
+        _origem.reset(token)
+        # A página fica bloqueada pelo tempo total do grupo, não pela soma das consultas
+        add_db_time(time.perf_counter() - inicio, len(coroutines))
+
+# Instância global
+adb = AsyncDatabase(db)
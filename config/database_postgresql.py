@@ -1,13 +1,63 @@
 import psycopg2
+import psycopg2.extras
+from psycopg2 import pool
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
 from psycopg2.extras import RealDictCursor
 import streamlit as st
 import os
+import threading
+import time
 import urllib.parse as urlparse
+import weakref
+from contextlib import contextmanager
+from itertools import islice
 from dotenv import load_dotenv
+from config.colunar import fetch_columns, build_frame, build_arrow
+from config.consultas import get_consulta, to_positional
+from config.instrumentacao import QueryProfiler
 
 load_dotenv()
 
+# NUMERIC lido como float nas leituras em colunas (sem um Decimal por valor)
+NUMERIC_FLOAT = psycopg2.extensions.new_type(
+    psycopg2.extensions.DECIMAL.values, 'NUMERIC_FLOAT',
+    lambda valor, cursor: float(valor) if valor is not None else None
+)
+
+def _copy_text(valor):
+    """Valor no formato texto do COPY (\\N é nulo; barra, tab e quebras de linha escapadas)"""
+    if valor is None:
+        return '\\N'
+    return str(valor).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+class _LinhasCopy:
+    """Arquivo somente leitura que gera as linhas do COPY ... FROM STDIN sob demanda
+
+    Só um bloco de chunk_size linhas é convertido por vez, então o gerador
+    de origem pode ter qualquer tamanho.
+    """
+
+    def __init__(self, linhas, chunk_size):
+        self._linhas = iter(linhas)
+        self._chunk_size = chunk_size
+        self._buffer = ''
+        self.total = 0
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            bloco = list(islice(self._linhas, self._chunk_size))
+            if not bloco:
+                break
+            self._buffer += ''.join('\t'.join(map(_copy_text, linha)) + '\n' for linha in bloco)
+            self.total += len(bloco)
+        if size < 0:
+            size = len(self._buffer)
+        dados, self._buffer = self._buffer[:size], self._buffer[size:]
+        return dados
+
 class Database:
+    dialeto = 'postgres'
+
     def __init__(self):
         # Verificar se está no Railway (DATABASE_URL presente)
         if 'DATABASE_URL' in os.environ:
@@ -25,67 +75,419 @@ class Database:
             self.user = os.getenv('DB_USER', 'postgres')
             self.password = os.getenv('DB_PASSWORD', '')
             self.port = int(os.getenv('DB_PORT', '5432'))
-        
-        self.connection = None
-    
+
+        # Configuração do pool de conexões (compartilhado entre as sessões do Streamlit)
+        # O ThreadedConnectionPool só guarda pool_min conexões devolvidas e fecha as
+        # demais: por padrão todas são mantidas, sem reconectar a cada empréstimo
+        self.pool_max = int(os.getenv('DB_POOL_MAX', '20'))
+        self.pool_min = min(int(os.getenv('DB_POOL_MIN', str(self.pool_max))), self.pool_max)
+        self.pool_timeout = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+        # Conexões ociosas há mais tempo que isso recebem um SELECT 1 antes do uso
+        self.pool_check_idle = float(os.getenv('DB_POOL_CHECK_IDLE', '30'))
+        # Linhas por ida ao servidor em execute_many, execute_values e copy_from_rows
+        self.batch_size = int(os.getenv('DB_BATCH_SIZE', '1000'))
+
+        self.pool = None
+        self._pool_lock = threading.Lock()
+        # O ThreadedConnectionPool lança PoolError quando esgotado; o semáforo faz as threads esperarem
+        self._slots = threading.BoundedSemaphore(self.pool_max)
+        # Estado por conexão, pela própria conexão (não pelo id(), que o Python
+        # reaproveita depois que o pool fecha uma conexão): some junto com ela
+        self._ultimo_uso = weakref.WeakKeyDictionary()
+        # Nomes já preparados em cada conexão (conexão -> set)
+        self._preparadas = weakref.WeakKeyDictionary()
+        self._preparadas_stats = {}
+        # Tempo, linhas e origem de cada consulta (DB_PROFILE, DB_SLOW_QUERY_MS, DB_SLOW_QUERY_LOG)
+        self.profiler = QueryProfiler()
+        self._metricas_lock = threading.Lock()
+        self._metricas = {
+            'checkouts': 0,
+            'espera_total': 0.0,
+            'espera_maxima': 0.0,
+            'timeouts': 0,
+            'descartadas': 0,
+            'em_uso': 0
+        }
+
     def connect(self):
-        try:
-            self.connection = psycopg2.connect(
-                host=self.host,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                port=self.port,
-                connect_timeout=60
-            )
-            self.connection.autocommit = True
+        """Criar o pool de conexões (se ainda não existir)"""
+        if self.pool and not self.pool.closed:
             return True
-        except Exception as e:
-            st.error(f"Erro ao conectar com o banco: {e}")
-            return False
-    
+
+        with self._pool_lock:
+            if self.pool and not self.pool.closed:
+                return True
+            try:
+                self.pool = pool.ThreadedConnectionPool(
+                    self.pool_min,
+                    self.pool_max,
+                    host=self.host,
+                    database=self.database,
+                    user=self.user,
+                    password=self.password,
+                    port=self.port,
+                    connect_timeout=60
+                )
+                return True
+            except Exception as e:
+                st.error(f"Erro ao conectar com o banco: {e}")
+                return False
+
     def disconnect(self):
-        if self.connection:
-            self.connection.close()
-    
+        with self._pool_lock:
+            if self.pool and not self.pool.closed:
+                self.pool.closeall()
+            self.pool = None
+            self._ultimo_uso.clear()
+            self._preparadas.clear()
+
+    def _conexao_saudavel(self, conn):
+        """Verificar se a conexão emprestada do pool ainda está utilizável"""
+        if conn.closed:
+            return False
+
+        status = conn.get_transaction_status()
+        if status == TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error:
+                return False
+        # Antes do SELECT 1, senão a verificação abre uma transação
+        if not conn.autocommit:
+            conn.autocommit = True
+
+        # Conexões paradas há muito tempo podem ter sido derrubadas pelo servidor
+        ultimo_uso = self._ultimo_uso.get(conn)
+        if ultimo_uso is None or time.monotonic() - ultimo_uso > self.pool_check_idle:
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            except psycopg2.Error:
+                return False
+        return True
+
+    def _descartar(self, conn):
+        """Fechar e remover do pool uma conexão quebrada"""
+        self._esquecer(conn)
+        try:
+            self.pool.putconn(conn, close=True)
+        except Exception as e:
+            print(f"Erro ao descartar conexão: {e}")
+        with self._metricas_lock:
+            self._metricas['descartadas'] += 1
+
+    def _esquecer(self, conn):
+        """Remover o estado guardado da conexão (fechada ou descartada)"""
+        self._ultimo_uso.pop(conn, None)
+        self._preparadas.pop(conn, None)
+
+    def _obter_conexao(self):
+        """Pegar uma conexão saudável do pool (uma nova tentativa se a primeira estiver quebrada)"""
+        for tentativa in range(2):
+            conn = self.pool.getconn()
+            if self._conexao_saudavel(conn):
+                return conn
+            self._descartar(conn)
+        raise pool.PoolError("Não foi possível obter uma conexão válida do pool")
+
+    @contextmanager
+    def connection(self):
+        """Emprestar uma conexão do pool, devolvendo-a ao final do bloco"""
+        if not self.connect():
+            raise pool.PoolError("Pool de conexões indisponível")
+
+        inicio = time.monotonic()
+        if not self._slots.acquire(timeout=self.pool_timeout):
+            with self._metricas_lock:
+                self._metricas['timeouts'] += 1
+            raise pool.PoolError(f"Tempo esgotado ({self.pool_timeout:.0f}s) aguardando conexão do pool")
+        espera = time.monotonic() - inicio
+
+        with self._metricas_lock:
+            self._metricas['checkouts'] += 1
+            self._metricas['espera_total'] += espera
+            self._metricas['espera_maxima'] = max(self._metricas['espera_maxima'], espera)
+            self._metricas['em_uso'] += 1
+
+        conn = None
+        try:
+            conn = self._obter_conexao()
+            yield conn
+        finally:
+            if conn is not None:
+                if conn.closed:
+                    self._descartar(conn)
+                else:
+                    self._ultimo_uso[conn] = time.monotonic()
+                    self.pool.putconn(conn)
+                    # Acima de pool_min o pool fecha a conexão devolvida
+                    if conn.closed:
+                        self._esquecer(conn)
+            with self._metricas_lock:
+                self._metricas['em_uso'] -= 1
+            self._slots.release()
+
+    def pool_stats(self):
+        """Métricas de uso do pool (esperas em segundos)"""
+        with self._metricas_lock:
+            stats = dict(self._metricas)
+        stats['espera_media'] = stats['espera_total'] / stats['checkouts'] if stats['checkouts'] else 0.0
+        stats['pool_min'] = self.pool_min
+        stats['pool_max'] = self.pool_max
+        return stats
+
+    def query_stats(self, top=None, ordem='tempo_total'):
+        """Consultas mais custosas desde o início do processo (ver config/instrumentacao.py)"""
+        return self.profiler.stats(top, ordem)
+
+    def reset_query_stats(self):
+        self.profiler.reset()
+
     def execute_query(self, query, params=None, fetch=False):
         try:
-            if not self.connection or self.connection.closed:
-                if not self.connect():
-                    return None
-            
-            cursor = self.connection.cursor(cursor_factory=RealDictCursor)
-            cursor.execute(query, params)
-            
-            if fetch:
-                result = cursor.fetchall()
+            if not self.connect():
+                return None
+
+            with self.connection() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                inicio = time.perf_counter()
+                cursor.execute(query, params)
+
+                if fetch:
+                    result = cursor.fetchall()
+                    self.profiler.record(query, time.perf_counter() - inicio, len(result))
+                    cursor.close()
+                    return result
+                else:
+                    self.profiler.record(query, time.perf_counter() - inicio, cursor.rowcount)
+                    cursor.close()
+                    return True
+        except Exception as e:
+            print(f"Erro na query: {e}")
+            if 'st' in globals():
+                st.error(f"Erro na query: {e}")
+            return None
+
+    def execute_query_one(self, query, params=None):
+        try:
+            if not self.connect():
+                return None
+
+            with self.connection() as conn:
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                inicio = time.perf_counter()
+                cursor.execute(query, params)
+                result = cursor.fetchone()
+                self.profiler.record(query, time.perf_counter() - inicio, 1 if result else 0)
                 cursor.close()
                 return result
-            else:
-                cursor.close()
-                return True
         except Exception as e:
             print(f"Erro na query: {e}")
             if 'st' in globals():
                 st.error(f"Erro na query: {e}")
             return None
-    
-    def execute_query_one(self, query, params=None):
+
+    def execute_returning(self, query, params=None):
+        """Executar INSERT/UPDATE ... RETURNING e devolver a primeira linha (None se nenhuma)
+
+        Ao contrário de execute_query, os erros são propagados, para quem
+        chama tratar as violações de UNIQUE (ver utils/socios_cadastro.py).
+        """
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                inicio = time.perf_counter()
+                cursor.execute(query, params)
+                result = cursor.fetchone()
+        self.profiler.record(query, time.perf_counter() - inicio, 1 if result else 0)
+        return result
+
+    def iter_query(self, query, params=None, chunk_size=5000):
+        """Ler o resultado em blocos de até chunk_size linhas por um cursor no servidor
+
+        Só um bloco fica na memória por vez (exportações de tabelas inteiras).
+        A conexão fica emprestada até o gerador terminar ou ser fechado.
+        """
+        with self.connection() as conn:
+            # Cursores nomeados (DECLARE) exigem uma transação
+            conn.autocommit = False
+            cursor = conn.cursor(name=f"iter_{id(conn)}", cursor_factory=RealDictCursor)
+            cursor.itersize = chunk_size
+            inicio = time.perf_counter()
+            linhas = 0
+            try:
+                cursor.execute(query, params)
+                while True:
+                    bloco = cursor.fetchmany(chunk_size)
+                    if not bloco:
+                        break
+                    linhas += len(bloco)
+                    yield bloco
+            finally:
+                cursor.close()
+                conn.rollback()
+                conn.autocommit = True
+                self.profiler.record(query, time.perf_counter() - inicio, linhas)
+
+    def _ler_colunas(self, query, params, chunk_size):
+        """Executar a consulta e ler o resultado como (nomes, colunas); erros são propagados"""
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                psycopg2.extensions.register_type(NUMERIC_FLOAT, cursor)
+                inicio = time.perf_counter()
+                cursor.execute(query, params)
+                nomes, colunas = fetch_columns(cursor, chunk_size)
+        self.profiler.record(query, time.perf_counter() - inicio, len(colunas[0]) if colunas else 0)
+        return nomes, colunas
+
+    def fetch_frame(self, query, params=None, chunk_size=5000):
+        """Resultado como pandas.DataFrame, montado por coluna (sem um dict por linha)"""
+        return build_frame(*self._ler_colunas(query, params, chunk_size))
+
+    def fetch_arrow(self, query, params=None, chunk_size=5000):
+        """Resultado como pyarrow.Table, montado por coluna (sem um dict por linha)"""
+        return build_arrow(*self._ler_colunas(query, params, chunk_size))
+
+    def _em_blocos(self, query, linhas, chunk_size, executar, cursor_factory=None):
+        """Chamar executar(cursor, bloco) para cada bloco de linhas, numa única transação
+
+        Um erro desfaz todos os blocos e é propagado. Retorna a soma dos
+        valores devolvidos por executar.
+        """
+        linhas = iter(linhas)
+        chunk_size = chunk_size or self.batch_size
+        total = 0
+        inicio = time.perf_counter()
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=cursor_factory) as cursor:
+                # As conexões do pool estão em autocommit: abrir a transação explicitamente
+                cursor.execute("BEGIN")
+                try:
+                    while True:
+                        bloco = list(islice(linhas, chunk_size))
+                        if not bloco:
+                            break
+                        total += executar(cursor, bloco)
+                    cursor.execute("COMMIT")
+                except Exception:
+                    cursor.execute("ROLLBACK")
+                    raise
+        self.profiler.record(query, time.perf_counter() - inicio, total)
+        return total
+
+    def execute_many(self, query, seq_params, chunk_size=None):
+        """Executar a instrução para cada conjunto de parâmetros (chunk_size por ida ao servidor)
+
+        Retorna quantos conjuntos foram executados (o psycopg2 não informa as
+        linhas afetadas de um lote). Tudo numa transação; erros são propagados.
+        """
+        def executar(cursor, bloco):
+            psycopg2.extras.execute_batch(cursor, query, bloco, page_size=len(bloco))
+            return len(bloco)
+        return self._em_blocos(query, seq_params, chunk_size, executar)
+
+    def execute_values(self, query, linhas, template=None, chunk_size=None, fetch=False):
+        """INSERT/UPDATE com várias linhas por instrução: o único %s da consulta vira VALUES (...), (...)
+
+        Retorna as linhas afetadas, ou as linhas de RETURNING (dicts) com
+        fetch=True. Tudo numa transação; erros são propagados.
+        """
+        retornadas = []
+
+        def executar(cursor, bloco):
+            if fetch:
+                resultado = psycopg2.extras.execute_values(cursor, query, bloco, template, page_size=len(bloco), fetch=True)
+                retornadas.extend(resultado)
+                return len(resultado)
+            psycopg2.extras.execute_values(cursor, query, bloco, template, page_size=len(bloco))
+            return cursor.rowcount
+
+        total = self._em_blocos(query, linhas, chunk_size, executar, RealDictCursor)
+        return retornadas if fetch else total
+
+    def copy_from_rows(self, tabela, colunas, linhas, chunk_size=None):
+        """Gravar linhas (tuplas na ordem de colunas) com COPY ... FROM STDIN; retorna quantas
+
+        As linhas são lidas do iterável sob demanda e enviadas num único COPY,
+        sem montar o arquivo inteiro na memória. Erros são propagados.
+        """
+        query = f"COPY {tabela} ({', '.join(colunas)}) FROM STDIN"
+        arquivo = _LinhasCopy(linhas, chunk_size or self.batch_size)
+        inicio = time.perf_counter()
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                cursor.copy_expert(query, arquivo, size=65536)
+        self.profiler.record(query, time.perf_counter() - inicio, arquivo.total)
+        return arquivo.total
+
+    def _preparar(self, conn, cursor, nome):
+        """PREPARE da consulta registrada, uma vez por conexão"""
+        preparadas = self._preparadas.setdefault(conn, set())
+        if nome in preparadas:
+            return
         try:
-            if not self.connection or self.connection.closed:
-                if not self.connect():
-                    return None
-            
-            cursor = self.connection.cursor(cursor_factory=RealDictCursor)
-            cursor.execute(query, params)
-            result = cursor.fetchone()
+            cursor.execute(f"PREPARE {nome} AS {to_positional(get_consulta(nome))}")
+        except psycopg2.errors.DuplicatePreparedStatement:
+            pass  # Conexão reaproveitada que já tinha a consulta
+        preparadas.add(nome)
+
+    def _executar_preparada(self, nome, params, fetch_one):
+        """Executar uma consulta registrada pelo nome"""
+        params = tuple(params or ())
+        with self.connection() as conn:
+            cursor = conn.cursor(cursor_factory=RealDictCursor)
+            self._preparar(conn, cursor, nome)
+            marcadores = f" ({', '.join(['%s'] * len(params))})" if params else ""
+            inicio = time.perf_counter()
+            try:
+                cursor.execute(f"EXECUTE {nome}{marcadores}", params)
+            except psycopg2.errors.InvalidSqlStatementName:
+                # A sessão perdeu a consulta (ex.: DEALLOCATE ALL): preparar de novo
+                self._preparadas.get(conn, set()).discard(nome)
+                self._preparar(conn, cursor, nome)
+                cursor.execute(f"EXECUTE {nome}{marcadores}", params)
+            result = cursor.fetchone() if fetch_one else cursor.fetchall()
+            duracao = time.perf_counter() - inicio
             cursor.close()
-            return result
+
+        linhas = (1 if result else 0) if fetch_one else len(result)
+        self.profiler.record(get_consulta(nome), duracao, linhas)
+        with self._metricas_lock:
+            stats = self._preparadas_stats.setdefault(nome, {'chamadas': 0, 'tempo_total': 0.0})
+            stats['chamadas'] += 1
+            stats['tempo_total'] += duracao
+        return result
+
+    def execute_prepared(self, nome, params=None):
+        """Executar consulta registrada em config/consultas.py (todas as linhas)"""
+        try:
+            return self._executar_preparada(nome, params, fetch_one=False)
         except Exception as e:
-            print(f"Erro na query: {e}")
+            print(f"Erro na query {nome}: {e}")
+            if 'st' in globals():
+                st.error(f"Erro na query: {e}")
+            return None
+
+    def execute_prepared_one(self, nome, params=None):
+        """Executar consulta registrada em config/consultas.py (primeira linha)"""
+        try:
+            return self._executar_preparada(nome, params, fetch_one=True)
+        except Exception as e:
+            print(f"Erro na query {nome}: {e}")
             if 'st' in globals():
                 st.error(f"Erro na query: {e}")
             return None
 
+    def prepared_stats(self):
+        """Consultas registradas mais usadas (chamadas e tempo médio em segundos)"""
+        with self._metricas_lock:
+            stats = [
+                {'nome': nome, 'chamadas': s['chamadas'], 'tempo_total': s['tempo_total'],
+                 'tempo_medio': s['tempo_total'] / s['chamadas']}
+                for nome, s in self._preparadas_stats.items()
+            ]
+        return sorted(stats, key=lambda s: s['chamadas'], reverse=True)
+
 # Instância global do banco
 db = Database()
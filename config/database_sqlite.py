@@ -0,0 +1,624 @@
+"""
+Banco SQLite embutido, com a mesma interface do Database do PostgreSQL
+
+Para instalações pequenas, desenvolvimento e benchmarks sem servidor: o
+banco é um arquivo local (DB_PATH) em modo WAL, com uma conexão por
+thread. As consultas das páginas são escritas para o PostgreSQL; aqui os
+placeholders (%s, %(nome)s) viram ? e :nome, casts (::date), ILIKE e
+FOR UPDATE são ajustados e as funções usadas pelo app (NOW, date_trunc, add_months,
+to_char, regexp_replace) são registradas em Python. O schema é criado pelas
+migrações (arquivos NNNN_nome.sqlite.sql) na primeira conexão.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from itertools import islice
+import streamlit as st
+from dotenv import load_dotenv
+from config.colunar import fetch_columns, build_frame, build_arrow
+from config.consultas import get_consulta
+from config.instrumentacao import QueryProfiler
+
+load_dotenv()
+
+PROJETO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PATH = os.path.join(PROJETO_DIR, 'ut_socios.db')
+# Limite de parâmetros por instrução (SQLITE_MAX_VARIABLE_NUMBER desde o 3.32)
+MAX_PARAMETROS = 32766
+
+# Tipos do Python <-> colunas declaradas no schema (DATE, TIMESTAMP, DECIMAL, BOOLEAN).
+# Colunas calculadas podem pedir a conversão pelo nome: AS "coluna [json]"
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_adapter(datetime, lambda d: d.isoformat(' '))
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_converter('date', lambda v: date.fromisoformat(v[:10].decode()))
+sqlite3.register_converter('timestamp', lambda v: datetime.fromisoformat(v.decode()))
+sqlite3.register_converter('decimal', lambda v: Decimal(v.decode()))
+sqlite3.register_converter('boolean', lambda v: v not in (b'0', b''))
+sqlite3.register_converter('json', json.loads)
+
+# Placeholders do psycopg2 (interpretados em toda a consulta, inclusive dentro de textos)
+_RE_PLACEHOLDERS = re.compile(r'%%|%\((\w+)\)s|%s')
+# Casts, palavras e travas do PostgreSQL; literais e comentários são copiados sem alteração
+_RE_TOKENS = re.compile(
+    r"""('(?:[^']|'')*')|("(?:[^"]|"")*")|(--[^\n]*)"""
+    r"""|(::\w+(?:\[\])?)|\b(ILIKE|CURRENT_DATE|CURRENT_TIMESTAMP)\b"""
+    r"""|\b(FOR\s+UPDATE(?:\s+SKIP\s+LOCKED|\s+NOWAIT)?)\b""",
+    re.IGNORECASE
+)
+_RE_REFRESH = re.compile(r'^\s*REFRESH\s+MATERIALIZED\s+VIEW\b', re.IGNORECASE)
+_RE_SO_COMENTARIOS = re.compile(r'^(\s|--[^\n]*)*$')
+
+# Data e hora locais, como no servidor PostgreSQL (os do SQLite são em UTC)
+_PALAVRAS = {
+    'ILIKE': 'LIKE',  # O LIKE do SQLite já ignora maiúsculas/minúsculas (ASCII)
+    'CURRENT_DATE': "(date('now', 'localtime'))",
+    'CURRENT_TIMESTAMP': "(datetime('now', 'localtime'))",
+}
+
+def _placeholder(m):
+    if m.group(0) == '%%':
+        return '%'
+    return f":{m.group(1)}" if m.group(1) else '?'
+
+def _token(m):
+    if m.group(4):
+        return ''  # Tipagem dinâmica: o cast não muda o valor
+    if m.group(5):
+        return _PALAVRAS[m.group(5).upper()]
+    if m.group(6):
+        return ''  # Um único escritor por vez: não há travas de linha
+    return m.group(0)
+
+@lru_cache(maxsize=1024)
+def translate(query, com_params=True):
+    """Traduzir uma consulta escrita para o PostgreSQL/psycopg2 para o SQLite
+
+    Como no psycopg2, os placeholders só são interpretados quando a
+    consulta recebe parâmetros (senão um % é literal).
+    """
+    if com_params:
+        query = _RE_PLACEHOLDERS.sub(_placeholder, query)
+    return _RE_TOKENS.sub(_token, query)
+
+def split_statements(script):
+    """Separar um script em instruções (o ; dentro de textos e gatilhos não separa)"""
+    instrucoes, atual = [], []
+    for parte in script.split(';'):
+        atual.append(parte)
+        texto = ';'.join(atual)
+        if sqlite3.complete_statement(texto + ';'):
+            if not _RE_SO_COMENTARIOS.match(texto):
+                instrucoes.append(texto.strip())
+            atual = []
+    resto = ';'.join(atual)
+    if not _RE_SO_COMENTARIOS.match(resto):
+        instrucoes.append(resto.strip())
+    return instrucoes
+
+def split_values(query):
+    """Partes antes e depois do único %s de uma consulta de execute_values"""
+    partes = re.split(r'(%.)', query)
+    posicoes = [i for i, parte in enumerate(partes) if parte == '%s']
+    if len(posicoes) != 1:
+        raise ValueError("A consulta de execute_values deve ter um único %s (a lista VALUES)")
+    i = posicoes[0]
+    return ''.join(partes[:i]), ''.join(partes[i + 1:])
+
+# Funções do PostgreSQL usadas pelas consultas do app
+
+def _data(valor):
+    if valor is None or isinstance(valor, (date, datetime)):
+        return valor
+    valor = str(valor)
+    return datetime.fromisoformat(valor) if len(valor) > 10 else date.fromisoformat(valor)
+
+def _now():
+    return datetime.now().isoformat(' ', 'seconds')
+
+def _date_trunc(unidade, valor):
+    valor = _data(valor)
+    if valor is None:
+        return None
+    dia = valor.date() if isinstance(valor, datetime) else valor
+    unidade = unidade.lower()
+    if unidade == 'year':
+        dia = dia.replace(month=1, day=1)
+    elif unidade == 'month':
+        dia = dia.replace(day=1)
+    elif unidade == 'week':
+        dia = dia - timedelta(days=dia.weekday())
+    elif unidade != 'day':
+        raise ValueError(f"date_trunc: unidade não suportada: {unidade}")
+    return dia.isoformat()
+
+def _add_months(valor, meses):
+    # Como o INTERVAL do PostgreSQL: 31/01 + 1 mês = 28 ou 29/02
+    valor = _data(valor)
+    if valor is None or meses is None:
+        return None
+    dia = valor.date() if isinstance(valor, datetime) else valor
+    mes = dia.month - 1 + int(meses)
+    ano, mes = dia.year + mes // 12, mes % 12 + 1
+    ultimo = (date(ano + mes // 12, mes % 12 + 1, 1) - timedelta(days=1)).day
+    return dia.replace(year=ano, month=mes, day=min(dia.day, ultimo)).isoformat()
+
+_FORMATOS_DATA = [('YYYY', '%Y'), ('HH24', '%H'), ('MI', '%M'), ('SS', '%S'), ('MM', '%m'), ('DD', '%d'), ('YY', '%y')]
+
+def _to_char(valor, formato):
+    valor = _data(valor)
+    if valor is None:
+        return None
+    for token, diretiva in _FORMATOS_DATA:
+        formato = formato.replace(token, diretiva)
+    return valor.strftime(formato)
+
+def _regexp_replace(texto, padrao, substituto, flags=''):
+    if texto is None:
+        return None
+    flags = flags or ''
+    return re.sub(padrao, substituto, texto, count=0 if 'g' in flags else 1,
+                  flags=re.IGNORECASE if 'i' in flags else 0)
+
+FUNCOES = [
+    ('now', 0, _now),
+    ('date_trunc', 2, _date_trunc),
+    ('add_months', 2, _add_months),
+    ('to_char', 2, _to_char),
+    ('regexp_replace', 3, _regexp_replace),
+    ('regexp_replace', 4, _regexp_replace),
+]
+
+class _Cursor:
+    """Cursor com a interface usada do psycopg2 (context manager, linhas como dict ou tupla)"""
+
+    def __init__(self, cursor, dicts=False):
+        self._cursor = cursor
+        self._dicts = dicts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def execute(self, query, params=None):
+        if params is None and _RE_REFRESH.match(query):
+            return self  # As views do SQLite são sempre atuais
+        if params is None and ';' in query.strip().rstrip(';'):
+            # Script com várias instruções (migrações)
+            for instrucao in split_statements(query):
+                self._cursor.execute(translate(instrucao, False))
+        else:
+            self._cursor.execute(translate(query, params is not None), params if params is not None else ())
+        return self
+
+    def executemany(self, query, seq_params):
+        self._cursor.executemany(translate(query), seq_params)
+        return self
+
+    def _linhas(self, linhas):
+        if not self._dicts or not linhas:
+            return linhas
+        colunas = [d[0] for d in self._cursor.description]
+        return [dict(zip(colunas, linha)) for linha in linhas]
+
+    def fetchone(self):
+        linha = self._cursor.fetchone()
+        return self._linhas([linha])[0] if linha is not None else None
+
+    def fetchmany(self, size):
+        return self._linhas(self._cursor.fetchmany(size))
+
+    def fetchall(self):
+        return self._linhas(self._cursor.fetchall())
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+class _Conexao:
+    """Conexão da thread com a interface usada do psycopg2 (autocommit por padrão)"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, cursor_factory=None, name=None):
+        # Qualquer cursor_factory (ex.: RealDictCursor) devolve as linhas como dict
+        return _Cursor(self._conn.cursor(), dicts=cursor_factory is not None)
+
+    @property
+    def autocommit(self):
+        return self._conn.isolation_level is None
+
+    @autocommit.setter
+    def autocommit(self, valor):
+        self._conn.isolation_level = None if valor else 'DEFERRED'
+
+    @property
+    def closed(self):
+        try:
+            self._conn.total_changes
+            return False
+        except sqlite3.ProgrammingError:
+            return True
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+class Database:
+    dialeto = 'sqlite'
+
+    def __init__(self, path=None):
+        url = os.getenv('DATABASE_URL', '')
+        if path is None and url.startswith('sqlite:'):
+            # sqlite:///relativo.db ou sqlite:////caminho/absoluto.db
+            path = url.split(':', 1)[1][3:] or ':memory:'
+        self.path = path or os.getenv('DB_PATH', DEFAULT_PATH)
+        self.timeout = float(os.getenv('DB_TIMEOUT', '30'))
+        # Criar/atualizar o schema na primeira conexão (DB_AUTO_MIGRATE=0 desativa)
+        self.auto_migrate = os.getenv('DB_AUTO_MIGRATE', '1') != '0'
+        # Linhas por instrução em execute_many, execute_values e copy_from_rows
+        self.batch_size = int(os.getenv('DB_BATCH_SIZE', '1000'))
+
+        # Banco em memória compartilhado entre as conexões das threads do processo
+        self._memoria = self.path == ':memory:'
+        self._alvo = f"file:ut_socios_{id(self)}?mode=memory&cache=shared" if self._memoria else self.path
+        self._ancora = None
+
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        self._pronto = False
+        # Conexões abertas por thread (as de threads encerradas são fechadas)
+        self._conexoes = {}
+        self._preparadas_stats = {}
+        self.profiler = QueryProfiler()
+        self._metricas_lock = threading.Lock()
+
+    def _nova_conexao(self):
+        conn = sqlite3.connect(
+            self._alvo,
+            timeout=self.timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+            isolation_level=None,  # Autocommit, como as conexões do pool do PostgreSQL
+            check_same_thread=False,  # Só a própria thread usa; disconnect() fecha de qualquer uma
+            cached_statements=256,  # Instruções já compiladas são reaproveitadas
+            uri=self._memoria
+        )
+        if not self._memoria:
+            conn.execute("PRAGMA journal_mode = WAL")  # Leitores não bloqueiam o escritor
+            conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        for nome, argumentos, funcao in FUNCOES:
+            conn.create_function(nome, argumentos, funcao, deterministic=nome != 'now')
+        return conn
+
+    def _conexao(self):
+        """Conexão da thread atual (criada no primeiro uso)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            if self._memoria and self._ancora is None:
+                with self._lock:
+                    if self._ancora is None:
+                        # O banco em memória existe enquanto houver uma conexão aberta
+                        self._ancora = self._nova_conexao()
+            conn = self._nova_conexao()
+            self._local.conn = conn
+            with self._lock:
+                vivas = {t.ident for t in threading.enumerate()}
+                for ident in [i for i in self._conexoes if i not in vivas]:
+                    self._conexoes.pop(ident).close()
+                self._conexoes[threading.get_ident()] = conn
+        return conn
+
+    def connect(self):
+        """Abrir o banco e aplicar as migrações pendentes (uma vez por processo)"""
+        if self._pronto or getattr(self._local, 'migrando', False):
+            return True
+
+        with self._lock:
+            if self._pronto:
+                return True
+            try:
+                self._conexao()
+                if self.auto_migrate:
+                    from config.migracoes import migrate
+                    self._local.migrando = True
+                    try:
+                        migrate(self)
+                    finally:
+                        self._local.migrando = False
+                self._pronto = True
+                return True
+            except Exception as e:
+                print(f"Erro ao abrir o banco SQLite: {e}")
+                st.error(f"Erro ao abrir o banco SQLite: {e}")
+                return False
+
+    def disconnect(self):
+        with self._lock:
+            for conn in self._conexoes.values():
+                conn.close()
+            self._conexoes = {}
+            self._local = threading.local()
+            if self._ancora is not None:
+                self._ancora.close()
+                self._ancora = None
+            self._pronto = False
+
+    @contextmanager
+    def connection(self):
+        """Conexão da thread atual (mesma interface do pool do PostgreSQL)"""
+        yield _Conexao(self._conexao())
+
+    def pool_stats(self):
+        # Sem pool: uma conexão por thread
+        return {}
+
+    def query_stats(self, top=None, ordem='tempo_total'):
+        """Consultas mais custosas desde o início do processo (ver config/instrumentacao.py)"""
+        return self.profiler.stats(top, ordem)
+
+    def reset_query_stats(self):
+        self.profiler.reset()
+
+    def execute_query(self, query, params=None, fetch=False):
+        try:
+            if not self.connect():
+                return None
+
+            with self.connection() as conn:
+                cursor = conn.cursor(cursor_factory=dict)
+                inicio = time.perf_counter()
+                cursor.execute(query, params)
+
+                if fetch:
+                    result = cursor.fetchall()
+                    self.profiler.record(query, time.perf_counter() - inicio, len(result))
+                    cursor.close()
+                    return result
+                else:
+                    self.profiler.record(query, time.perf_counter() - inicio, cursor.rowcount)
+                    cursor.close()
+                    return True
+        except Exception as e:
+            print(f"Erro na query: {e}")
+            if 'st' in globals():
+                st.error(f"Erro na query: {e}")
+            return None
+
+    def execute_query_one(self, query, params=None):
+        try:
+            if not self.connect():
+                return None
+
+            with self.connection() as conn:
+                cursor = conn.cursor(cursor_factory=dict)
+                inicio = time.perf_counter()
+                cursor.execute(query, params)
+                result = cursor.fetchone()
+                self.profiler.record(query, time.perf_counter() - inicio, 1 if result else 0)
+                cursor.close()
+                return result
+        except Exception as e:
+            print(f"Erro na query: {e}")
+            if 'st' in globals():
+                st.error(f"Erro na query: {e}")
+            return None
+
+    def execute_returning(self, query, params=None):
+        """Executar INSERT/UPDATE ... RETURNING e devolver a primeira linha (None se nenhuma)
+
+        Ao contrário de execute_query, os erros são propagados, para quem
+        chama tratar as violações de UNIQUE (ver utils/socios_cadastro.py).
+        """
+        if not self.connect():
+            raise sqlite3.OperationalError("Banco SQLite indisponível")
+
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=dict) as cursor:
+                inicio = time.perf_counter()
+                cursor.execute(query, params)
+                result = cursor.fetchone()
+        self.profiler.record(query, time.perf_counter() - inicio, 1 if result else 0)
+        return result
+
+    def iter_query(self, query, params=None, chunk_size=5000):
+        """Ler o resultado em blocos de até chunk_size linhas
+
+        O SQLite já avança o resultado sob demanda: só um bloco fica na memória.
+        """
+        if not self.connect():
+            raise sqlite3.OperationalError("Banco SQLite indisponível")
+
+        with self.connection() as conn:
+            cursor = conn.cursor(cursor_factory=dict)
+            inicio = time.perf_counter()
+            linhas = 0
+            try:
+                cursor.execute(query, params)
+                while True:
+                    bloco = cursor.fetchmany(chunk_size)
+                    if not bloco:
+                        break
+                    linhas += len(bloco)
+                    yield bloco
+            finally:
+                cursor.close()
+                self.profiler.record(query, time.perf_counter() - inicio, linhas)
+
+    def _ler_colunas(self, query, params, chunk_size):
+        """Executar a consulta e ler o resultado como (nomes, colunas); erros são propagados"""
+        if not self.connect():
+            raise sqlite3.OperationalError("Banco SQLite indisponível")
+
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                inicio = time.perf_counter()
+                cursor.execute(query, params)
+                nomes, colunas = fetch_columns(cursor, chunk_size)
+        self.profiler.record(query, time.perf_counter() - inicio, len(colunas[0]) if colunas else 0)
+        return nomes, colunas
+
+    def fetch_frame(self, query, params=None, chunk_size=5000):
+        """Resultado como pandas.DataFrame, montado por coluna (sem um dict por linha)"""
+        return build_frame(*self._ler_colunas(query, params, chunk_size))
+
+    def fetch_arrow(self, query, params=None, chunk_size=5000):
+        """Resultado como pyarrow.Table, montado por coluna (sem um dict por linha)"""
+        return build_arrow(*self._ler_colunas(query, params, chunk_size))
+
+    def _em_blocos(self, query, linhas, chunk_size, executar, cursor_factory=None):
+        """Chamar executar(cursor, bloco) para cada bloco de linhas, numa única transação
+
+        Um erro desfaz todos os blocos e é propagado. Retorna a soma dos
+        valores devolvidos por executar.
+        """
+        if not self.connect():
+            raise sqlite3.OperationalError("Banco SQLite indisponível")
+
+        linhas = iter(linhas)
+        chunk_size = chunk_size or self.batch_size
+        total = 0
+        inicio = time.perf_counter()
+        with self.connection() as conn:
+            with conn.cursor(cursor_factory=cursor_factory) as cursor:
+                # IMMEDIATE: a trava de escrita é pega já no início do lote
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    while True:
+                        bloco = list(islice(linhas, chunk_size))
+                        if not bloco:
+                            break
+                        total += executar(cursor, bloco)
+                    cursor.execute("COMMIT")
+                except Exception:
+                    cursor.execute("ROLLBACK")
+                    raise
+        self.profiler.record(query, time.perf_counter() - inicio, total)
+        return total
+
+    def execute_many(self, query, seq_params, chunk_size=None):
+        """Executar a instrução para cada conjunto de parâmetros (instrução compilada uma vez)
+
+        Retorna quantos conjuntos foram executados. Tudo numa transação;
+        erros são propagados.
+        """
+        def executar(cursor, bloco):
+            cursor.executemany(query, bloco)
+            return len(bloco)
+        return self._em_blocos(query, seq_params, chunk_size, executar)
+
+    def execute_values(self, query, linhas, template=None, chunk_size=None, fetch=False):
+        """INSERT/UPDATE com várias linhas por instrução: o único %s da consulta vira VALUES (...), (...)
+
+        Retorna as linhas afetadas, ou as linhas de RETURNING (dicts) com
+        fetch=True. Tudo numa transação; erros são propagados.
+        """
+        antes, depois = split_values(query)
+        retornadas = []
+
+        def executar(cursor, bloco):
+            modelo = template or f"({', '.join(['%s'] * len(bloco[0]))})"
+            # Quebrar o bloco para não passar do limite de parâmetros por instrução
+            por_instrucao = max(1, MAX_PARAMETROS // max(1, modelo.count('%s')))
+            total = 0
+            for i in range(0, len(bloco), por_instrucao):
+                parte = bloco[i:i + por_instrucao]
+                cursor.execute(f"{antes}{', '.join([modelo] * len(parte))}{depois}",
+                               [valor for linha in parte for valor in linha])
+                if fetch:
+                    resultado = cursor.fetchall()
+                    retornadas.extend(resultado)
+                    total += len(resultado)
+                else:
+                    total += cursor.rowcount
+            return total
+
+        total = self._em_blocos(query, linhas, chunk_size, executar, dict)
+        return retornadas if fetch else total
+
+    def copy_from_rows(self, tabela, colunas, linhas, chunk_size=None):
+        """Gravar linhas (tuplas na ordem de colunas) em blocos de INSERT; retorna quantas
+
+        Equivale ao COPY do PostgreSQL: as linhas são lidas do iterável sob
+        demanda e gravadas numa única transação. Erros são propagados.
+        """
+        query = f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES ({', '.join(['%s'] * len(colunas))})"
+
+        def executar(cursor, bloco):
+            cursor.executemany(query, bloco)
+            return len(bloco)
+        return self._em_blocos(query, linhas, chunk_size, executar)
+
+    def _executar_registrada(self, nome, params, fetch_one):
+        """Executar uma consulta registrada pelo nome (o sqlite3 guarda a instrução compilada)"""
+        if not self.connect():
+            return None
+        query = get_consulta(nome)
+        with self.connection() as conn:
+            cursor = conn.cursor(cursor_factory=dict)
+            inicio = time.perf_counter()
+            cursor.execute(query, tuple(params or ()))
+            result = cursor.fetchone() if fetch_one else cursor.fetchall()
+            duracao = time.perf_counter() - inicio
+            cursor.close()
+
+        linhas = (1 if result else 0) if fetch_one else len(result)
+        self.profiler.record(query, duracao, linhas)
+        with self._metricas_lock:
+            stats = self._preparadas_stats.setdefault(nome, {'chamadas': 0, 'tempo_total': 0.0})
+            stats['chamadas'] += 1
+            stats['tempo_total'] += duracao
+        return result
+
+    def execute_prepared(self, nome, params=None):
+        """Executar consulta registrada em config/consultas.py (todas as linhas)"""
+        try:
+            return self._executar_registrada(nome, params, fetch_one=False)
+        except Exception as e:
+            print(f"Erro na query {nome}: {e}")
+            if 'st' in globals():
+                st.error(f"Erro na query: {e}")
+            return None
+
+    def execute_prepared_one(self, nome, params=None):
+        """Executar consulta registrada em config/consultas.py (primeira linha)"""
+        try:
+            return self._executar_registrada(nome, params, fetch_one=True)
+        except Exception as e:
+            print(f"Erro na query {nome}: {e}")
+            if 'st' in globals():
+                st.error(f"Erro na query: {e}")
+            return None
+
+    def prepared_stats(self):
+        """Consultas registradas mais usadas (chamadas e tempo médio em segundos)"""
+        with self._metricas_lock:
+            stats = [
+                {'nome': nome, 'chamadas': s['chamadas'], 'tempo_total': s['tempo_total'],
+                 'tempo_medio': s['tempo_total'] / s['chamadas']}
+                for nome, s in self._preparadas_stats.items()
+            ]
+        return sorted(stats, key=lambda s: s['chamadas'], reverse=True)
@@ -0,0 +1,240 @@
+"""
+Dialetos SQL: os trechos de consulta que mudam entre PostgreSQL, MySQL e SQLite
+
+As páginas montam filtros, cálculos de data e ordenação por aqui em vez
+de escrever funções de um banco específico. Filtros de data são sempre
+intervalos semiabertos sobre a própria coluna (coluna >= inicio AND
+coluna < fim), que usam os índices; funções aplicadas à coluna no WHERE
+(MONTH(), YEAR(), date_trunc) obrigariam a ler a tabela inteira.
+
+Os fragmentos são para consultas executadas com parâmetros no estilo do
+psycopg2 (%s): um % literal é escrito como %%.
+"""
+
+import re
+from abc import ABC, abstractmethod
+
+_RE_ORDEM = re.compile(r'^(.+?)(?:\s+(ASC|DESC))?(?:\s+NULLS\s+(FIRST|LAST))?$', re.IGNORECASE)
+
+class Dialeto(ABC):
+    """SQL padrão; as subclasses trocam só o que o banco escreve diferente
+
+    Cálculos de data não têm forma padrão: cada banco implementa os seus.
+    """
+
+    nome = None
+    # INSERT/UPDATE dentro de WITH (várias escritas numa única instrução)
+    writable_cte = False
+
+    @abstractmethod
+    def add_months(self, expr, meses):
+        """Data somada de meses de calendário (31/01 + 1 mês = 28 ou 29/02)"""
+
+    @abstractmethod
+    def days_between(self, fim, inicio):
+        """Dias inteiros entre duas datas (fim - inicio)"""
+
+    @abstractmethod
+    def truncate_date(self, unidade, expr):
+        """Primeiro dia do mês ('month') ou do ano ('year') da data, como DATE"""
+
+    @abstractmethod
+    def format_date(self, expr):
+        """Data como texto DD/MM/AAAA"""
+
+    def regexp_replace(self, expr, padrao, substituto):
+        """Substituir todas as ocorrências da expressão regular (grupos como \\1)"""
+        return f"regexp_replace({expr}, '{padrao}', '{substituto}', 'g')"
+
+    def concat(self, *partes):
+        return " || ".join(partes)
+
+    def count_where(self, condicao):
+        return f"COUNT(*) FILTER (WHERE {condicao})"
+
+    def sum_where(self, expr, condicao):
+        return f"SUM({expr}) FILTER (WHERE {condicao})"
+
+    def skip_locked(self):
+        """Trava das linhas lidas para alteração, pulando as já travadas por outra transação"""
+        return "FOR UPDATE SKIP LOCKED"
+
+    def lock_rows(self):
+        """Trava das linhas lidas para alteração, esperando as já travadas por outra transação"""
+        return "FOR UPDATE"
+
+    def begin_write(self):
+        """Início de uma transação que lê e depois altera as mesmas linhas"""
+        return "BEGIN"
+
+    def insert_ignore(self, tabela, colunas, select, conflito):
+        """INSERT ... SELECT que ignora as linhas que violam a chave única `conflito`"""
+        return (f"INSERT INTO {tabela} ({', '.join(colunas)})\n{select}\n"
+                f"ON CONFLICT ({', '.join(conflito)}) DO NOTHING")
+
+    def order_term(self, coluna, direcao, nulos):
+        termo = f"{coluna} {direcao}" if direcao else coluna
+        return f"{termo} NULLS {nulos}" if nulos else termo
+
+    def order_by(self, *termos):
+        """ORDER BY a partir de termos como 'f.data_vencimento DESC NULLS LAST'"""
+        partes = []
+        for termo in termos:
+            coluna, direcao, nulos = _RE_ORDEM.match(termo.strip()).groups()
+            partes.append(self.order_term(coluna, direcao and direcao.upper(), nulos and nulos.upper()))
+        return "ORDER BY " + ", ".join(partes)
+
+class Postgres(Dialeto):
+    nome = 'postgres'
+    writable_cte = True
+
+    def add_months(self, expr, meses):
+        return f"({expr} + ({meses}) * INTERVAL '1 month')::date"
+
+    def days_between(self, fim, inicio):
+        return f"({fim} - {inicio})"
+
+    def truncate_date(self, unidade, expr):
+        return f"date_trunc('{unidade}', {expr})::date"
+
+    def format_date(self, expr):
+        return f"to_char({expr}, 'DD/MM/YYYY')"
+
+class MySQL(Dialeto):
+    nome = 'mysql'
+
+    def add_months(self, expr, meses):
+        return f"DATE_ADD({expr}, INTERVAL ({meses}) MONTH)"
+
+    def days_between(self, fim, inicio):
+        return f"DATEDIFF({fim}, {inicio})"
+
+    def truncate_date(self, unidade, expr):
+        if unidade == 'year':
+            return f"MAKEDATE(YEAR({expr}), 1)"
+        return f"DATE_SUB({expr}, INTERVAL DAYOFMONTH({expr}) - 1 DAY)"
+
+    def format_date(self, expr):
+        return f"DATE_FORMAT({expr}, '%%d/%%m/%%Y')"
+
+    def regexp_replace(self, expr, padrao, substituto):
+        # MySQL 8: substitui todas por padrão e referencia grupos como $1; a barra
+        # invertida é escape nos textos do MySQL e precisa ser dobrada
+        padrao = padrao.replace('\\', '\\\\')
+        substituto = re.sub(r'\\(\d)', r'$\1', substituto)
+        return f"REGEXP_REPLACE({expr}, '{padrao}', '{substituto}')"
+
+    def concat(self, *partes):
+        # || é OR no MySQL
+        return f"CONCAT({', '.join(partes)})"
+
+    def count_where(self, condicao):
+        return f"SUM(CASE WHEN {condicao} THEN 1 ELSE 0 END)"
+
+    def sum_where(self, expr, condicao):
+        return f"SUM(CASE WHEN {condicao} THEN {expr} END)"
+
+    def insert_ignore(self, tabela, colunas, select, conflito):
+        return f"INSERT IGNORE INTO {tabela} ({', '.join(colunas)})\n{select}"
+
+    def order_term(self, coluna, direcao, nulos):
+        # Sem NULLS FIRST/LAST: ordenar antes por "coluna IS NULL"
+        termo = f"{coluna} {direcao}" if direcao else coluna
+        if nulos:
+            return f"{coluna} IS NULL {'DESC' if nulos == 'FIRST' else 'ASC'}, {termo}"
+        return termo
+
+class SQLite(Dialeto):
+    nome = 'sqlite'
+
+    def add_months(self, expr, meses):
+        # Função registrada por config/database_sqlite.py (o modificador '+1 month' do
+        # SQLite transborda: 31/01 + 1 mês = 02 ou 03/03)
+        return f"add_months({expr}, {meses})"
+
+    def days_between(self, fim, inicio):
+        return f"CAST(julianday({fim}) - julianday({inicio}) AS INTEGER)"
+
+    def truncate_date(self, unidade, expr):
+        return f"date({expr}, 'start of {unidade}')"
+
+    def format_date(self, expr):
+        return f"strftime('%%d/%%m/%%Y', {expr})"
+
+    def skip_locked(self):
+        # Um único escritor por vez: não há travas de linha
+        return ""
+
+    def lock_rows(self):
+        return ""
+
+    def begin_write(self):
+        # Sem travas de linha: pegar a trava de escrita do banco já na leitura
+        return "BEGIN IMMEDIATE"
+
+DIALETOS = {d.nome: d for d in (Postgres(), MySQL(), SQLite())}
+
+def get_sql_dialect(database=None):
+    """Dialeto do backend em uso (ou do informado)"""
+    if database is None:
+        from config.database import db as database
+    return DIALETOS[getattr(database, 'dialeto', 'postgres')]
+
+class Filtros:
+    """Condições do WHERE e seus parâmetros, na ordem em que foram adicionadas
+
+        filtros = Filtros().equals('f.comando_id', comando_id or None)
+        filtros.date_range('f.data_vencimento', inicio, fim)
+        query = f"SELECT ... FROM faturas f {filtros.where()}"
+        db.execute_query(query, filtros.params, fetch=True)
+    """
+
+    def __init__(self):
+        self.condicoes = []
+        self.params = []
+
+    def add(self, condicao, *params):
+        self.condicoes.append(condicao)
+        self.params.extend(params)
+        return self
+
+    def equals(self, coluna, valor):
+        """coluna = valor (ignorado quando valor é None)"""
+        if valor is not None:
+            self.add(f"{coluna} = %s", valor)
+        return self
+
+    def one_of(self, coluna, valores):
+        """coluna IN (...) (ignorado quando não há valores)"""
+        valores = list(valores or [])
+        if len(valores) == 1:
+            return self.equals(coluna, valores[0])
+        if valores:
+            self.add(f"{coluna} IN ({', '.join(['%s'] * len(valores))})", *valores)
+        return self
+
+    def date_range(self, coluna, inicio=None, fim=None):
+        """Intervalo semiaberto sobre a coluna: inicio <= coluna < fim (None é aberto)"""
+        if inicio is not None:
+            self.add(f"{coluna} >= %s", inicio)
+        if fim is not None:
+            self.add(f"{coluna} < %s", fim)
+        return self
+
+    def after_key(self, colunas, chave, descendente=False):
+        """Paginação por chave: (colunas) > (chave), na mesma ordem do ORDER BY
+
+        Com descendente=True (ORDER BY ... DESC em todas as colunas) a
+        comparação é (colunas) < (chave).
+        """
+        if chave:
+            operador = '<' if descendente else '>'
+            self.add(f"({', '.join(colunas)}) {operador} ({', '.join(['%s'] * len(colunas))})", *chave)
+        return self
+
+    def sql(self, juncao="AND"):
+        return f" {juncao} ".join(self.condicoes)
+
+    def where(self):
+        """Cláusula WHERE completa ('' sem condições)"""
+        return f"WHERE {self.sql()}" if self.condicoes else ""
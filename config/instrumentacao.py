@@ -0,0 +1,146 @@
+"""
+Instrumentação das consultas do Database
+
+Cada consulta é agrupada pela sua impressão digital (SQL normalizado, sem
+literais) e acumula chamadas, tempo, histograma de latência, linhas e as
+funções que a chamaram. Consultas acima de DB_SLOW_QUERY_MS vão para o
+arquivo DB_SLOW_QUERY_LOG, se configurado.
+"""
+
+import hashlib
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+
+# Limites superiores das faixas do histograma, em milissegundos
+FAIXAS_MS = [1, 5, 10, 50, 100, 500, 1000, 5000]
+
+_RE_ESPACOS = re.compile(r'\s+')
+_RE_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMEROS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_RE_PLACEHOLDERS = re.compile(r'%s|\$\d+|\?')
+_RE_LISTAS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+def normalize_sql(query):
+    """SQL sem literais nem espaços extras (listas IN viram um único '?')"""
+    query = _RE_ESPACOS.sub(' ', query).strip()
+    query = _RE_STRINGS.sub('?', query)
+    query = _RE_NUMEROS.sub('?', query)
+    query = _RE_PLACEHOLDERS.sub('?', query)
+    return _RE_LISTAS.sub('(?...)', query)
+
+def fingerprint(query):
+    """Identificador curto e estável da consulta normalizada"""
+    return hashlib.md5(normalize_sql(query).encode('utf-8')).hexdigest()[:12]
+
+_CONFIG_DIR = os.path.dirname(os.path.abspath(__file__))
+_PROJETO_DIR = os.path.dirname(_CONFIG_DIR)
+
+# Origem informada explicitamente pela thread (consultas feitas em outra thread)
+_local = threading.local()
+
+def set_origin(origem):
+    """Definir a origem das consultas desta thread (None para limpar)"""
+    _local.origem = origem
+
+def start_measurement():
+    """Começar a somar o tempo de banco desta thread (usado pelo perfil de renderização)"""
+    _local.medicao = {'tempo_db': 0.0, 'consultas': 0}
+    return _local.medicao
+
+def stop_measurement():
+    """Encerrar a medição desta thread, retornando {'tempo_db', 'consultas'}"""
+    medicao = getattr(_local, 'medicao', None)
+    _local.medicao = None
+    return medicao
+
+def add_db_time(duracao, consultas=1):
+    """Somar tempo de banco à medição ativa desta thread (se houver)"""
+    medicao = getattr(_local, 'medicao', None)
+    if medicao is not None:
+        medicao['tempo_db'] += duracao
+        medicao['consultas'] += consultas
+
+def calling_function():
+    """Página/função do projeto que originou a consulta (fora de config/)"""
+    frame = sys._getframe(2)
+    while frame:
+        arquivo = frame.f_code.co_filename
+        if arquivo.startswith(_PROJETO_DIR) and not arquivo.startswith(_CONFIG_DIR):
+            modulo = os.path.splitext(os.path.relpath(arquivo, _PROJETO_DIR))[0].replace(os.sep, '.')
+            return f"{modulo}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    # Consultas disparadas em threads (ex.: config.database_async) não têm a página na pilha
+    return getattr(_local, 'origem', None) or "desconhecido"
+
+class QueryProfiler:
+    """Estatísticas acumuladas por impressão digital de consulta"""
+
+    def __init__(self):
+        self.ativo = os.getenv('DB_PROFILE', '1') != '0'
+        self.lento_ms = float(os.getenv('DB_SLOW_QUERY_MS', '500'))
+        self.arquivo_lentas = os.getenv('DB_SLOW_QUERY_LOG')
+        self._lock = threading.Lock()
+        self._consultas = {}
+
+    def record(self, query, duracao, linhas=None, origem=None):
+        """Registrar uma execução (duração em segundos)"""
+        add_db_time(duracao)
+        if not self.ativo:
+            return
+        origem = origem or calling_function()
+        chave = fingerprint(query)
+        ms = duracao * 1000
+        faixa = next((i for i, limite in enumerate(FAIXAS_MS) if ms <= limite), len(FAIXAS_MS))
+
+        with self._lock:
+            stats = self._consultas.get(chave)
+            if stats is None:
+                stats = self._consultas[chave] = {
+                    'fingerprint': chave,
+                    'consulta': normalize_sql(query),
+                    'chamadas': 0,
+                    'tempo_total': 0.0,
+                    'tempo_maximo': 0.0,
+                    'linhas': 0,
+                    'histograma': [0] * (len(FAIXAS_MS) + 1),
+                    'origens': Counter()
+                }
+            stats['chamadas'] += 1
+            stats['tempo_total'] += duracao
+            stats['tempo_maximo'] = max(stats['tempo_maximo'], duracao)
+            stats['linhas'] += linhas or 0
+            stats['histograma'][faixa] += 1
+            stats['origens'][origem] += 1
+
+        if ms >= self.lento_ms and self.arquivo_lentas:
+            self._log_lenta(query, ms, linhas, origem)
+
+    def _log_lenta(self, query, ms, linhas, origem):
+        """Acrescentar a consulta lenta ao arquivo de log"""
+        linha = (f"{datetime.now().isoformat(timespec='seconds')}\t{ms:.1f}ms\t{linhas if linhas is not None else '-'} linhas\t"
+                 f"{origem}\t{_RE_ESPACOS.sub(' ', query).strip()}\n")
+        try:
+            with self._lock:
+                with open(self.arquivo_lentas, 'a', encoding='utf-8') as f:
+                    f.write(linha)
+        except OSError as e:
+            print(f"Erro ao gravar log de consultas lentas: {e}")
+
+    def stats(self, top=None, ordem='tempo_total'):
+        """Consultas ordenadas (tempo_total, tempo_medio, tempo_maximo, chamadas ou linhas)"""
+        with self._lock:
+            resultado = []
+            for s in self._consultas.values():
+                item = dict(s, origens=dict(s['origens']), histograma=list(s['histograma']))
+                item['tempo_medio'] = s['tempo_total'] / s['chamadas']
+                resultado.append(item)
+        resultado.sort(key=lambda s: s[ordem], reverse=True)
+        return resultado[:top] if top else resultado
+
+    def reset(self):
+        with self._lock:
+            self._consultas.clear()
@@ -0,0 +1,153 @@
+"""
+Migrações versionadas do schema
+
+Cada arquivo em migrations/ se chama NNNN_nome.sql (qualquer banco) ou
+NNNN_nome.<dialeto>.sql (só para aquele banco, com precedência sobre o
+genérico da mesma versão). As versões aplicadas ficam na tabela
+schema_migrations; cada migração roda numa transação própria junto com o
+seu registro, então uma falha não deixa o schema pela metade.
+"""
+
+import hashlib
+import os
+import re
+from config.database import db
+
+MIGRACOES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+_RE_ARQUIVO = re.compile(r'^(\d{4})_([a-z0-9_]+?)(?:\.([a-z]+))?\.sql$')
+
+CRIAR_TABELA_SQL = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    versao INTEGER PRIMARY KEY,
+    nome VARCHAR(255) NOT NULL,
+    checksum VARCHAR(32) NOT NULL,
+    aplicada_em TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+# Consultas no formato das páginas e o índice que o plano deve usar (ou uma tupla de aceitos)
+VERIFICACOES = [
+    ("Lista de sócios (ordem alfabética)",
+     "SELECT id FROM socios ORDER BY nome_completo, id LIMIT 50", None, 'socios_nome_idx'),
+    ("Sócios por comando",
+     "SELECT id FROM socios WHERE comando_id = %s ORDER BY nome_completo, id LIMIT 50", (1,), 'socios_comando_nome_idx'),
+    ("Sócios por plano",
+     "SELECT id FROM socios WHERE plano_id = %s", (1,), 'socios_plano_idx'),
+    ("Lista de faturas (vencimento mais recente)",
+     "SELECT id FROM faturas ORDER BY data_vencimento DESC, id DESC LIMIT 50", None, 'faturas_vencimento_id_idx'),
+    ("Faturas do sócio",
+     "SELECT id FROM faturas WHERE socio_id = %s", (1,), 'faturas_socio_periodo_idx'),
+    ("Faturas por comando",
+     "SELECT id FROM faturas WHERE comando_id = %s", (1,), 'faturas_comando_idx'),
+    ("Faturas por status e vencimento",
+     "SELECT id FROM faturas WHERE status = %s AND data_vencimento >= %s AND data_vencimento < %s",
+     # Em intervalos curtos o índice da lista (só por vencimento) também serve
+     ('Pago', '2025-01-01', '2025-02-01'), ('faturas_status_vencimento_idx', 'faturas_vencimento_id_idx')),
+    ("Faturas pagas no período",
+     "SELECT id FROM faturas WHERE data_pagamento >= %s AND data_pagamento < %s",
+     ('2025-01-01', '2025-02-01'), 'faturas_pagamento_idx'),
+]
+
+def get_dialect(database=None):
+    """Dialeto SQL do backend ('postgres' por padrão)"""
+    return getattr(database or db, 'dialeto', 'postgres')
+
+def list_migrations(dialeto='postgres'):
+    """[(versao, nome, caminho)] em ordem, escolhendo o arquivo do dialeto quando houver"""
+    escolhidas = {}
+    for arquivo in sorted(os.listdir(MIGRACOES_DIR)):
+        m = _RE_ARQUIVO.match(arquivo)
+        if not m or m.group(3) not in (None, dialeto):
+            continue
+        versao = int(m.group(1))
+        if versao in escolhidas and m.group(3) is None:
+            continue  # O arquivo específico do dialeto tem precedência
+        escolhidas[versao] = (versao, m.group(2), os.path.join(MIGRACOES_DIR, arquivo))
+    return [escolhidas[v] for v in sorted(escolhidas)]
+
+def _checksum(caminho):
+    with open(caminho, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+def applied_migrations(database=None):
+    """{versao: {'nome', 'checksum', 'aplicada_em'}} das migrações já aplicadas"""
+    database = database or db
+    database.execute_query(CRIAR_TABELA_SQL)
+    linhas = database.execute_query(
+        "SELECT versao, nome, checksum, aplicada_em FROM schema_migrations ORDER BY versao", fetch=True
+    ) or []
+    return {linha['versao']: linha for linha in linhas}
+
+def pending_migrations(database=None):
+    """Migrações ainda não aplicadas neste banco"""
+    database = database or db
+    aplicadas = applied_migrations(database)
+    return [m for m in list_migrations(get_dialect(database)) if m[0] not in aplicadas]
+
+def changed_migrations(database=None):
+    """Migrações aplicadas cujo arquivo mudou depois (não são reaplicadas)"""
+    database = database or db
+    aplicadas = applied_migrations(database)
+    return [
+        (versao, nome) for versao, nome, caminho in list_migrations(get_dialect(database))
+        if versao in aplicadas and aplicadas[versao]['checksum'] != _checksum(caminho)
+    ]
+
+def migrate(database=None, ate=None, on_apply=None):
+    """Aplicar as migrações pendentes (até a versão `ate`); retorna as aplicadas"""
+    database = database or db
+    aplicadas = []
+    for versao, nome, caminho in pending_migrations(database):
+        if ate is not None and versao > ate:
+            break
+        with open(caminho, encoding='utf-8') as f:
+            sql = f.read()
+
+        with database.connection() as conn:
+            with conn.cursor() as cursor:
+                # As conexões do pool estão em autocommit: abrir a transação explicitamente
+                cursor.execute("BEGIN")
+                try:
+                    cursor.execute(sql)
+                    cursor.execute(
+                        "INSERT INTO schema_migrations (versao, nome, checksum) VALUES (%s, %s, %s)",
+                        (versao, nome, _checksum(caminho))
+                    )
+                    cursor.execute("COMMIT")
+                except Exception:
+                    cursor.execute("ROLLBACK")
+                    raise
+
+        aplicadas.append((versao, nome))
+        if on_apply:
+            on_apply(versao, nome)
+    return aplicadas
+
+def verify_indexes(database=None):
+    """Conferir com EXPLAIN se cada consulta de VERIFICACOES usa o índice esperado
+
+    Retorna [(descricao, indice, ok, plano)]. No PostgreSQL o seq scan é
+    desligado na transação da verificação: em tabelas pequenas o
+    planejador preferiria ler a tabela inteira e o teste não diria nada
+    sobre o índice. No SQLite o plano vem do EXPLAIN QUERY PLAN.
+    """
+    database = database or db
+    sqlite = get_dialect(database) == 'sqlite'
+
+    resultados = []
+    with database.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("BEGIN")
+            try:
+                if not sqlite:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                for descricao, query, params, indice in VERIFICACOES:
+                    cursor.execute(("EXPLAIN QUERY PLAN " if sqlite else "EXPLAIN ") + query, params)
+                    # Texto do plano na última coluna (única no PostgreSQL, 'detail' no SQLite)
+                    plano = "\n".join(linha[-1] for linha in cursor.fetchall())
+                    aceitos = indice if isinstance(indice, tuple) else (indice,)
+                    resultados.append((descricao, " ou ".join(aceitos), any(i in plano for i in aceitos), plano))
+            finally:
+                cursor.execute("ROLLBACK")
+    return resultados
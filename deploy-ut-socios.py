@@ -124,12 +124,12 @@ class UTDeployManager:
         """Executar configuração do banco"""
         print("\n🗄️ CONFIGURANDO BANCO DE DADOS...")
         
-        if self.run_script("railway-setup.py", "Configurando banco de dados no Railway"):
+        if self.run_script("migrar.py", "Aplicando as migrações do banco"):
             print("\n🎉 Banco de dados configurado!")
             print("✅ Sua app está pronta para usar!")
         else:
             print("\n❌ Falha na configuração do banco")
-            print("💡 Verifique as informações do banco MySQL no Railway")
+            print("💡 Verifique as variáveis DB_* do banco PostgreSQL no Railway")
     
     def run_complete_deploy(self):
         """Executar deploy completo"""
@@ -137,7 +137,7 @@ class UTDeployManager:
         
         steps = [
             ("git-install.py", "1. Configurando Git e GitHub"),
-            ("railway-setup.py", "2. Configurando banco de dados")
+            ("migrar.py", "2. Aplicando as migrações do banco")
         ]
         
         for script, description in steps:
@@ -171,15 +171,16 @@ class UTDeployManager:
    • Escolha seu repositório: ut-socios-streamlit
    • Clique em "Deploy Now"
 
-🗄️ PASSO 3: ADICIONAR BANCO MYSQL
+🗄️ PASSO 3: ADICIONAR BANCO POSTGRESQL
    • Na dashboard do projeto
    • Clique em "+ New"
-   • Selecione "Database" → "MySQL"
+   • Selecione "Database" → "PostgreSQL"
    • Aguarde a criação (2-3 minutos)
 
 ⚙️ PASSO 4: CONFIGURAR VARIÁVEIS
    • Clique na aba "Variables"
-   • Adicione as variáveis do banco (use o script railway-setup.py)
+   • Adicione as variáveis do banco (DB_HOST, DB_NAME, DB_USER, DB_PASSWORD)
+   • As tabelas são criadas em cada deploy por "python migrar.py"
 
 🌐 PASSO 5: CONFIGURAR DOMÍNIO
    • Clique na aba "Settings"
@@ -193,7 +194,7 @@ class UTDeployManager:
 💰 CUSTO:
    • Gratuito para começar ($5 créditos/mês)
    • Apps privados incluídos
-   • Banco MySQL incluído
+   • Banco PostgreSQL incluído
 
 🎯 RESULTADO:
    • App privado e seguro
@@ -221,7 +222,7 @@ class UTDeployManager:
    1. 📱 Acesse: https://railway.app
    2. 🏗️ Crie novo projeto
    3. 📂 Conecte com seu repositório GitHub
-   4. 🗄️ Adicione banco MySQL
+   4. 🗄️ Adicione banco PostgreSQL
    5. ⚙️ Configure variáveis de ambiente
    6. 🌐 Configure domínio
 
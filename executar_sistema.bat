@@ -17,6 +17,14 @@ for /f "tokens=5" %%a in ('netstat -ano ^| findstr :8501') do (
 REM Aguardar um momento
 timeout /t 2 /nobreak >nul
 
+REM Aplicar as migrações pendentes do banco
+echo 🗄️ Aplicando migrações...
+python migrar.py
+if errorlevel 1 (
+    pause
+    exit /b 1
+)
+
 REM Executar o sistema
 echo 🚀 Iniciando Streamlit...
 python -m streamlit run main.py --server.port 8501 --server.headless true
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Geração recorrente de faturas dos planos e marcação de atrasadas
+UT-SOCIOS - Sistema de Gestão de Sócios
+
+Uso (ex.: cron diário às 3h: 0 3 * * * cd /app && python gerar_faturas.py):
+    python gerar_faturas.py
+    python gerar_faturas.py --ate 2025-12-31
+    python gerar_faturas.py --somente-atrasadas
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+from config.database import db
+from utils.cache import read_db_versions
+from utils.dashboard_resumo import refresh_now
+from utils.faturamento import gerar_faturas, marcar_atrasadas, DIAS_ANTECEDENCIA, MAX_CICLOS
+
+def main():
+    parser = argparse.ArgumentParser(description="Gerar as faturas dos planos a vencer")
+    parser.add_argument("--ate", type=date.fromisoformat,
+                        help=f"Cobrar planos que vencem até esta data (padrão: hoje + {DIAS_ANTECEDENCIA} dias)")
+    parser.add_argument("--max-ciclos", type=int, default=MAX_CICLOS,
+                        help=f"Ciclos atrasados cobrados por sócio (padrão: {MAX_CICLOS})")
+    parser.add_argument("--somente-atrasadas", action="store_true",
+                        help="Apenas mudar faturas pendentes vencidas para Atrasado")
+    args = parser.parse_args()
+
+    if not db.connect():
+        print("❌ Erro ao conectar com o banco de dados")
+        return 1
+
+    alteradas = 0
+    if not args.somente_atrasadas:
+        print("🧾 Gerando faturas...")
+        inicio = time.time()
+        resultado = gerar_faturas(args.ate, args.max_ciclos)
+        alteradas += resultado['geradas']
+        print(f"✅ {resultado['geradas']} faturas geradas, {resultado['renovados']} planos renovados "
+              f"({resultado['ciclos']} ciclos) em {time.time() - inicio:.1f}s")
+
+    print("⏰ Marcando faturas atrasadas...")
+    inicio = time.time()
+    atrasadas = marcar_atrasadas()
+    alteradas += atrasadas
+    print(f"✅ {atrasadas} faturas marcadas como atrasadas em {time.time() - inicio:.1f}s")
+
+    if alteradas:
+        # O cache do app é invalidado pelos gatilhos de cache_versions (migração 0007),
+        # já gravados junto com as faturas; o resumo do dashboard é recalculado aqui
+        print("📊 Atualizando o resumo do dashboard...")
+        if not refresh_now():
+            print("⚠️ Não foi possível atualizar o resumo do dashboard")
+        try:
+            read_db_versions()
+        except Exception:
+            print("⚠️ Tabela cache_versions ausente (rode python migrar.py): "
+                  "o app só verá as novas faturas quando o cache expirar")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
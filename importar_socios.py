@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Importação em lote de sócios pela linha de comando
+UT-SOCIOS - Sistema de Gestão de Sócios
+
+Uso:
+    python importar_socios.py socios.csv
+    python importar_socios.py socios.xlsx --lote 5000 --erros erros.csv
+"""
+
+import argparse
+import os
+import sys
+import time
+from utils.cache import bump_db_versions
+from utils.search_index import VERSAO_INDICE
+from utils.socios_import import import_socios, errors_to_csv, BATCH_SIZE
+
+def main():
+    parser = argparse.ArgumentParser(description="Importar sócios de um arquivo CSV ou XLSX")
+    parser.add_argument("arquivo", help="Arquivo CSV ou XLSX com cabeçalho")
+    parser.add_argument("--lote", type=int, default=BATCH_SIZE, help=f"Linhas por lote (padrão: {BATCH_SIZE})")
+    parser.add_argument("--erros", help="Salvar o relatório de erros neste CSV")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.arquivo):
+        print(f"❌ Arquivo não encontrado: {args.arquivo}")
+        return 1
+
+    print(f"📥 Importando {args.arquivo}...")
+
+    def on_progress(resultado):
+        print(f"   {resultado['total']} linhas lidas, {resultado['importados']} importadas, "
+              f"{len(resultado['erros'])} com erro")
+
+    inicio = time.time()
+    try:
+        with open(args.arquivo, 'rb') as arquivo:
+            resultado = import_socios(arquivo, args.arquivo, batch_size=args.lote, on_progress=on_progress)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print(f"\n✅ {resultado['importados']} de {resultado['total']} sócios importados em {time.time() - inicio:.1f}s")
+
+    if resultado['erros']:
+        print(f"⚠️ {len(resultado['erros'])} linhas com erro")
+        for linha, mensagem in resultado['erros'][:20]:
+            print(f"   Linha {linha}: {mensagem}")
+        if len(resultado['erros']) > 20:
+            print("   ...")
+        if args.erros:
+            with open(args.erros, 'wb') as saida:
+                saida.write(errors_to_csv(resultado['erros']))
+            print(f"📄 Relatório de erros salvo em {args.erros}")
+
+    if resultado['importados']:
+        # As listas do app já são invalidadas pelos gatilhos de cache_versions;
+        # o índice de busca é recarregado pelos processos do app ao ver a nova versão
+        try:
+            bump_db_versions(VERSAO_INDICE)
+        except Exception as e:
+            print(f"⚠️ Não foi possível pedir a recarga do índice de busca: {e}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -102,7 +102,7 @@ echo    INSTALACAO CONCLUIDA!
 echo ========================================
 echo.
 echo 🚀 Proximos passos:
-echo    1. Configure o banco de dados: python setup_database.py
+echo    1. Crie as tabelas do banco: python migrar.py
 echo    2. Teste a conexao: python test_connection.py
 echo    3. Execute o sistema: python run.py
 echo.
@@ -163,7 +163,7 @@ def main():
     print("=" * 50)
     print()
     print("🚀 Próximos passos:")
-    print("   1. Configure o banco de dados: python setup_database.py")
+    print("   1. Crie as tabelas do banco: python migrar.py")
     print("   2. Teste a conexão: python test_connection.py")
     print("   3. Execute o sistema: python run.py")
     print()
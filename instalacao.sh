@@ -91,7 +91,7 @@ echo "    INSTALACAO CONCLUIDA!"
 echo "========================================"
 echo
 echo "🚀 Próximos passos:"
-echo "   1. Configure o banco de dados: python3 setup_database.py"
+echo "   1. Crie as tabelas do banco: python3 migrar.py"
 echo "   2. Teste a conexão: python3 test_connection.py"
 echo "   3. Execute o sistema: python3 run.py"
 echo
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Remoção de fotos de sócios sem referência no banco
+UT-SOCIOS - Sistema de Gestão de Sócios
+
+Uso (ex.: cron semanal):
+    python limpar_fotos.py
+    python limpar_fotos.py --carencia 0
+"""
+
+import argparse
+import sys
+from config.database import db
+from utils.photo_manager import collect_orphan_photos, GC_GRACE_SECONDS, UPLOAD_DIR
+
+def main():
+    parser = argparse.ArgumentParser(description=f"Apagar fotos em {UPLOAD_DIR} que nenhum sócio referencia")
+    parser.add_argument("--carencia", type=int, default=GC_GRACE_SECONDS,
+                        help=f"Ignorar arquivos gravados há menos de N segundos (padrão: {GC_GRACE_SECONDS})")
+    args = parser.parse_args()
+
+    if not db.connect():
+        print("❌ Erro ao conectar com o banco de dados")
+        return 1
+
+    print(f"🧹 Procurando fotos órfãs em {UPLOAD_DIR}...")
+    apagadas = collect_orphan_photos(args.carencia)
+    print(f"✅ {apagadas} fotos removidas")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,7 +8,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 try:
     from config.database import Database
     from utils.helpers import check_authentication
-    from pages import dashboard, socios, comandos, faturas, usuarios, planos, cadastro_publico
+    from utils.profiler import PROFILE_ENABLED, profile_render, show_profiler_panel
+    from pages import dashboard, socios, comandos, faturas, usuarios, planos, cadastro_publico, desempenho, tendencias
 except ImportError as e:
     st.error(f"Erro ao importar módulos: {e}")
     st.error("Execute: python instalacao.py")
@@ -82,7 +83,7 @@ def main():
         # Menu de navegação
         page = st.selectbox(
             "Navegação",
-            ["🏠 Dashboard", "👥 Sócios", "🏛️ Comandos", "💰 Faturas", "🎫 Planos", "👤 Usuários"],
+            ["🏠 Dashboard", "👥 Sócios", "🏛️ Comandos", "💰 Faturas", "📈 Tendências", "🎫 Planos", "👤 Usuários", "⏱️ Desempenho"],
             index=0
         )
         
@@ -92,7 +93,18 @@ def main():
         if st.button("🚪 Sair"):
             st.session_state.clear()
             st.rerun()
+        
+        # Painel de depuração (preenchido após a renderização da página)
+        painel_perfil = st.container() if PROFILE_ENABLED else None
     
+    if PROFILE_ENABLED:
+        with profile_render(page):
+            show_page(page)
+        show_profiler_panel(painel_perfil)
+    else:
+        show_page(page)
+
+def show_page(page):
     # Roteamento de páginas
     if page == "🏠 Dashboard":
         dashboard.show()
@@ -102,10 +114,14 @@ def main():
         comandos.show()
     elif page == "💰 Faturas":
         faturas.show()
+    elif page == "📈 Tendências":
+        tendencias.show()
     elif page == "🎫 Planos":
         planos.show()
     elif page == "👤 Usuários":
         usuarios.show()
+    elif page == "⏱️ Desempenho":
+        desempenho.show()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Aplicação das migrações do schema (pasta migrations/)
+UT-SOCIOS - Sistema de Gestão de Sócios
+
+Uso:
+    python migrar.py                 # aplicar as pendentes
+    python migrar.py --status        # listar aplicadas e pendentes
+    python migrar.py --ate 3         # aplicar até a versão 0003
+    python migrar.py --verificar     # conferir com EXPLAIN o uso dos índices
+"""
+
+import argparse
+import sys
+from config.database import db
+from config.migracoes import (
+    list_migrations, applied_migrations, changed_migrations, migrate, verify_indexes, get_dialect
+)
+
+def show_status():
+    aplicadas = applied_migrations()
+    for versao, nome, caminho in list_migrations(get_dialect()):
+        if versao in aplicadas:
+            print(f"   ✅ {versao:04d} {nome} ({aplicadas[versao]['aplicada_em']:%d/%m/%Y %H:%M})")
+        else:
+            print(f"   ⏳ {versao:04d} {nome}")
+
+def show_verification():
+    falhas = 0
+    for descricao, indice, ok, plano in verify_indexes():
+        print(f"   {'✅' if ok else '❌'} {descricao}: {indice}")
+        if not ok:
+            falhas += 1
+            print("      " + plano.replace("\n", "\n      "))
+    return falhas
+
+def main():
+    parser = argparse.ArgumentParser(description="Aplicar as migrações do schema")
+    parser.add_argument("--status", action="store_true", help="Listar migrações aplicadas e pendentes")
+    parser.add_argument("--ate", type=int, help="Aplicar somente até esta versão")
+    parser.add_argument("--verificar", action="store_true", help="Conferir com EXPLAIN se as consultas usam os índices")
+    args = parser.parse_args()
+
+    # O próprio script aplica as migrações (respeitando --ate e --status)
+    if hasattr(db, 'auto_migrate'):
+        db.auto_migrate = False
+    if not db.connect():
+        print("❌ Erro ao conectar com o banco de dados")
+        return 1
+
+    if args.status:
+        show_status()
+        return 0
+
+    for versao, nome in changed_migrations():
+        print(f"⚠️ {versao:04d} {nome} foi alterada depois de aplicada (crie uma nova migração)")
+
+    if not args.verificar:
+        print("🗄️ Aplicando migrações...")
+        try:
+            aplicadas = migrate(ate=args.ate, on_apply=lambda versao, nome: print(f"   ✅ {versao:04d} {nome}"))
+        except Exception as e:
+            print(f"❌ Erro na migração: {e}")
+            return 1
+        print(f"✅ {len(aplicadas)} migrações aplicadas" if aplicadas else "✅ Schema atualizado, nada pendente")
+        return 0
+
+    print("🔍 Verificando índices...")
+    falhas = show_verification()
+    return 1 if falhas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+-- ========================================
+-- UT-SOCIOS - Schema inicial (SQLite)
+-- Mesmas tabelas de 0001_schema_inicial.sql; os tipos declarados (DATE,
+-- TIMESTAMP, DECIMAL, BOOLEAN) definem a conversão feita por config/database_sqlite.py
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS usuarios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome VARCHAR(255) NOT NULL,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    senha VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS comandos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS planos (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome VARCHAR(100) NOT NULL,
+    valor DECIMAL(10,2) NOT NULL,
+    periodicidade VARCHAR(20) NOT NULL CHECK (periodicidade IN ('Mensal', 'Trimestral', 'Anual')),
+    beneficios TEXT,
+    inclui_camisa BOOLEAN DEFAULT FALSE,
+    ativo BOOLEAN DEFAULT TRUE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS socios (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nome_completo VARCHAR(255) NOT NULL,
+    foto VARCHAR(500),
+    cpf VARCHAR(14) UNIQUE NOT NULL,
+    data_nascimento DATE NOT NULL,
+    email VARCHAR(255) UNIQUE NOT NULL,
+    telefone VARCHAR(20) NOT NULL,
+    tamanho_camisa VARCHAR(10) NOT NULL CHECK (tamanho_camisa IN ('PP', 'P', 'M', 'G', 'GG', 'XG', 'XXG')),
+    comando_id INTEGER,
+    plano_id INTEGER,
+    data_adesao_plano DATE,
+    data_vencimento_plano DATE,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (comando_id) REFERENCES comandos(id),
+    FOREIGN KEY (plano_id) REFERENCES planos(id)
+);
+
+CREATE TABLE IF NOT EXISTS faturas (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    socio_id INTEGER NOT NULL,
+    comando_id INTEGER NOT NULL,
+    valor DECIMAL(10,2) NOT NULL,
+    descricao TEXT,
+    data_vencimento DATE NOT NULL,
+    data_pagamento DATE,
+    status VARCHAR(20) DEFAULT 'Pendente' CHECK (status IN ('Pendente', 'Pago', 'Atrasado')),
+    forma_pagamento VARCHAR(50),
+    comprovante VARCHAR(500),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (socio_id) REFERENCES socios(id),
+    FOREIGN KEY (comando_id) REFERENCES comandos(id)
+);
+
+-- Dados iniciais (só em banco vazio)
+-- Usuário administrador (senha: 123)
+INSERT INTO usuarios (nome, email, senha)
+VALUES ('Administrador', 'fernando@f5desenvolve.com.br', '$2b$12$LQv3c1yqBWVHxkd0LHAkCOYz6TtxMQJqhN8/LewdBdKJQK8Q8Q8Q8')
+ON CONFLICT (email) DO NOTHING;
+
+INSERT INTO comandos (nome)
+SELECT 'Comando Principal' WHERE NOT EXISTS (SELECT 1 FROM comandos);
+
+INSERT INTO planos (nome, valor, periodicidade, beneficios, inclui_camisa)
+SELECT 'Bronze', 30.00, 'Mensal', 'Acesso básico às atividades', FALSE
+WHERE NOT EXISTS (SELECT 1 FROM planos)
+UNION ALL SELECT 'Prata', 50.00, 'Mensal', 'Acesso completo + camisa', TRUE
+WHERE NOT EXISTS (SELECT 1 FROM planos)
+UNION ALL SELECT 'Ouro', 80.00, 'Mensal', 'Acesso premium + benefícios exclusivos', TRUE
+WHERE NOT EXISTS (SELECT 1 FROM planos);
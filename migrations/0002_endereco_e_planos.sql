@@ -0,0 +1,22 @@
+-- ========================================
+-- UT-SOCIOS - Endereço dos sócios e benefícios dos planos (PostgreSQL)
+-- Substitui add_endereco_fields.py e fix_socios_table.py
+-- ========================================
+
+-- Endereço (preenchido pelo CEP no cadastro)
+ALTER TABLE socios ADD COLUMN IF NOT EXISTS cep VARCHAR(10);
+ALTER TABLE socios ADD COLUMN IF NOT EXISTS endereco VARCHAR(255);
+ALTER TABLE socios ADD COLUMN IF NOT EXISTS numero VARCHAR(20);
+ALTER TABLE socios ADD COLUMN IF NOT EXISTS complemento VARCHAR(100);
+ALTER TABLE socios ADD COLUMN IF NOT EXISTS bairro VARCHAR(100);
+ALTER TABLE socios ADD COLUMN IF NOT EXISTS cidade VARCHAR(100);
+ALTER TABLE socios ADD COLUMN IF NOT EXISTS estado VARCHAR(2);
+
+-- Benefícios exibidos e editados em pages/planos.py
+ALTER TABLE planos ADD COLUMN IF NOT EXISTS descricao TEXT;
+ALTER TABLE planos ADD COLUMN IF NOT EXISTS desconto_loja INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE planos ADD COLUMN IF NOT EXISTS desconto_caravanas INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE planos ADD COLUMN IF NOT EXISTS desconto_bar INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE planos ADD COLUMN IF NOT EXISTS camisa_tipo VARCHAR(50);
+ALTER TABLE planos ADD COLUMN IF NOT EXISTS sorteio_mensal BOOLEAN DEFAULT FALSE;
+ALTER TABLE planos ADD COLUMN IF NOT EXISTS grupo_exclusivo BOOLEAN DEFAULT TRUE;
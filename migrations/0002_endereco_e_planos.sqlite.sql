@@ -0,0 +1,23 @@
+-- ========================================
+-- UT-SOCIOS - Endereço dos sócios e benefícios dos planos (SQLite)
+-- O SQLite não tem ADD COLUMN IF NOT EXISTS: o registro em schema_migrations
+-- garante que cada coluna é criada uma única vez
+-- ========================================
+
+-- Endereço (preenchido pelo CEP no cadastro)
+ALTER TABLE socios ADD COLUMN cep VARCHAR(10);
+ALTER TABLE socios ADD COLUMN endereco VARCHAR(255);
+ALTER TABLE socios ADD COLUMN numero VARCHAR(20);
+ALTER TABLE socios ADD COLUMN complemento VARCHAR(100);
+ALTER TABLE socios ADD COLUMN bairro VARCHAR(100);
+ALTER TABLE socios ADD COLUMN cidade VARCHAR(100);
+ALTER TABLE socios ADD COLUMN estado VARCHAR(2);
+
+-- Benefícios exibidos e editados em pages/planos.py
+ALTER TABLE planos ADD COLUMN descricao TEXT;
+ALTER TABLE planos ADD COLUMN desconto_loja INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE planos ADD COLUMN desconto_caravanas INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE planos ADD COLUMN desconto_bar INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE planos ADD COLUMN camisa_tipo VARCHAR(50);
+ALTER TABLE planos ADD COLUMN sorteio_mensal BOOLEAN DEFAULT FALSE;
+ALTER TABLE planos ADD COLUMN grupo_exclusivo BOOLEAN DEFAULT TRUE;
@@ -0,0 +1,26 @@
+-- ========================================
+-- UT-SOCIOS - Faturamento recorrente (PostgreSQL)
+-- Colunas e índice usados por utils/faturamento.py
+-- ========================================
+
+-- Data de renovação usada pelo formulário de faturas
+ALTER TABLE faturas ADD COLUMN IF NOT EXISTS data_renovacao DATE;
+
+-- Início do ciclo cobrado (data de vencimento do plano no momento da geração)
+ALTER TABLE faturas ADD COLUMN IF NOT EXISTS periodo DATE;
+
+-- Uma fatura por sócio e ciclo: reexecutar a geração não duplica cobranças
+CREATE UNIQUE INDEX IF NOT EXISTS faturas_socio_periodo_idx ON faturas (socio_id, periodo);
+
+-- Sócios com plano a vencer (filtro da geração)
+CREATE INDEX IF NOT EXISTS socios_vencimento_plano_idx ON socios (data_vencimento_plano)
+WHERE plano_id IS NOT NULL;
+
+-- Momento em que a fatura passou de Pendente para Atrasado (job marcar_atrasadas)
+ALTER TABLE faturas ADD COLUMN IF NOT EXISTS atrasado_em TIMESTAMP WITH TIME ZONE;
+
+-- Índices parciais: o job só percorre as pendentes, as leituras só as atrasadas
+CREATE INDEX IF NOT EXISTS faturas_pendentes_vencimento_idx ON faturas (data_vencimento)
+WHERE status = 'Pendente';
+CREATE INDEX IF NOT EXISTS faturas_atrasadas_vencimento_idx ON faturas (data_vencimento)
+WHERE status = 'Atrasado';
@@ -0,0 +1,46 @@
+-- ========================================
+-- UT-SOCIOS - Resumo do Dashboard (PostgreSQL)
+-- Uma única linha com todos os números do dashboard
+-- ========================================
+
+-- A aplicação executa REFRESH MATERIALIZED VIEW CONCURRENTLY após
+-- escritas em socios, faturas e comandos, e na virada do dia
+-- (data_referencia), já que mês atual e atrasos dependem da data.
+DROP MATERIALIZED VIEW IF EXISTS dashboard_resumo;
+CREATE MATERIALIZED VIEW dashboard_resumo AS
+SELECT
+    1 AS id,
+    CURRENT_DATE AS data_referencia,
+    (SELECT COUNT(*) FROM socios) AS total_socios,
+    pagas.total_faturas,
+    pagas.valor_total,
+    pagas.faturas_mes_atual,
+    pagas.valor_mes_atual,
+    -- Status mantido pelo job marcar_atrasadas (utils/faturamento.py)
+    (SELECT COUNT(*) FROM faturas WHERE status = 'Atrasado') AS faturas_atrasadas,
+    (SELECT COALESCE(json_agg(json_build_object('nome', r.nome, 'total_socios', r.total_socios)
+                              ORDER BY r.total_socios DESC), '[]'::json)
+     FROM (
+        SELECT c.nome, COUNT(s.id) AS total_socios
+        FROM comandos c
+        LEFT JOIN socios s ON s.comando_id = c.id
+        GROUP BY c.id, c.nome
+     ) r) AS ranking_comandos
+FROM (
+    SELECT
+        COUNT(*) AS total_faturas,
+        COALESCE(SUM(valor), 0) AS valor_total,
+        COUNT(*) FILTER (
+            WHERE data_pagamento >= date_trunc('month', CURRENT_DATE)::date
+              AND data_pagamento < (date_trunc('month', CURRENT_DATE) + INTERVAL '1 month')::date
+        ) AS faturas_mes_atual,
+        COALESCE(SUM(valor) FILTER (
+            WHERE data_pagamento >= date_trunc('month', CURRENT_DATE)::date
+              AND data_pagamento < (date_trunc('month', CURRENT_DATE) + INTERVAL '1 month')::date
+        ), 0) AS valor_mes_atual
+    FROM faturas
+    WHERE status = 'Pago'
+) pagas;
+
+-- Índice único exigido pelo REFRESH ... CONCURRENTLY (leituras não bloqueiam)
+CREATE UNIQUE INDEX dashboard_resumo_id_idx ON dashboard_resumo (id);
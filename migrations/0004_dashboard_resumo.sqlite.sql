@@ -0,0 +1,43 @@
+-- ========================================
+-- UT-SOCIOS - Resumo do Dashboard (SQLite)
+-- Uma única linha com todos os números do dashboard
+-- ========================================
+
+-- O SQLite não tem views materializadas: a view é calculada a cada leitura
+-- e o REFRESH executado pela aplicação é ignorado. Os sufixos [date] e
+-- [json] nos nomes pedem a conversão das colunas calculadas.
+DROP VIEW IF EXISTS dashboard_resumo;
+CREATE VIEW dashboard_resumo AS
+SELECT
+    1 AS id,
+    CURRENT_DATE AS "data_referencia [date]",
+    (SELECT COUNT(*) FROM socios) AS total_socios,
+    pagas.total_faturas,
+    pagas.valor_total,
+    pagas.faturas_mes_atual,
+    pagas.valor_mes_atual,
+    -- Status mantido pelo job marcar_atrasadas (utils/faturamento.py)
+    (SELECT COUNT(*) FROM faturas WHERE status = 'Atrasado') AS faturas_atrasadas,
+    (SELECT COALESCE(json_group_array(json_object('nome', r.nome, 'total_socios', r.total_socios)), '[]')
+     FROM (
+        SELECT c.nome, COUNT(s.id) AS total_socios
+        FROM comandos c
+        LEFT JOIN socios s ON s.comando_id = c.id
+        GROUP BY c.id, c.nome
+        ORDER BY total_socios DESC
+     ) r) AS "ranking_comandos [json]"
+FROM (
+    SELECT
+        COUNT(*) AS total_faturas,
+        COALESCE(SUM(valor), 0) AS valor_total,
+        COUNT(*) FILTER (
+            WHERE data_pagamento >= date('now', 'localtime', 'start of month')
+              AND data_pagamento < date('now', 'localtime', 'start of month', '+1 month')
+        ) AS faturas_mes_atual,
+        COALESCE(SUM(valor) FILTER (
+            WHERE data_pagamento >= date('now', 'localtime', 'start of month')
+              AND data_pagamento < date('now', 'localtime', 'start of month', '+1 month')
+        ), 0) AS valor_mes_atual
+    FROM faturas
+    WHERE status = 'Pago'
+) pagas;
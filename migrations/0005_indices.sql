@@ -0,0 +1,24 @@
+-- ========================================
+-- UT-SOCIOS - Índices das junções e filtros das páginas (PostgreSQL)
+-- Conferidos com EXPLAIN por config/migracoes.py (verify_indexes)
+-- ========================================
+
+-- Lista de sócios: ordem alfabética paginada por (nome_completo, id)
+CREATE INDEX IF NOT EXISTS socios_nome_idx ON socios (nome_completo, id);
+
+-- Filtro por comando na lista (mesma ordem) e junções/contagens por comando
+CREATE INDEX IF NOT EXISTS socios_comando_nome_idx ON socios (comando_id, nome_completo, id);
+
+-- Junções com planos e relatório de planos
+CREATE INDEX IF NOT EXISTS socios_plano_idx ON socios (plano_id);
+
+-- faturas.socio_id já é a primeira coluna de faturas_socio_periodo_idx (0003_faturamento.sql)
+
+-- Faturas por comando
+CREATE INDEX IF NOT EXISTS faturas_comando_idx ON faturas (comando_id);
+
+-- Listas e relatórios filtrados por status e período de vencimento
+CREATE INDEX IF NOT EXISTS faturas_status_vencimento_idx ON faturas (status, data_vencimento);
+
+-- Recebimentos por período de pagamento
+CREATE INDEX IF NOT EXISTS faturas_pagamento_idx ON faturas (data_pagamento);
@@ -0,0 +1,173 @@
+-- ========================================
+-- UT-SOCIOS - Totais mensais de faturas (PostgreSQL)
+-- Mantidos por gatilhos a cada escrita em faturas; lidos pelo dashboard,
+-- pelos relatórios e pela página de tendências
+-- ========================================
+
+-- Plano cobrado na fatura (gerar_faturas e o formulário preenchem)
+ALTER TABLE faturas ADD COLUMN IF NOT EXISTS plano_id INTEGER REFERENCES planos(id);
+
+UPDATE faturas f SET plano_id = s.plano_id
+FROM socios s
+WHERE s.id = f.socio_id AND f.plano_id IS NULL AND s.plano_id IS NOT NULL;
+
+-- Uma linha por mês, comando, plano e forma de pagamento.
+-- Totais por mês de vencimento: faturas, valor, pagas, valor_pago, atrasadas, valor_atrasado.
+-- Totais por mês de pagamento: recebidas, valor_recebido.
+-- plano_id 0 = sem plano; forma_pagamento '' = não informada
+CREATE TABLE IF NOT EXISTS faturas_monthly (
+    mes DATE NOT NULL,
+    comando_id INTEGER NOT NULL,
+    plano_id INTEGER NOT NULL DEFAULT 0,
+    forma_pagamento VARCHAR(50) NOT NULL DEFAULT '',
+    faturas INTEGER NOT NULL DEFAULT 0,
+    valor DECIMAL(14,2) NOT NULL DEFAULT 0,
+    pagas INTEGER NOT NULL DEFAULT 0,
+    valor_pago DECIMAL(14,2) NOT NULL DEFAULT 0,
+    atrasadas INTEGER NOT NULL DEFAULT 0,
+    valor_atrasado DECIMAL(14,2) NOT NULL DEFAULT 0,
+    recebidas INTEGER NOT NULL DEFAULT 0,
+    valor_recebido DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (mes, comando_id, plano_id, forma_pagamento)
+);
+
+-- Somar (sinal 1) as linhas novas e subtrair (sinal -1) as antigas de cada
+-- instrução. Gatilho por instrução: um UPDATE de 5.000 faturas vira um
+-- único INSERT ... ON CONFLICT agregado, não 5.000.
+CREATE OR REPLACE FUNCTION faturas_monthly_aplicar() RETURNS trigger AS $$
+DECLARE
+    origem TEXT;
+BEGIN
+    origem := CASE TG_OP
+        WHEN 'INSERT' THEN 'SELECT *, 1 AS sinal FROM novas'
+        WHEN 'DELETE' THEN 'SELECT *, -1 AS sinal FROM antigas'
+        ELSE 'SELECT *, 1 AS sinal FROM novas UNION ALL SELECT *, -1 AS sinal FROM antigas'
+    END;
+
+    EXECUTE format($sql$
+        INSERT INTO faturas_monthly AS m (mes, comando_id, plano_id, forma_pagamento, faturas, valor,
+                                          pagas, valor_pago, atrasadas, valor_atrasado, recebidas, valor_recebido)
+        SELECT mes, comando_id, plano_id, forma_pagamento,
+               SUM(faturas), SUM(valor), SUM(pagas), SUM(valor_pago),
+               SUM(atrasadas), SUM(valor_atrasado), SUM(recebidas), SUM(valor_recebido)
+        FROM (
+            SELECT date_trunc('month', data_vencimento)::date AS mes, comando_id,
+                   COALESCE(plano_id, 0) AS plano_id, COALESCE(forma_pagamento, '') AS forma_pagamento,
+                   sinal AS faturas, sinal * valor AS valor,
+                   CASE WHEN status = 'Pago' THEN sinal ELSE 0 END AS pagas,
+                   CASE WHEN status = 'Pago' THEN sinal * valor ELSE 0 END AS valor_pago,
+                   CASE WHEN status = 'Atrasado' THEN sinal ELSE 0 END AS atrasadas,
+                   CASE WHEN status = 'Atrasado' THEN sinal * valor ELSE 0 END AS valor_atrasado,
+                   0 AS recebidas, 0 AS valor_recebido
+            FROM (%1$s) mudancas
+            UNION ALL
+            SELECT date_trunc('month', data_pagamento)::date, comando_id,
+                   COALESCE(plano_id, 0), COALESCE(forma_pagamento, ''),
+                   0, 0, 0, 0, 0, 0, sinal, sinal * valor
+            FROM (%1$s) mudancas
+            WHERE status = 'Pago' AND data_pagamento IS NOT NULL
+        ) delta
+        GROUP BY mes, comando_id, plano_id, forma_pagamento
+        -- Linhas que se anulam (UPDATE sem mudança nos totais) não geram escrita
+        HAVING SUM(faturas) <> 0 OR SUM(valor) <> 0 OR SUM(pagas) <> 0 OR SUM(valor_pago) <> 0
+            OR SUM(atrasadas) <> 0 OR SUM(valor_atrasado) <> 0 OR SUM(recebidas) <> 0 OR SUM(valor_recebido) <> 0
+        ON CONFLICT (mes, comando_id, plano_id, forma_pagamento) DO UPDATE SET
+            faturas = m.faturas + EXCLUDED.faturas,
+            valor = m.valor + EXCLUDED.valor,
+            pagas = m.pagas + EXCLUDED.pagas,
+            valor_pago = m.valor_pago + EXCLUDED.valor_pago,
+            atrasadas = m.atrasadas + EXCLUDED.atrasadas,
+            valor_atrasado = m.valor_atrasado + EXCLUDED.valor_atrasado,
+            recebidas = m.recebidas + EXCLUDED.recebidas,
+            valor_recebido = m.valor_recebido + EXCLUDED.valor_recebido
+    $sql$, origem);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Tabelas de transição só podem ser usadas em gatilhos de um único evento
+DROP TRIGGER IF EXISTS faturas_monthly_insert ON faturas;
+CREATE TRIGGER faturas_monthly_insert AFTER INSERT ON faturas
+REFERENCING NEW TABLE AS novas
+FOR EACH STATEMENT EXECUTE FUNCTION faturas_monthly_aplicar();
+
+DROP TRIGGER IF EXISTS faturas_monthly_update ON faturas;
+CREATE TRIGGER faturas_monthly_update AFTER UPDATE ON faturas
+REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+FOR EACH STATEMENT EXECUTE FUNCTION faturas_monthly_aplicar();
+
+DROP TRIGGER IF EXISTS faturas_monthly_delete ON faturas;
+CREATE TRIGGER faturas_monthly_delete AFTER DELETE ON faturas
+REFERENCING OLD TABLE AS antigas
+FOR EACH STATEMENT EXECUTE FUNCTION faturas_monthly_aplicar();
+
+-- TRUNCATE não dispara os gatilhos acima: zerar os totais junto
+CREATE OR REPLACE FUNCTION faturas_monthly_truncar() RETURNS trigger AS $$
+BEGIN
+    TRUNCATE faturas_monthly;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS faturas_monthly_truncate ON faturas;
+CREATE TRIGGER faturas_monthly_truncate AFTER TRUNCATE ON faturas
+FOR EACH STATEMENT EXECUTE FUNCTION faturas_monthly_truncar();
+
+-- Carga inicial a partir das faturas existentes
+TRUNCATE faturas_monthly;
+INSERT INTO faturas_monthly (mes, comando_id, plano_id, forma_pagamento, faturas, valor,
+                             pagas, valor_pago, atrasadas, valor_atrasado, recebidas, valor_recebido)
+SELECT mes, comando_id, plano_id, forma_pagamento,
+       SUM(faturas), SUM(valor), SUM(pagas), SUM(valor_pago),
+       SUM(atrasadas), SUM(valor_atrasado), SUM(recebidas), SUM(valor_recebido)
+FROM (
+    SELECT date_trunc('month', data_vencimento)::date AS mes, comando_id,
+           COALESCE(plano_id, 0) AS plano_id, COALESCE(forma_pagamento, '') AS forma_pagamento,
+           1 AS faturas, valor,
+           CASE WHEN status = 'Pago' THEN 1 ELSE 0 END AS pagas,
+           CASE WHEN status = 'Pago' THEN valor ELSE 0 END AS valor_pago,
+           CASE WHEN status = 'Atrasado' THEN 1 ELSE 0 END AS atrasadas,
+           CASE WHEN status = 'Atrasado' THEN valor ELSE 0 END AS valor_atrasado,
+           0 AS recebidas, 0 AS valor_recebido
+    FROM faturas
+    UNION ALL
+    SELECT date_trunc('month', data_pagamento)::date, comando_id,
+           COALESCE(plano_id, 0), COALESCE(forma_pagamento, ''),
+           0, 0, 0, 0, 0, 0, 1, valor
+    FROM faturas
+    WHERE status = 'Pago' AND data_pagamento IS NOT NULL
+) carga
+GROUP BY mes, comando_id, plano_id, forma_pagamento;
+
+-- Dashboard: pagas e recebidas no mês saem dos totais mensais, não de faturas
+DROP MATERIALIZED VIEW IF EXISTS dashboard_resumo;
+CREATE MATERIALIZED VIEW dashboard_resumo AS
+SELECT
+    1 AS id,
+    CURRENT_DATE AS data_referencia,
+    (SELECT COUNT(*) FROM socios) AS total_socios,
+    totais.total_faturas,
+    totais.valor_total,
+    totais.faturas_mes_atual,
+    totais.valor_mes_atual,
+    totais.faturas_atrasadas,
+    (SELECT COALESCE(json_agg(json_build_object('nome', r.nome, 'total_socios', r.total_socios)
+                              ORDER BY r.total_socios DESC), '[]'::json)
+     FROM (
+        SELECT c.nome, COUNT(s.id) AS total_socios
+        FROM comandos c
+        LEFT JOIN socios s ON s.comando_id = c.id
+        GROUP BY c.id, c.nome
+     ) r) AS ranking_comandos
+FROM (
+    SELECT
+        COALESCE(SUM(pagas), 0) AS total_faturas,
+        COALESCE(SUM(valor_pago), 0) AS valor_total,
+        COALESCE(SUM(recebidas) FILTER (WHERE mes = date_trunc('month', CURRENT_DATE)::date), 0) AS faturas_mes_atual,
+        COALESCE(SUM(valor_recebido) FILTER (WHERE mes = date_trunc('month', CURRENT_DATE)::date), 0) AS valor_mes_atual,
+        -- Status mantido pelo job marcar_atrasadas (utils/faturamento.py)
+        COALESCE(SUM(atrasadas), 0) AS faturas_atrasadas
+    FROM faturas_monthly
+) totais;
+
+CREATE UNIQUE INDEX dashboard_resumo_id_idx ON dashboard_resumo (id);
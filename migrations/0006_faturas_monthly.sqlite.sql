@@ -0,0 +1,198 @@
+-- ========================================
+-- UT-SOCIOS - Totais mensais de faturas (SQLite)
+-- Mesma tabela de 0006_faturas_monthly.sql, mantida por gatilhos por linha
+-- (o SQLite não tem gatilhos por instrução nem tabelas de transição)
+-- ========================================
+
+-- Plano cobrado na fatura (gerar_faturas e o formulário preenchem)
+ALTER TABLE faturas ADD COLUMN plano_id INTEGER REFERENCES planos(id);
+
+UPDATE faturas SET plano_id = s.plano_id
+FROM socios s
+WHERE s.id = faturas.socio_id AND faturas.plano_id IS NULL AND s.plano_id IS NOT NULL;
+
+-- Uma linha por mês, comando, plano e forma de pagamento.
+-- Totais por mês de vencimento: faturas, valor, pagas, valor_pago, atrasadas, valor_atrasado.
+-- Totais por mês de pagamento: recebidas, valor_recebido.
+-- plano_id 0 = sem plano; forma_pagamento '' = não informada
+CREATE TABLE IF NOT EXISTS faturas_monthly (
+    mes DATE NOT NULL,
+    comando_id INTEGER NOT NULL,
+    plano_id INTEGER NOT NULL DEFAULT 0,
+    forma_pagamento VARCHAR(50) NOT NULL DEFAULT '',
+    faturas INTEGER NOT NULL DEFAULT 0,
+    valor DECIMAL(14,2) NOT NULL DEFAULT 0,
+    pagas INTEGER NOT NULL DEFAULT 0,
+    valor_pago DECIMAL(14,2) NOT NULL DEFAULT 0,
+    atrasadas INTEGER NOT NULL DEFAULT 0,
+    valor_atrasado DECIMAL(14,2) NOT NULL DEFAULT 0,
+    recebidas INTEGER NOT NULL DEFAULT 0,
+    valor_recebido DECIMAL(14,2) NOT NULL DEFAULT 0,
+    PRIMARY KEY (mes, comando_id, plano_id, forma_pagamento)
+);
+
+-- Cada gatilho soma a linha nova e/ou subtrai a antiga: uma instrução pelo
+-- mês de vencimento e outra pelo mês de pagamento (só faturas pagas).
+-- Valores em ponto flutuante: ROUND evita o acúmulo de resíduos nos centavos.
+DROP TRIGGER IF EXISTS faturas_monthly_insert;
+CREATE TRIGGER faturas_monthly_insert AFTER INSERT ON faturas
+BEGIN
+    INSERT INTO faturas_monthly (mes, comando_id, plano_id, forma_pagamento,
+                                 faturas, valor, pagas, valor_pago, atrasadas, valor_atrasado)
+    VALUES (date(NEW.data_vencimento, 'start of month'), NEW.comando_id,
+            COALESCE(NEW.plano_id, 0), COALESCE(NEW.forma_pagamento, ''),
+            1, NEW.valor,
+            NEW.status = 'Pago', CASE WHEN NEW.status = 'Pago' THEN NEW.valor ELSE 0 END,
+            NEW.status = 'Atrasado', CASE WHEN NEW.status = 'Atrasado' THEN NEW.valor ELSE 0 END)
+    ON CONFLICT (mes, comando_id, plano_id, forma_pagamento) DO UPDATE SET
+        faturas = faturas + excluded.faturas,
+        valor = ROUND(valor + excluded.valor, 2),
+        pagas = pagas + excluded.pagas,
+        valor_pago = ROUND(valor_pago + excluded.valor_pago, 2),
+        atrasadas = atrasadas + excluded.atrasadas,
+        valor_atrasado = ROUND(valor_atrasado + excluded.valor_atrasado, 2);
+
+    INSERT INTO faturas_monthly (mes, comando_id, plano_id, forma_pagamento, recebidas, valor_recebido)
+    SELECT date(NEW.data_pagamento, 'start of month'), NEW.comando_id,
+           COALESCE(NEW.plano_id, 0), COALESCE(NEW.forma_pagamento, ''), 1, NEW.valor
+    WHERE NEW.status = 'Pago' AND NEW.data_pagamento IS NOT NULL
+    ON CONFLICT (mes, comando_id, plano_id, forma_pagamento) DO UPDATE SET
+        recebidas = recebidas + excluded.recebidas,
+        valor_recebido = ROUND(valor_recebido + excluded.valor_recebido, 2);
+END;
+
+DROP TRIGGER IF EXISTS faturas_monthly_delete;
+CREATE TRIGGER faturas_monthly_delete AFTER DELETE ON faturas
+BEGIN
+    INSERT INTO faturas_monthly (mes, comando_id, plano_id, forma_pagamento,
+                                 faturas, valor, pagas, valor_pago, atrasadas, valor_atrasado)
+    VALUES (date(OLD.data_vencimento, 'start of month'), OLD.comando_id,
+            COALESCE(OLD.plano_id, 0), COALESCE(OLD.forma_pagamento, ''),
+            -1, -OLD.valor,
+            -(OLD.status = 'Pago'), CASE WHEN OLD.status = 'Pago' THEN -OLD.valor ELSE 0 END,
+            -(OLD.status = 'Atrasado'), CASE WHEN OLD.status = 'Atrasado' THEN -OLD.valor ELSE 0 END)
+    ON CONFLICT (mes, comando_id, plano_id, forma_pagamento) DO UPDATE SET
+        faturas = faturas + excluded.faturas,
+        valor = ROUND(valor + excluded.valor, 2),
+        pagas = pagas + excluded.pagas,
+        valor_pago = ROUND(valor_pago + excluded.valor_pago, 2),
+        atrasadas = atrasadas + excluded.atrasadas,
+        valor_atrasado = ROUND(valor_atrasado + excluded.valor_atrasado, 2);
+
+    INSERT INTO faturas_monthly (mes, comando_id, plano_id, forma_pagamento, recebidas, valor_recebido)
+    SELECT date(OLD.data_pagamento, 'start of month'), OLD.comando_id,
+           COALESCE(OLD.plano_id, 0), COALESCE(OLD.forma_pagamento, ''), -1, -OLD.valor
+    WHERE OLD.status = 'Pago' AND OLD.data_pagamento IS NOT NULL
+    ON CONFLICT (mes, comando_id, plano_id, forma_pagamento) DO UPDATE SET
+        recebidas = recebidas + excluded.recebidas,
+        valor_recebido = ROUND(valor_recebido + excluded.valor_recebido, 2);
+END;
+
+-- UPDATE das colunas que entram nos totais: subtrair a versão antiga e somar a nova
+DROP TRIGGER IF EXISTS faturas_monthly_update;
+CREATE TRIGGER faturas_monthly_update
+AFTER UPDATE OF data_vencimento, data_pagamento, status, valor, comando_id, plano_id, forma_pagamento ON faturas
+BEGIN
+    INSERT INTO faturas_monthly (mes, comando_id, plano_id, forma_pagamento,
+                                 faturas, valor, pagas, valor_pago, atrasadas, valor_atrasado)
+    VALUES (date(OLD.data_vencimento, 'start of month'), OLD.comando_id,
+            COALESCE(OLD.plano_id, 0), COALESCE(OLD.forma_pagamento, ''),
+            -1, -OLD.valor,
+            -(OLD.status = 'Pago'), CASE WHEN OLD.status = 'Pago' THEN -OLD.valor ELSE 0 END,
+            -(OLD.status = 'Atrasado'), CASE WHEN OLD.status = 'Atrasado' THEN -OLD.valor ELSE 0 END)
+    ON CONFLICT (mes, comando_id, plano_id, forma_pagamento) DO UPDATE SET
+        faturas = faturas + excluded.faturas,
+        valor = ROUND(valor + excluded.valor, 2),
+        pagas = pagas + excluded.pagas,
+        valor_pago = ROUND(valor_pago + excluded.valor_pago, 2),
+        atrasadas = atrasadas + excluded.atrasadas,
+        valor_atrasado = ROUND(valor_atrasado + excluded.valor_atrasado, 2);
+
+    INSERT INTO faturas_monthly (mes, comando_id, plano_id, forma_pagamento, recebidas, valor_recebido)
+    SELECT date(OLD.data_pagamento, 'start of month'), OLD.comando_id,
+           COALESCE(OLD.plano_id, 0), COALESCE(OLD.forma_pagamento, ''), -1, -OLD.valor
+    WHERE OLD.status = 'Pago' AND OLD.data_pagamento IS NOT NULL
+    ON CONFLICT (mes, comando_id, plano_id, forma_pagamento) DO UPDATE SET
+        recebidas = recebidas + excluded.recebidas,
+        valor_recebido = ROUND(valor_recebido + excluded.valor_recebido, 2);
+
+    INSERT INTO faturas_monthly (mes, comando_id, plano_id, forma_pagamento,
+                                 faturas, valor, pagas, valor_pago, atrasadas, valor_atrasado)
+    VALUES (date(NEW.data_vencimento, 'start of month'), NEW.comando_id,
+            COALESCE(NEW.plano_id, 0), COALESCE(NEW.forma_pagamento, ''),
+            1, NEW.valor,
+            NEW.status = 'Pago', CASE WHEN NEW.status = 'Pago' THEN NEW.valor ELSE 0 END,
+            NEW.status = 'Atrasado', CASE WHEN NEW.status = 'Atrasado' THEN NEW.valor ELSE 0 END)
+    ON CONFLICT (mes, comando_id, plano_id, forma_pagamento) DO UPDATE SET
+        faturas = faturas + excluded.faturas,
+        valor = ROUND(valor + excluded.valor, 2),
+        pagas = pagas + excluded.pagas,
+        valor_pago = ROUND(valor_pago + excluded.valor_pago, 2),
+        atrasadas = atrasadas + excluded.atrasadas,
+        valor_atrasado = ROUND(valor_atrasado + excluded.valor_atrasado, 2);
+
+    INSERT INTO faturas_monthly (mes, comando_id, plano_id, forma_pagamento, recebidas, valor_recebido)
+    SELECT date(NEW.data_pagamento, 'start of month'), NEW.comando_id,
+           COALESCE(NEW.plano_id, 0), COALESCE(NEW.forma_pagamento, ''), 1, NEW.valor
+    WHERE NEW.status = 'Pago' AND NEW.data_pagamento IS NOT NULL
+    ON CONFLICT (mes, comando_id, plano_id, forma_pagamento) DO UPDATE SET
+        recebidas = recebidas + excluded.recebidas,
+        valor_recebido = ROUND(valor_recebido + excluded.valor_recebido, 2);
+END;
+
+-- Carga inicial a partir das faturas existentes
+DELETE FROM faturas_monthly;
+INSERT INTO faturas_monthly (mes, comando_id, plano_id, forma_pagamento, faturas, valor,
+                             pagas, valor_pago, atrasadas, valor_atrasado, recebidas, valor_recebido)
+SELECT mes, comando_id, plano_id, forma_pagamento,
+       SUM(faturas), ROUND(SUM(valor), 2), SUM(pagas), ROUND(SUM(valor_pago), 2),
+       SUM(atrasadas), ROUND(SUM(valor_atrasado), 2), SUM(recebidas), ROUND(SUM(valor_recebido), 2)
+FROM (
+    SELECT date(data_vencimento, 'start of month') AS mes, comando_id,
+           COALESCE(plano_id, 0) AS plano_id, COALESCE(forma_pagamento, '') AS forma_pagamento,
+           1 AS faturas, valor,
+           status = 'Pago' AS pagas,
+           CASE WHEN status = 'Pago' THEN valor ELSE 0 END AS valor_pago,
+           status = 'Atrasado' AS atrasadas,
+           CASE WHEN status = 'Atrasado' THEN valor ELSE 0 END AS valor_atrasado,
+           0 AS recebidas, 0 AS valor_recebido
+    FROM faturas
+    UNION ALL
+    SELECT date(data_pagamento, 'start of month'), comando_id,
+           COALESCE(plano_id, 0), COALESCE(forma_pagamento, ''),
+           0, 0, 0, 0, 0, 0, 1, valor
+    FROM faturas
+    WHERE status = 'Pago' AND data_pagamento IS NOT NULL
+) carga
+GROUP BY mes, comando_id, plano_id, forma_pagamento;
+
+-- Dashboard: pagas e recebidas no mês saem dos totais mensais, não de faturas
+DROP VIEW IF EXISTS dashboard_resumo;
+CREATE VIEW dashboard_resumo AS
+SELECT
+    1 AS id,
+    CURRENT_DATE AS "data_referencia [date]",
+    (SELECT COUNT(*) FROM socios) AS total_socios,
+    totais.total_faturas,
+    totais.valor_total,
+    totais.faturas_mes_atual,
+    totais.valor_mes_atual,
+    totais.faturas_atrasadas,
+    (SELECT COALESCE(json_group_array(json_object('nome', r.nome, 'total_socios', r.total_socios)), '[]')
+     FROM (
+        SELECT c.nome, COUNT(s.id) AS total_socios
+        FROM comandos c
+        LEFT JOIN socios s ON s.comando_id = c.id
+        GROUP BY c.id, c.nome
+        ORDER BY total_socios DESC
+     ) r) AS "ranking_comandos [json]"
+FROM (
+    SELECT
+        COALESCE(SUM(pagas), 0) AS total_faturas,
+        COALESCE(ROUND(SUM(valor_pago), 2), 0) AS valor_total,
+        COALESCE(SUM(recebidas) FILTER (WHERE mes = date('now', 'localtime', 'start of month')), 0) AS faturas_mes_atual,
+        COALESCE(SUM(valor_recebido) FILTER (WHERE mes = date('now', 'localtime', 'start of month')), 0) AS valor_mes_atual,
+        -- Status mantido pelo job marcar_atrasadas (utils/faturamento.py)
+        COALESCE(SUM(atrasadas), 0) AS faturas_atrasadas
+    FROM faturas_monthly
+) totais;
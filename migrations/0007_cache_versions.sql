@@ -0,0 +1,40 @@
+-- ========================================
+-- UT-SOCIOS - Versões das tabelas para o cache de consultas (PostgreSQL)
+-- Incrementadas por gatilhos a cada escrita, de qualquer processo
+-- (app, gerar_faturas.py, importar_socios.py, limpar_fotos.py, outras réplicas)
+-- ========================================
+
+-- utils/cache.py inclui as versões na chave do cache e as relê a cada
+-- CACHE_CHECK_INTERVAL segundos. A versão nova só fica visível no commit
+-- da escrita, então nenhuma leitura guarda dados antigos sob ela.
+CREATE TABLE IF NOT EXISTS cache_versions (
+    tabela VARCHAR(63) PRIMARY KEY,
+    versao BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO cache_versions (tabela) VALUES ('socios'), ('faturas'), ('comandos'), ('planos')
+ON CONFLICT (tabela) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION cache_versions_incrementar() RETURNS trigger AS $$
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = TG_TABLE_NAME;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Gatilho por instrução: uma importação de 10.000 sócios incrementa uma vez
+DROP TRIGGER IF EXISTS cache_versions_socios ON socios;
+CREATE TRIGGER cache_versions_socios AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON socios
+FOR EACH STATEMENT EXECUTE FUNCTION cache_versions_incrementar();
+
+DROP TRIGGER IF EXISTS cache_versions_faturas ON faturas;
+CREATE TRIGGER cache_versions_faturas AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON faturas
+FOR EACH STATEMENT EXECUTE FUNCTION cache_versions_incrementar();
+
+DROP TRIGGER IF EXISTS cache_versions_comandos ON comandos;
+CREATE TRIGGER cache_versions_comandos AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON comandos
+FOR EACH STATEMENT EXECUTE FUNCTION cache_versions_incrementar();
+
+DROP TRIGGER IF EXISTS cache_versions_planos ON planos;
+CREATE TRIGGER cache_versions_planos AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON planos
+FOR EACH STATEMENT EXECUTE FUNCTION cache_versions_incrementar();
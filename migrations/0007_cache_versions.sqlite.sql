@@ -0,0 +1,85 @@
+-- ========================================
+-- UT-SOCIOS - Versões das tabelas para o cache de consultas (SQLite)
+-- Mesma tabela de 0007_cache_versions.sql, incrementada por gatilhos por linha
+-- (o SQLite não tem gatilhos por instrução)
+-- ========================================
+
+CREATE TABLE IF NOT EXISTS cache_versions (
+    tabela VARCHAR(63) PRIMARY KEY,
+    versao BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO cache_versions (tabela) VALUES ('socios'), ('faturas'), ('comandos'), ('planos')
+ON CONFLICT (tabela) DO NOTHING;
+
+DROP TRIGGER IF EXISTS cache_versions_socios_insert;
+CREATE TRIGGER cache_versions_socios_insert AFTER INSERT ON socios
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'socios';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_socios_update;
+CREATE TRIGGER cache_versions_socios_update AFTER UPDATE ON socios
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'socios';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_socios_delete;
+CREATE TRIGGER cache_versions_socios_delete AFTER DELETE ON socios
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'socios';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_faturas_insert;
+CREATE TRIGGER cache_versions_faturas_insert AFTER INSERT ON faturas
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'faturas';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_faturas_update;
+CREATE TRIGGER cache_versions_faturas_update AFTER UPDATE ON faturas
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'faturas';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_faturas_delete;
+CREATE TRIGGER cache_versions_faturas_delete AFTER DELETE ON faturas
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'faturas';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_comandos_insert;
+CREATE TRIGGER cache_versions_comandos_insert AFTER INSERT ON comandos
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'comandos';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_comandos_update;
+CREATE TRIGGER cache_versions_comandos_update AFTER UPDATE ON comandos
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'comandos';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_comandos_delete;
+CREATE TRIGGER cache_versions_comandos_delete AFTER DELETE ON comandos
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'comandos';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_planos_insert;
+CREATE TRIGGER cache_versions_planos_insert AFTER INSERT ON planos
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'planos';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_planos_update;
+CREATE TRIGGER cache_versions_planos_update AFTER UPDATE ON planos
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'planos';
+END;
+
+DROP TRIGGER IF EXISTS cache_versions_planos_delete;
+CREATE TRIGGER cache_versions_planos_delete AFTER DELETE ON planos
+BEGIN
+    UPDATE cache_versions SET versao = versao + 1 WHERE tabela = 'planos';
+END;
@@ -0,0 +1,7 @@
+-- ========================================
+-- UT-SOCIOS - Índice da lista de faturas
+-- A lista pagina por chave em ORDER BY data_vencimento DESC, id DESC
+-- (pages/faturas.py get_faturas_page): cada página lê só as suas linhas
+-- ========================================
+
+CREATE INDEX IF NOT EXISTS faturas_vencimento_id_idx ON faturas (data_vencimento, id);
@@ -3,12 +3,16 @@ import pandas as pd
 from config.database import db
 from utils.helpers import show_success, show_error, format_date
 from utils.validators import validate_cpf, validate_email, validate_phone, format_cpf, format_phone, validate_cep, format_cep
-from utils.photo_manager import create_photo_upload_widget, save_socio_photo
-from datetime import date, timedelta
+from utils.photo_manager import create_photo_upload_widget, check_photo_upload, queue_socio_photo
+from utils.search_index import index_socio
+from pages.dashboard import refresh_dashboard_resumo
+from utils.cache import cached_query, invalidate
+from utils.socios_cadastro import insert_socio, RegistroDuplicado
+from datetime import date
 import time
 
 # Cache para comandos
-@st.cache_data(ttl=300)
+@cached_query('comandos')
 def get_comandos():
     """Buscar comandos com cache"""
     try:
@@ -20,7 +24,7 @@ def get_comandos():
         return []
 
 # Cache para planos
-@st.cache_data(ttl=300)
+@cached_query('planos')
 def get_planos():
     """Buscar planos com cache"""
     try:
@@ -48,59 +52,24 @@ def get_planos():
         return []
 
 def create_socio_publico(nome, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, foto, plano_id, endereco_data):
-    """Criar novo sócio via cadastro público"""
+    """Criar novo sócio via cadastro público
+    
+    Retorna (sucesso, mensagem, vencimento do plano calculado pelo banco).
+    """
     try:
-        # Verificar se CPF já existe
-        cpf_check = "SELECT id FROM socios WHERE cpf = %s"
-        existing = db.execute_query_one(cpf_check, (cpf,))
-        
-        if existing:
-            return False, "CPF já cadastrado!"
-        
-        # Verificar se email já existe
-        email_check = "SELECT id FROM socios WHERE email = %s"
-        existing_email = db.execute_query_one(email_check, (email,))
-        
-        if existing_email:
-            return False, "E-mail já cadastrado!"
-        
-        # Calcular datas do plano se houver
-        data_adesao_plano = None
-        data_vencimento_plano = None
-        
-        if plano_id:
-            data_adesao_plano = date.today()
-            # Buscar periodicidade do plano
-            plano_info = db.execute_query_one("SELECT periodicidade FROM planos WHERE id = %s", (plano_id,))
-            if plano_info:
-                if plano_info['periodicidade'] == 'Mensal':
-                    data_vencimento_plano = data_adesao_plano + timedelta(days=30)
-                elif plano_info['periodicidade'] == 'Trimestral':
-                    data_vencimento_plano = data_adesao_plano + timedelta(days=90)
-                elif plano_info['periodicidade'] == 'Anual':
-                    data_vencimento_plano = data_adesao_plano + timedelta(days=365)
-        
-        # Inserir sócio
-        insert_query = """
-        INSERT INTO socios (nome_completo, foto, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, 
-                           plano_id, data_adesao_plano, data_vencimento_plano,
-                           cep, endereco, numero, complemento, bairro, cidade, estado)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        params = (nome, foto, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, 
-                 plano_id, data_adesao_plano, data_vencimento_plano,
-                 endereco_data['cep'], endereco_data['endereco'], endereco_data['numero'],
-                 endereco_data['complemento'], endereco_data['bairro'], endereco_data['cidade'],
-                 endereco_data['estado'])
-        
-        if db.execute_query(insert_query, params):
-            return True, "Sócio cadastrado com sucesso!"
-        else:
-            return False, "Erro ao cadastrar sócio"
-            
+        # Uma instrução: o UNIQUE de CPF/e-mail recusa duplicados e as datas do plano saem do banco
+        novo_socio = insert_socio(nome, cpf, data_nascimento, email, telefone, tamanho_camisa,
+                                  comando_id, foto, plano_id, endereco_data)
+    except RegistroDuplicado as e:
+        return False, "CPF já cadastrado!" if e.campo == 'cpf' else "E-mail já cadastrado!", None
     except Exception as e:
-        return False, f"Erro ao criar sócio: {e}"
+        return False, f"Erro ao criar sócio: {e}", None
+    
+    # Atualizar índice de busca
+    index_socio(novo_socio['id'], nome, cpf, email, telefone, comando_id)
+    invalidate('socios')
+    refresh_dashboard_resumo()
+    return True, "Sócio cadastrado com sucesso!", novo_socio['data_vencimento_plano']
 
 def show_planos_cards():
     """Mostrar cards dos planos de forma atrativa"""
@@ -582,20 +551,18 @@ def show():
                     'estado': estado if estado else None
                 }
                 
-                # Processar foto
-                foto_path = None
+                # Validar foto (o processamento roda em segundo plano após o cadastro)
                 if foto_uploaded:
-                    with st.spinner("Salvando foto..."):
-                        foto_path, error = save_socio_photo(foto_uploaded)
-                        if error:
-                            st.error(f"Erro ao salvar foto: {error}")
-                            return
+                    error = check_photo_upload(foto_uploaded)
+                    if error:
+                        st.error(f"Erro ao salvar foto: {error}")
+                        return
                 
                 # Processar plano
                 plano_id_final = plano_selecionado_id if plano_selecionado_id else None
                 
                 # Salvar sócio
-                success, message = create_socio_publico(
+                success, message, vencimento_plano = create_socio_publico(
                     nome_completo.strip(), 
                     cpf_limpo, 
                     data_nascimento, 
@@ -603,12 +570,14 @@ def show():
                     telefone_limpo, 
                     tamanho_camisa, 
                     comando_id, 
-                    foto_path,
+                    None,
                     plano_id_final, 
                     endereco_data
                 )
                 
                 if success:
+                    if foto_uploaded:
+                        queue_socio_photo(foto_uploaded, cpf_limpo)
                     st.success("🎉 Parabéns! Você agora é um Sócio da União!")
                     st.balloons()
                     
@@ -617,7 +586,8 @@ def show():
                         plano_info = next((p for p in get_planos() if p['id'] == plano_id_final), None)
                         if plano_info:
                             st.info(f"📋 **Plano selecionado**: {plano_info['nome']} - R$ {plano_info['valor']:.2f}")
-                            st.info(f"📅 **Vencimento**: {format_date(date.today() + timedelta(days=365))}")
+                        if vencimento_plano:
+                            st.info(f"📅 **Vencimento**: {format_date(vencimento_plano)}")
                     
                     st.markdown("---")
                     st.markdown("### 📞 Próximos Passos:")
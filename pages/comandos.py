@@ -2,6 +2,8 @@ import streamlit as st
 import pandas as pd
 from config.database import db
 from utils.helpers import show_success, show_error
+from pages.dashboard import refresh_dashboard_resumo
+from utils.cache import invalidate
 
 def show():
     st.title("🏛️ Gestão de Comandos")
@@ -116,8 +118,7 @@ def show_edit_form(comando_id):
     st.subheader("✏️ Editar Comando")
     
     # Buscar dados do comando
-    comando_query = "SELECT * FROM comandos WHERE id = %s"
-    comando = db.execute_query_one(comando_query, (comando_id,))
+    comando = db.execute_prepared_one('comando_por_id', (comando_id,))
     
     if not comando:
         show_error("Comando não encontrado!")
@@ -151,7 +152,11 @@ def create_comando(nome):
     """Criar novo comando"""
     try:
         insert_query = "INSERT INTO comandos (nome) VALUES (%s)"
-        return db.execute_query(insert_query, (nome,))
+        if db.execute_query(insert_query, (nome,)):
+            invalidate('comandos')
+            refresh_dashboard_resumo()
+            return True
+        return False
     except Exception as e:
         show_error(f"Erro ao criar comando: {e}")
         return False
@@ -160,7 +165,11 @@ def update_comando(comando_id, nome):
     """Atualizar comando"""
     try:
         update_query = "UPDATE comandos SET nome = %s WHERE id = %s"
-        return db.execute_query(update_query, (nome, comando_id))
+        if db.execute_query(update_query, (nome, comando_id)):
+            invalidate('comandos')
+            refresh_dashboard_resumo()
+            return True
+        return False
     except Exception as e:
         show_error(f"Erro ao atualizar comando: {e}")
         return False
@@ -169,7 +178,11 @@ def delete_comando(comando_id):
     """Excluir comando"""
     try:
         delete_query = "DELETE FROM comandos WHERE id = %s"
-        return db.execute_query(delete_query, (comando_id,))
+        if db.execute_query(delete_query, (comando_id,)):
+            invalidate('comandos')
+            refresh_dashboard_resumo()
+            return True
+        return False
     except Exception as e:
         show_error(f"Erro ao excluir comando: {e}")
         return False
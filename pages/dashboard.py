@@ -2,7 +2,14 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, date
 from config.database import db
+from config.database_async import adb, run_concurrently
+from config.dialeto import get_sql_dialect
 from utils.helpers import create_metric_card, format_currency, format_date
+from utils.faturamento import request_marcar_atrasadas
+from utils.dashboard_resumo import refresh_now, request_refresh
+
+# Quantidade máxima de faturas em atraso listadas no dashboard
+MAX_FATURAS_ATRASADAS = 100
 
 def show():
     st.title("🏠 Dashboard")
@@ -64,72 +71,72 @@ def show():
         )
     
     # Faturas em Atraso
-    if dashboard_data['faturas_atrasadas_list']:
+    faturas_df = dashboard_data['faturas_atrasadas_list']
+    if not faturas_df.empty:
         st.markdown("---")
         st.subheader("⚠️ Faturas em Atraso")
+        if dashboard_data['faturas_atrasadas'] > len(faturas_df):
+            st.caption(f"Exibindo as {len(faturas_df)} mais antigas de {dashboard_data['faturas_atrasadas']}.")
         
-        faturas_df = pd.DataFrame(dashboard_data['faturas_atrasadas_list'])
-        faturas_df['data_vencimento'] = pd.to_datetime(faturas_df['data_vencimento']).dt.strftime('%d/%m/%Y')
-        faturas_df['valor'] = faturas_df['valor'].apply(lambda x: format_currency(x))
+        faturas_df['data_vencimento'] = faturas_df['data_vencimento'].dt.strftime('%d/%m/%Y')
+        faturas_df['valor'] = faturas_df['valor'].map(format_currency)
         
         st.dataframe(
-            faturas_df[['socio_nome', 'comando_nome', 'data_vencimento', 'valor', 'dias_atraso']],
+            faturas_df,
             use_container_width=True,
             hide_index=True
         )
 
+def refresh_dashboard_resumo():
+    """Pedir o recálculo do resumo do dashboard (chamar após escritas em sócios, faturas ou comandos)
+
+    O REFRESH roda em segundo plano e agrupa escritas próximas (ver utils/dashboard_resumo.py).
+    """
+    request_refresh()
+
 def get_dashboard_data():
     """Buscar dados para o dashboard"""
     
-    # Total de sócios
-    total_socios_query = "SELECT COUNT(*) as total FROM socios"
-    total_socios_result = db.execute_query_one(total_socios_query)
-    total_socios = total_socios_result['total'] if total_socios_result else 0
-    
-    # Faturas pagas
-    faturas_pagas_query = """
-    SELECT 
-        COUNT(*) as total_faturas, 
-        SUM(valor) as valor_total,
-        COUNT(CASE WHEN MONTH(data_pagamento) = MONTH(CURRENT_DATE) 
-                   AND YEAR(data_pagamento) = YEAR(CURRENT_DATE) THEN 1 END) as faturas_mes_atual,
-        SUM(CASE WHEN MONTH(data_pagamento) = MONTH(CURRENT_DATE) 
-                 AND YEAR(data_pagamento) = YEAR(CURRENT_DATE) THEN valor ELSE 0 END) as valor_mes_atual
-    FROM faturas 
-    WHERE status = 'Pago'
-    """
-    faturas_pagas_result = db.execute_query_one(faturas_pagas_query)
-    
-    # Ranking de comandos
-    ranking_query = """
-    SELECT c.nome, COUNT(s.id) as total_socios 
-    FROM comandos c 
-    LEFT JOIN socios s ON s.comando_id = c.id 
-    GROUP BY c.id, c.nome 
-    ORDER BY total_socios DESC
-    """
-    ranking_result = db.execute_query(ranking_query, fetch=True)
+    # Pendentes vencidas passam a Atrasado em segundo plano (no máximo uma vez por hora)
+    request_marcar_atrasadas()
+    
+    # Totais, mês atual, atrasos e ranking numa única leitura do resumo
+    resumo_query = "SELECT * FROM dashboard_resumo WHERE id = 1"
     
-    # Faturas em atraso
-    faturas_atrasadas_query = """
-    SELECT f.*, s.nome_completo as socio_nome, c.nome as comando_nome,
-           DATEDIFF(CURRENT_DATE, f.data_vencimento) as dias_atraso
+    # Faturas em atraso (apenas as mais antigas; o total vem do resumo)
+    faturas_atrasadas_query = f"""
+    SELECT s.nome_completo as socio_nome, c.nome as comando_nome, f.data_vencimento, f.valor,
+           {get_sql_dialect().days_between('CURRENT_DATE', 'f.data_vencimento')} as dias_atraso
     FROM faturas f 
     INNER JOIN socios s ON f.socio_id = s.id 
     INNER JOIN comandos c ON f.comando_id = c.id 
-    WHERE (f.status = 'Pendente' AND f.data_vencimento < CURRENT_DATE)
-       OR f.status = 'Atrasado'
+    WHERE f.status = 'Atrasado'
     ORDER BY f.data_vencimento ASC
+    LIMIT %s
     """
-    faturas_atrasadas_result = db.execute_query(faturas_atrasadas_query, fetch=True)
+    
+    # Consultas independentes: em paralelo (as atrasadas já em colunas, para a tabela)
+    try:
+        resumo, faturas_atrasadas_df = run_concurrently(
+            adb.execute_query_one(resumo_query),
+            adb.fetch_frame(faturas_atrasadas_query, (MAX_FATURAS_ATRASADAS,))
+        )
+    except Exception as e:
+        st.error(f"Erro ao carregar faturas em atraso: {e}")
+        resumo, faturas_atrasadas_df = db.execute_query_one(resumo_query), pd.DataFrame()
+    
+    # Mês atual depende da data: recalcular na virada do dia (novos atrasos já pedem o recálculo)
+    if resumo and resumo['data_referencia'] < date.today():
+        refresh_now()
+        resumo = db.execute_query_one(resumo_query)
     
     return {
-        'total_socios': total_socios,
-        'total_faturas': faturas_pagas_result['total_faturas'] if faturas_pagas_result else 0,
-        'valor_total': faturas_pagas_result['valor_total'] if faturas_pagas_result else 0,
-        'faturas_mes_atual': faturas_pagas_result['faturas_mes_atual'] if faturas_pagas_result else 0,
-        'valor_mes_atual': faturas_pagas_result['valor_mes_atual'] if faturas_pagas_result else 0,
-        'ranking_comandos': ranking_result or [],
-        'faturas_atrasadas': len(faturas_atrasadas_result) if faturas_atrasadas_result else 0,
-        'faturas_atrasadas_list': faturas_atrasadas_result or []
+        'total_socios': resumo['total_socios'] if resumo else 0,
+        'total_faturas': resumo['total_faturas'] if resumo else 0,
+        'valor_total': resumo['valor_total'] if resumo else 0,
+        'faturas_mes_atual': resumo['faturas_mes_atual'] if resumo else 0,
+        'valor_mes_atual': resumo['valor_mes_atual'] if resumo else 0,
+        'ranking_comandos': resumo['ranking_comandos'] if resumo else [],
+        'faturas_atrasadas': resumo['faturas_atrasadas'] if resumo else 0,
+        'faturas_atrasadas_list': faturas_atrasadas_df
     }
@@ -0,0 +1,131 @@
+import os
+import streamlit as st
+import pandas as pd
+from config.database import db
+from config.instrumentacao import FAIXAS_MS
+from utils.helpers import show_success
+
+# Linhas exibidas do log de consultas lentas
+MAX_LINHAS_LOG = 200
+
+def show():
+    st.title("⏱️ Desempenho")
+    st.markdown("---")
+    
+    show_pool_stats()
+    st.markdown("---")
+    show_query_stats()
+    st.markdown("---")
+    show_prepared_stats()
+    show_slow_log()
+
+def show_pool_stats():
+    """Mostrar uso do pool de conexões"""
+    st.subheader("🔌 Pool de Conexões")
+    stats = db.pool_stats()
+    if not stats:
+        st.info("Métricas do pool disponíveis apenas com o banco PostgreSQL.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Em uso", f"{stats['em_uso']} / {stats['pool_max']}")
+    with col2:
+        st.metric("Empréstimos", stats['checkouts'])
+    with col3:
+        st.metric("Espera média", f"{stats['espera_media'] * 1000:.1f} ms")
+    with col4:
+        st.metric("Timeouts", stats['timeouts'])
+
+def show_query_stats():
+    """Mostrar as consultas mais custosas"""
+    st.subheader("🐢 Consultas mais custosas")
+    
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        ordens = {
+            'tempo_total': "Tempo total",
+            'tempo_medio': "Tempo médio",
+            'tempo_maximo': "Tempo máximo",
+            'chamadas': "Chamadas",
+            'linhas': "Linhas"
+        }
+        ordem = st.selectbox("Ordenar por", list(ordens.keys()), format_func=lambda x: ordens[x])
+    with col2:
+        top = st.number_input("Quantidade", min_value=5, max_value=200, value=20, step=5)
+    with col3:
+        st.write("")
+        if st.button("🔄 Zerar estatísticas", use_container_width=True, key="btn_zerar_stats"):
+            db.reset_query_stats()
+            show_success("Estatísticas zeradas!")
+            st.rerun()
+    
+    consultas = db.query_stats(int(top), ordem)
+    if not consultas:
+        st.info("Nenhuma consulta registrada ainda.")
+        return
+    
+    df = pd.DataFrame({
+        'Consulta': [c['consulta'] for c in consultas],
+        'Chamadas': [c['chamadas'] for c in consultas],
+        'Total (ms)': [round(c['tempo_total'] * 1000, 1) for c in consultas],
+        'Média (ms)': [round(c['tempo_medio'] * 1000, 2) for c in consultas],
+        'Máximo (ms)': [round(c['tempo_maximo'] * 1000, 1) for c in consultas],
+        'Linhas': [c['linhas'] for c in consultas],
+        'Origem': [max(c['origens'], key=c['origens'].get) for c in consultas]
+    })
+    evento = st.dataframe(
+        df,
+        use_container_width=True,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key="desempenho_grid"
+    )
+    
+    # Detalhes da consulta selecionada
+    linhas = evento.selection.rows
+    if linhas and linhas[0] < len(consultas):
+        consulta = consultas[linhas[0]]
+        st.code(consulta['consulta'], language="sql")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.write("**Histograma de latência**")
+            faixas = [f"≤ {limite} ms" for limite in FAIXAS_MS] + [f"> {FAIXAS_MS[-1]} ms"]
+            st.bar_chart(pd.DataFrame({'Execuções': consulta['histograma']}, index=faixas))
+        with col2:
+            st.write("**Chamada por**")
+            st.dataframe(
+                pd.DataFrame(sorted(consulta['origens'].items(), key=lambda o: -o[1]), columns=['Função', 'Chamadas']),
+                use_container_width=True,
+                hide_index=True
+            )
+    else:
+        st.caption("Selecione uma consulta para ver o histograma e quem a chama.")
+
+def show_prepared_stats():
+    """Mostrar as consultas preparadas mais usadas"""
+    preparadas = db.prepared_stats()
+    if preparadas:
+        with st.expander("⚡ Consultas preparadas"):
+            st.dataframe(
+                pd.DataFrame({
+                    'Nome': [p['nome'] for p in preparadas],
+                    'Chamadas': [p['chamadas'] for p in preparadas],
+                    'Média (ms)': [round(p['tempo_medio'] * 1000, 2) for p in preparadas]
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+
+def show_slow_log():
+    """Mostrar o final do log de consultas lentas"""
+    arquivo = os.getenv('DB_SLOW_QUERY_LOG')
+    if not arquivo or not os.path.exists(arquivo):
+        st.caption("Log de consultas lentas desativado (defina DB_SLOW_QUERY_LOG).")
+        return
+    
+    with st.expander(f"📄 Log de consultas lentas ({arquivo})"):
+        with open(arquivo, encoding='utf-8') as f:
+            linhas = f.readlines()[-MAX_LINHAS_LOG:]
+        st.code(''.join(reversed(linhas)) or "Vazio", language="text")
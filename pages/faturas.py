@@ -2,7 +2,14 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, date, timedelta
 from config.database import db
-from utils.helpers import format_currency, format_date, show_success, show_error
+from config.database_async import adb, run_concurrently
+from config.dialeto import Filtros, get_sql_dialect
+from utils.helpers import format_currency, format_date, show_success, show_error, grid_key, new_grid_key
+from pages.dashboard import refresh_dashboard_resumo
+from utils.cache import invalidate, cached_query
+from utils.faturamento import gerar_faturas, marcar_atrasadas, request_marcar_atrasadas, add_months
+from utils.exportacao import show_export_widget
+from utils.relatorios import PERIODOS, period_range, month_start, get_comando_report, get_monthly_rollup
 
 def show():
     st.title("💰 Gestão de Faturas")
@@ -13,7 +20,7 @@ def show():
         st.session_state['fatura_action'] = 'list'
     
     # Botões de ação
-    col1, col2, col3 = st.columns([1, 1, 4])
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 3])
     
     with col1:
         if st.button("➕ Nova Fatura", use_container_width=True, key="btn_nova_fatura"):
@@ -23,6 +30,10 @@ def show():
         if st.button("📊 Relatório", use_container_width=True, key="btn_relatorio_faturas"):
             st.session_state['fatura_action'] = 'report'
     
+    with col3:
+        if st.button("🔁 Gerar Faturas", use_container_width=True, key="btn_gerar_faturas"):
+            gerar_faturas_recorrentes()
+    
     # Verificar ação e renderizar conteúdo
     action = st.session_state.get('fatura_action', 'list')
     
@@ -64,113 +75,159 @@ def show_faturas_list():
     with col3:
         periodo = st.selectbox(
             "Período",
-            ["Todos", "Este mês", "Últimos 3 meses", "Este ano"]
+            PERIODOS
         )
     
-    # Buscar faturas
-    faturas_query = """
-    SELECT f.*, s.nome_completo as socio_nome, s.cpf as socio_cpf, c.nome as comando_nome,
-           DATEDIFF(CURRENT_DATE, f.data_vencimento) as dias_atraso
-    FROM faturas f 
-    INNER JOIN socios s ON f.socio_id = s.id 
-    INNER JOIN comandos c ON f.comando_id = c.id
-    WHERE 1=1
-    """
-    params = []
+    # Pendentes vencidas passam a Atrasado em segundo plano (no máximo uma vez por hora)
+    request_marcar_atrasadas()
     
-    if comando_filtro != 0:
-        faturas_query += " AND f.comando_id = %s"
-        params.append(comando_filtro)
+    # Exportação com os mesmos filtros (lida em blocos, sem carregar tudo)
+    with st.expander("📤 Exportar faturas filtradas"):
+        show_export_widget('faturas', *period_range(periodo), comando_filtro,
+                           None if status_filtro == "Todos" else status_filtro, key="exportar_faturas")
     
-    if status_filtro != "Todos":
-        faturas_query += " AND f.status = %s"
-        params.append(status_filtro)
+    col_tamanho, col_vazio = st.columns([1, 5])
+    with col_tamanho:
+        page_size = st.selectbox("Faturas por página", [25, 50, 100, 200], index=1)
     
-    if periodo == "Este mês":
-        faturas_query += " AND MONTH(f.data_vencimento) = MONTH(CURRENT_DATE) AND YEAR(f.data_vencimento) = YEAR(CURRENT_DATE)"
-    elif periodo == "Últimos 3 meses":
-        faturas_query += " AND f.data_vencimento >= DATE_SUB(CURRENT_DATE, INTERVAL 3 MONTH)"
-    elif periodo == "Este ano":
-        faturas_query += " AND YEAR(f.data_vencimento) = YEAR(CURRENT_DATE)"
+    # Reiniciar a paginação quando os filtros mudarem
+    filtros = (comando_filtro, status_filtro, periodo, page_size)
+    if st.session_state.get('faturas_filtros') != filtros:
+        st.session_state['faturas_filtros'] = filtros
+        st.session_state['faturas_cursores'] = [None]
+        new_grid_key('faturas_grid')
     
-    faturas_query += " ORDER BY f.data_vencimento DESC"
+    cursores = st.session_state['faturas_cursores']
+    pagina = len(cursores) - 1
     
-    faturas = db.execute_query(faturas_query, params, fetch=True)
+    # Buscar apenas a página atual (período como intervalo sobre a coluna: usa o índice)
+    faturas, tem_proxima = get_faturas_page(
+        comando_filtro, None if status_filtro == "Todos" else status_filtro,
+        *period_range(periodo), cursores[-1], page_size
+    )
     
     if faturas:
         # Mostrar tabela
         st.subheader("📋 Lista de Faturas")
         
-        # Mostrar cada fatura em um card
-        for fatura in faturas:
-            with st.container():
-                col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 2, 1])
-                
-                with col1:
-                    st.write(f"**{fatura['socio_nome']}**")
-                    st.write(f"🏛️ {fatura['comando_nome']}")
-                
-                with col2:
-                    st.write(f"📅 Vencimento: {format_date(fatura['data_vencimento'])}")
-                    if fatura['data_pagamento']:
-                        st.write(f"✅ Pago em: {format_date(fatura['data_pagamento'])}")
-                
-                with col3:
-                    st.write(f"💰 {format_currency(fatura['valor'])}")
-                    if fatura['forma_pagamento']:
-                        st.write(f"💳 {fatura['forma_pagamento']}")
-                
-                with col4:
-                    # Status com cores
-                    status = fatura['status']
-                    if status == 'Pago':
-                        st.success(f"✅ {status}")
-                    elif status == 'Atrasado':
-                        st.error(f"❌ {status} ({fatura['dias_atraso']} dias)")
-                    else:
-                        st.warning(f"⏳ {status}")
-                
-                with col5:
-                    col_edit, col_del = st.columns(2)
-                    with col_edit:
-                        if st.button("✏️", key=f"edit_{fatura['id']}"):
-                            st.session_state['fatura_action'] = 'edit'
-                            st.session_state['fatura_id'] = fatura['id']
-                            st.rerun()
-                    with col_del:
-                        if st.button("🗑️", key=f"del_{fatura['id']}"):
-                            if delete_fatura(fatura['id']):
-                                show_success("Fatura excluída com sucesso!")
-                                st.rerun()
-                            else:
-                                show_error("Erro ao excluir fatura!")
-                
-                st.markdown("---")
+        def status_label(fatura):
+            if fatura['status'] == 'Pago':
+                return f"✅ {fatura['status']}"
+            elif fatura['status'] == 'Atrasado':
+                dias_atraso = (date.today() - fatura['data_vencimento']).days
+                return f"❌ {fatura['status']} ({dias_atraso} dias)"
+            return f"⏳ {fatura['status']}"
+        
+        # Tabela virtualizada: só as linhas visíveis são desenhadas no navegador
+        df = pd.DataFrame({
+            'Sócio': [f['socio_nome'] for f in faturas],
+            'Comando': [f['comando_nome'] for f in faturas],
+            'Vencimento': [format_date(f['data_vencimento']) for f in faturas],
+            'Pagamento': [format_date(f['data_pagamento']) if f['data_pagamento'] else '' for f in faturas],
+            'Valor': [format_currency(f['valor']) for f in faturas],
+            'Forma de Pagamento': [f['forma_pagamento'] or '' for f in faturas],
+            'Status': [status_label(f) for f in faturas]
+        })
+        
+        evento = st.dataframe(
+            df,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key=grid_key('faturas_grid')
+        )
+        
+        # Ações sobre a linha selecionada
+        linhas = evento.selection.rows
+        fatura = faturas[linhas[0]] if linhas and linhas[0] < len(faturas) else None
+        
+        col_info, col_edit, col_del = st.columns([5, 1, 1])
+        with col_info:
+            if fatura:
+                st.write(f"**{fatura['socio_nome']}** - {format_currency(fatura['valor'])} - vencimento {format_date(fatura['data_vencimento'])}")
+            else:
+                st.caption("Selecione uma fatura na tabela para editar ou excluir.")
+        with col_edit:
+            if st.button("✏️ Editar", use_container_width=True, key="btn_editar_fatura", disabled=fatura is None):
+                st.session_state['fatura_action'] = 'edit'
+                st.session_state['fatura_id'] = fatura['id']
+                st.rerun()
+        with col_del:
+            if st.button("🗑️ Excluir", use_container_width=True, key="btn_excluir_fatura", disabled=fatura is None):
+                if delete_fatura(fatura['id']):
+                    show_success("Fatura excluída com sucesso!")
+                    st.rerun()
+                else:
+                    show_error("Erro ao excluir fatura!")
     else:
         st.info("Nenhuma fatura encontrada com os filtros aplicados.")
+    
+    # Navegação entre páginas (a seleção da tabela não passa de uma página para outra)
+    col_ant, col_pag, col_prox = st.columns([1, 4, 1])
+    with col_ant:
+        if st.button("⬅️ Anterior", use_container_width=True, key="btn_faturas_anterior", disabled=pagina == 0):
+            cursores.pop()
+            new_grid_key('faturas_grid')
+            st.rerun()
+    with col_pag:
+        st.markdown(f"<div style='text-align: center;'>Página {pagina + 1}</div>", unsafe_allow_html=True)
+    with col_prox:
+        if st.button("Próxima ➡️", use_container_width=True, key="btn_faturas_proxima", disabled=not tem_proxima):
+            ultima = faturas[-1]
+            cursores.append((ultima['data_vencimento'], ultima['id']))
+            new_grid_key('faturas_grid')
+            st.rerun()
+
+@cached_query('faturas', 'socios', 'comandos')
+def get_faturas_page(comando_id=0, status=None, inicio=None, fim=None, after=None, page_size=50):
+    """Buscar uma página de faturas com paginação por chave (data_vencimento, id), mais recentes primeiro
+    
+    Retorna (faturas, tem_proxima). `after` é a chave (data_vencimento, id)
+    da última fatura da página anterior.
+    """
+    filtros = Filtros()
+    filtros.equals('f.comando_id', comando_id or None)
+    filtros.equals('f.status', status)
+    filtros.date_range('f.data_vencimento', inicio, fim)
+    filtros.after_key(['f.data_vencimento', 'f.id'], after, descendente=True)
+    
+    # Buscar um registro a mais para saber se existe próxima página
+    faturas_query = f"""
+    SELECT f.*, s.nome_completo as socio_nome, s.cpf as socio_cpf, c.nome as comando_nome
+    FROM faturas f 
+    INNER JOIN socios s ON f.socio_id = s.id 
+    INNER JOIN comandos c ON f.comando_id = c.id
+    {filtros.where()}
+    {get_sql_dialect().order_by('f.data_vencimento DESC', 'f.id DESC')} LIMIT %s
+    """
+    params = filtros.params + [page_size + 1]
+    
+    result = db.execute_query(faturas_query, params, fetch=True) or []
+    return result[:page_size], len(result) > page_size
 
 def show_create_form():
     """Mostrar formulário de criação"""
     st.subheader("➕ Nova Fatura")
     
+    # Buscar sócios e comandos em paralelo
+    socios, comandos = run_concurrently(
+        adb.execute_query("SELECT id, nome_completo FROM socios ORDER BY nome_completo", fetch=True),
+        adb.execute_query("SELECT id, nome FROM comandos ORDER BY nome", fetch=True)
+    )
+    
     with st.form("create_fatura_form"):
         col1, col2 = st.columns(2)
         
         with col1:
-            # Buscar sócios
-            socios_query = "SELECT id, nome_completo FROM socios ORDER BY nome_completo"
-            socios = db.execute_query(socios_query, fetch=True)
-            socio_options = {s['id']: s['nome_completo'] for s in socios}
+            socio_options = {s['id']: s['nome_completo'] for s in socios or []}
             socio_id = st.selectbox(
                 "Sócio *",
                 options=list(socio_options.keys()),
                 format_func=lambda x: socio_options[x]
             )
             
-            # Buscar comandos
-            comandos_query = "SELECT id, nome FROM comandos ORDER BY nome"
-            comandos = db.execute_query(comandos_query, fetch=True)
-            comando_options = {c['id']: c['nome'] for c in comandos}
+            comando_options = {c['id']: c['nome'] for c in comandos or []}
             comando_id = st.selectbox(
                 "Comando *",
                 options=list(comando_options.keys()),
@@ -212,9 +269,12 @@ def show_edit_form(fatura_id):
     """Mostrar formulário de edição"""
     st.subheader("✏️ Editar Fatura")
     
-    # Buscar dados da fatura
-    fatura_query = "SELECT * FROM faturas WHERE id = %s"
-    fatura = db.execute_query_one(fatura_query, (fatura_id,))
+    # Buscar fatura, sócios e comandos em paralelo
+    fatura, socios, comandos = run_concurrently(
+        adb.execute_prepared_one('fatura_por_id', (fatura_id,)),
+        adb.execute_query("SELECT id, nome_completo FROM socios ORDER BY nome_completo", fetch=True),
+        adb.execute_query("SELECT id, nome FROM comandos ORDER BY nome", fetch=True)
+    )
     
     if not fatura:
         show_error("Fatura não encontrada!")
@@ -226,10 +286,7 @@ def show_edit_form(fatura_id):
         col1, col2 = st.columns(2)
         
         with col1:
-            # Buscar sócios
-            socios_query = "SELECT id, nome_completo FROM socios ORDER BY nome_completo"
-            socios = db.execute_query(socios_query, fetch=True)
-            socio_options = {s['id']: s['nome_completo'] for s in socios}
+            socio_options = {s['id']: s['nome_completo'] for s in socios or []}
             socio_id = st.selectbox(
                 "Sócio *",
                 options=list(socio_options.keys()),
@@ -237,10 +294,7 @@ def show_edit_form(fatura_id):
                 index=list(socio_options.keys()).index(fatura['socio_id'])
             )
             
-            # Buscar comandos
-            comandos_query = "SELECT id, nome FROM comandos ORDER BY nome"
-            comandos = db.execute_query(comandos_query, fetch=True)
-            comando_options = {c['id']: c['nome'] for c in comandos}
+            comando_options = {c['id']: c['nome'] for c in comandos or []}
             comando_id = st.selectbox(
                 "Comando *",
                 options=list(comando_options.keys()),
@@ -293,25 +347,36 @@ def show_report():
     """Mostrar relatório de faturas"""
     st.subheader("📊 Relatório de Faturas")
     
-    # Buscar dados para relatório
-    report_query = """
-    SELECT 
-        c.nome as comando,
-        COUNT(f.id) as total_faturas,
-        SUM(f.valor) as valor_total,
-        COUNT(CASE WHEN f.status = 'Pago' THEN 1 END) as faturas_pagas,
-        SUM(CASE WHEN f.status = 'Pago' THEN f.valor ELSE 0 END) as valor_pago,
-        COUNT(CASE WHEN f.status = 'Atrasado' THEN 1 END) as faturas_atrasadas
-    FROM comandos c
-    LEFT JOIN faturas f ON c.id = f.comando_id
-    GROUP BY c.id, c.nome
-    ORDER BY valor_total DESC
-    """
+    # Filtros: intervalo de vencimento (padrão: últimos 12 meses completos, lidos dos totais mensais) e comando
+    hoje = date.today()
+    col1, col2 = st.columns(2)
+    with col1:
+        intervalo = st.date_input(
+            "Vencimento entre",
+            value=(add_months(month_start(hoje), -11), add_months(month_start(hoje), 1) - timedelta(days=1)),
+            format="DD/MM/YYYY",
+            key="relatorio_faturas_intervalo"
+        )
+    with col2:
+        comandos = db.execute_query("SELECT id, nome FROM comandos ORDER BY nome", fetch=True) or []
+        comando_options = {0: "Todos os comandos"}
+        comando_options.update({c['id']: c['nome'] for c in comandos})
+        comando_filtro = st.selectbox(
+            "Comando",
+            options=list(comando_options.keys()),
+            format_func=lambda x: comando_options[x],
+            key="relatorio_faturas_comando"
+        )
+    
+    # Enquanto só a data inicial foi escolhida, o intervalo fica aberto no fim
+    inicio = intervalo[0] if intervalo else None
+    fim = intervalo[1] + timedelta(days=1) if len(intervalo) > 1 else None
     
-    report_data = db.execute_query(report_query, fetch=True)
+    # Relatórios já em DataFrame, lidos por coluna
+    report_data = get_comando_report(inicio, fim, comando_filtro)
     
-    if report_data:
-        df = pd.DataFrame(report_data)
+    if not report_data.empty and report_data['total_faturas'].any():
+        df = report_data.drop(columns=['comando_id'])
         df['valor_total'] = df['valor_total'].apply(lambda x: format_currency(x) if x else "R$ 0,00")
         df['valor_pago'] = df['valor_pago'].apply(lambda x: format_currency(x) if x else "R$ 0,00")
         
@@ -322,6 +387,15 @@ def show_report():
         chart_data = df[['comando', 'total_faturas', 'faturas_pagas', 'faturas_atrasadas']].copy()
         chart_data = chart_data.set_index('comando')
         st.bar_chart(chart_data)
+        
+        # Evolução mensal no mesmo intervalo
+        df_mensal = get_monthly_rollup(inicio, fim, comando_filtro)
+        if not df_mensal.empty:
+            st.subheader("📅 Evolução Mensal")
+            df_mensal['mes'] = pd.to_datetime(df_mensal['mes'])
+            df_mensal = df_mensal.set_index('mes')
+            st.line_chart(df_mensal[['valor_total', 'valor_pago']])
+            st.bar_chart(df_mensal[['faturas_pagas', 'faturas_atrasadas']])
     else:
         st.info("Nenhum dado encontrado para o relatório.")
 
@@ -333,14 +407,16 @@ def create_fatura(socio_id, comando_id, valor, data_vencimento, data_renovacao,
     """Criar nova fatura"""
     try:
         insert_query = """
-        INSERT INTO faturas (socio_id, comando_id, valor, data_vencimento, data_renovacao, forma_pagamento)
-        VALUES (%s, %s, %s, %s, %s, %s)
+        INSERT INTO faturas (socio_id, comando_id, plano_id, valor, data_vencimento, data_renovacao, forma_pagamento)
+        VALUES (%s, %s, (SELECT plano_id FROM socios WHERE id = %s), %s, %s, %s, %s)
         """
         
-        params = (socio_id, comando_id, valor, data_vencimento, data_renovacao, forma_pagamento)
+        params = (socio_id, comando_id, socio_id, valor, data_vencimento, data_renovacao, forma_pagamento)
         
         if db.execute_query(insert_query, params):
             # TODO: Salvar comprovante se fornecido
+            invalidate('faturas')
+            refresh_dashboard_resumo()
             return True
         return False
         
@@ -361,7 +437,11 @@ def update_fatura(fatura_id, socio_id, comando_id, valor, data_vencimento, data_
         params = (socio_id, comando_id, valor, data_vencimento, data_renovacao, 
                  data_pagamento, status, forma_pagamento, fatura_id)
         
-        return db.execute_query(update_query, params)
+        if db.execute_query(update_query, params):
+            invalidate('faturas')
+            refresh_dashboard_resumo()
+            return True
+        return False
         
     except Exception as e:
         show_error(f"Erro ao atualizar fatura: {e}")
@@ -371,7 +451,25 @@ def delete_fatura(fatura_id):
     """Excluir fatura"""
     try:
         delete_query = "DELETE FROM faturas WHERE id = %s"
-        return db.execute_query(delete_query, (fatura_id,))
+        if db.execute_query(delete_query, (fatura_id,)):
+            invalidate('faturas')
+            refresh_dashboard_resumo()
+            return True
+        return False
     except Exception as e:
         show_error(f"Erro ao excluir fatura: {e}")
         return False
+
+def gerar_faturas_recorrentes():
+    """Gerar as faturas dos planos a vencer"""
+    try:
+        with st.spinner("Gerando faturas..."):
+            resultado = gerar_faturas()
+        resultado['atrasadas'] = marcar_atrasadas()
+        if resultado['renovados'] or resultado['atrasadas']:
+            invalidate('faturas', 'socios')
+            refresh_dashboard_resumo()
+        show_success(f"{resultado['geradas']} faturas geradas, {resultado['renovados']} planos renovados, "
+                     f"{resultado['atrasadas']} faturas marcadas como atrasadas.")
+    except Exception as e:
+        show_error(f"Erro ao gerar faturas: {e}")
@@ -3,9 +3,11 @@ import pandas as pd
 from datetime import datetime, date, timedelta
 from config.database import db
 from utils.helpers import format_currency, format_date, show_success, show_error
+from utils.search_index import get_search_index
+from utils.cache import cached_query, invalidate
 
 # Cache para planos
-@st.cache_data(ttl=300)
+@cached_query('planos')
 def get_planos():
     """Buscar planos com cache"""
     try:
@@ -16,7 +18,7 @@ def get_planos():
         st.error(f"Erro ao buscar planos: {e}")
         return []
 
-@st.cache_data(ttl=60)
+@cached_query('socios', 'planos')
 def get_socios_com_planos():
     """Buscar sócios com seus planos"""
     try:
@@ -137,7 +139,6 @@ def show_planos_list():
                         if st.button("🗑️", key=f"del_{plano['id']}"):
                             if delete_plano(plano['id']):
                                 show_success("Plano excluído com sucesso!")
-                                get_planos.clear()
                                 st.rerun()
                             else:
                                 show_error("Erro ao excluir plano!")
@@ -274,9 +275,6 @@ def show_create_form():
             # Salvar no banco
             if create_plano(plano_data):
                 show_success("✅ Plano criado com sucesso!")
-                # Limpar cache
-                get_planos.clear()
-                get_socios_com_planos.clear()
                 st.session_state['plano_action'] = 'list'
                 st.rerun()
             else:
@@ -294,8 +292,7 @@ def show_edit_form(plano_id):
         return
     
     # Buscar dados do plano
-    plano_query = "SELECT * FROM planos WHERE id = %s"
-    plano = db.execute_query_one(plano_query, (plano_id,))
+    plano = db.execute_prepared_one('plano_por_id', (plano_id,))
     
     if not plano:
         st.error("Plano não encontrado!")
@@ -403,9 +400,6 @@ def show_edit_form(plano_id):
             # Salvar no banco
             if update_plano(plano_id, plano_data):
                 show_success("✅ Plano atualizado com sucesso!")
-                # Limpar cache
-                get_planos.clear()
-                get_socios_com_planos.clear()
                 st.session_state['plano_action'] = 'list'
                 st.rerun()
             else:
@@ -454,13 +448,22 @@ def show_socios_planos():
             )
         
         with col3:
-            search_term = st.text_input("Buscar por nome")
+            search_term = st.text_input("Buscar por nome, CPF, e-mail ou telefone")
+        
+        # Busca pelo índice (insensível a acentos), mantendo a ordem por relevância
+        if search_term.strip():
+            try:
+                resultados = get_search_index().search(search_term)
+            except RuntimeError as e:
+                st.error(str(e))
+                resultados = []
+            ranking = {socio_id: pos for pos, socio_id in enumerate(resultados)}
+            socios = sorted((s for s in socios if s['id'] in ranking), key=lambda s: ranking[s['id']])
         
         # Aplicar filtros
         filtered_socios = []
         for socio in socios:
             match_plano = (plano_filtro == 0) or (socio['plano_id'] == plano_filtro)
-            match_search = (not search_term) or (search_term.lower() in socio['nome_completo'].lower())
             
             # Status do plano
             match_status = True
@@ -471,7 +474,7 @@ def show_socios_planos():
             elif status_filtro == "Sem Plano":
                 match_status = not socio['plano_id']
             
-            if match_plano and match_search and match_status:
+            if match_plano and match_status:
                 filtered_socios.append(socio)
         
         # Mostrar resultados
@@ -529,7 +532,10 @@ def create_plano(plano_data):
                 %(sorteio_mensal)s, %(grupo_exclusivo)s, %(ativo)s)
         """
         
-        return db.execute_query(insert_query, plano_data)
+        if db.execute_query(insert_query, plano_data):
+            invalidate('planos')
+            return True
+        return False
         
     except Exception as e:
         st.error(f"Erro ao criar plano: {e}")
@@ -550,7 +556,10 @@ def update_plano(plano_id, plano_data):
         """
         
         plano_data['id'] = plano_id
-        return db.execute_query(update_query, plano_data)
+        if db.execute_query(update_query, plano_data):
+            invalidate('planos')
+            return True
+        return False
         
     except Exception as e:
         st.error(f"Erro ao atualizar plano: {e}")
@@ -567,7 +576,10 @@ def delete_plano(plano_id):
         
         # Desativar plano em vez de excluir
         update_query = "UPDATE planos SET ativo = FALSE WHERE id = %s"
-        return db.execute_query(update_query, (plano_id,))
+        if db.execute_query(update_query, (plano_id,)):
+            invalidate('planos')
+            return True
+        return False
         
     except Exception as e:
         st.error(f"Erro ao excluir plano: {e}")
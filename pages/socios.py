@@ -1,11 +1,20 @@
 import streamlit as st
 import pandas as pd
 from config.database import db
-from utils.helpers import format_date, show_success, show_error
+from config.dialeto import Filtros, get_sql_dialect
+from utils.helpers import format_date, show_success, show_error, grid_key, new_grid_key
 from utils.validators import validate_cpf, validate_email, validate_phone, format_cpf, format_phone, validate_cep, format_cep
-from utils.photo_manager import create_photo_upload_widget, save_socio_photo, show_socio_photo
+from utils.photo_manager import create_photo_upload_widget, check_photo_upload, queue_socio_photo, release_photo, show_socio_photo, get_photo_data_uri
+from utils.search_index import get_search_index, index_socio, unindex_socio
+from pages.dashboard import refresh_dashboard_resumo
+from utils.cache import cached_query, invalidate
+from utils.exportacao import show_export_widget
+from utils.socios_cadastro import insert_socio, update_socio_row, RegistroDuplicado
 import time
-from datetime import datetime, date, timedelta
+from datetime import datetime, date
+
+# Linhas da lista detalhada exibidas no relatório (a lista completa vai pela exportação)
+PREVIEW_LINHAS = 200
 
 def format_endereco_completo(socio):
     """Formatar endereço completo para exibição"""
@@ -32,7 +41,7 @@ def format_endereco_completo(socio):
     return " - ".join(partes) if partes else "Endereço não informado"
 
 # Cache para comandos (evita consultas repetidas)
-@st.cache_data(ttl=300)  # Cache por 5 minutos
+@cached_query('comandos')
 def get_comandos():
     """Buscar comandos com cache"""
     try:
@@ -44,7 +53,7 @@ def get_comandos():
         return []
 
 # Cache para planos
-@st.cache_data(ttl=300)  # Cache por 5 minutos
+@cached_query('planos')
 def get_planos():
     """Buscar planos com cache"""
     try:
@@ -55,24 +64,57 @@ def get_planos():
         st.error(f"Erro ao buscar planos: {e}")
         return []
 
-@st.cache_data(ttl=60)  # Cache por 1 minuto
-def get_socios_data():
-    """Buscar dados de sócios com cache"""
+@cached_query('socios', 'comandos', 'planos')
+def get_socios_page(comando_id=0, after=None, page_size=50):
+    """Buscar uma página de sócios com paginação por chave (nome_completo, id)
+    
+    Retorna (socios, tem_proxima). `after` é a chave (nome_completo, id) do
+    último sócio da página anterior.
+    """
     try:
-        socios_query = """
+        filtros = Filtros()
+        filtros.equals('s.comando_id', comando_id or None)
+        filtros.after_key(['s.nome_completo', 's.id'], after)
+        
+        # Buscar um registro a mais para saber se existe próxima página
+        socios_query = f"""
         SELECT s.*, c.nome as comando_nome, p.nome as plano_nome, p.valor as plano_valor, p.periodicidade
         FROM socios s 
         LEFT JOIN comandos c ON s.comando_id = c.id
         LEFT JOIN planos p ON s.plano_id = p.id
-        ORDER BY s.nome_completo
+        {filtros.where()}
+        {get_sql_dialect().order_by('s.nome_completo', 's.id')} LIMIT %s
         """
-        result = db.execute_query(socios_query, fetch=True)
-        return result if result else []
+        params = filtros.params + [page_size + 1]
+        
+        result = db.execute_query(socios_query, params, fetch=True) or []
+        return result[:page_size], len(result) > page_size
+    except Exception as e:
+        st.error(f"Erro ao buscar sócios: {e}")
+        return [], False
+
+@cached_query('socios', 'comandos', 'planos')
+def get_socios_by_ids(ids):
+    """Buscar sócios pelos ids, mantendo a ordem recebida (resultado da busca)"""
+    if not ids:
+        return []
+    try:
+        placeholders = ", ".join(["%s"] * len(ids))
+        socios_query = f"""
+        SELECT s.*, c.nome as comando_nome, p.nome as plano_nome, p.valor as plano_valor, p.periodicidade
+        FROM socios s 
+        LEFT JOIN comandos c ON s.comando_id = c.id
+        LEFT JOIN planos p ON s.plano_id = p.id
+        WHERE s.id IN ({placeholders})
+        """
+        result = db.execute_query(socios_query, list(ids), fetch=True) or []
+        por_id = {s['id']: s for s in result}
+        return [por_id[i] for i in ids if i in por_id]
     except Exception as e:
         st.error(f"Erro ao buscar sócios: {e}")
         return []
 
-@st.cache_data(ttl=60)  # Cache por 1 minuto
+@cached_query('socios', 'comandos')
 def get_report_data():
     """Buscar dados do relatório com cache"""
     try:
@@ -92,13 +134,12 @@ def get_report_data():
         GROUP BY c.id, c.nome
         ORDER BY total_socios DESC
         """
-        result = db.execute_query(report_query, fetch=True)
-        return result if result else []
+        return db.fetch_frame(report_query)
     except Exception as e:
         st.error(f"Erro ao buscar dados do relatório: {e}")
-        return []
+        return pd.DataFrame()
 
-@st.cache_data(ttl=60)  # Cache por 1 minuto
+@cached_query('socios', 'planos')
 def get_planos_report_data():
     """Buscar dados de sócios por plano com cache"""
     try:
@@ -113,11 +154,10 @@ def get_planos_report_data():
         GROUP BY p.id, p.nome, p.valor, p.periodicidade
         ORDER BY total_socios DESC
         """
-        result = db.execute_query(planos_query, fetch=True)
-        return result if result else []
+        return db.fetch_frame(planos_query)
     except Exception as e:
         st.error(f"Erro ao buscar dados de planos: {e}")
-        return []
+        return pd.DataFrame()
 
 def show():
     st.title("👥 Gestão de Sócios")
@@ -128,7 +168,7 @@ def show():
         st.session_state['socio_action'] = 'list'
     
     # Botões de ação
-    col1, col2, col3 = st.columns([1, 1, 4])
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 3])
     
     with col1:
         if st.button("➕ Novo Sócio", use_container_width=True, key="btn_novo_socio"):
@@ -138,6 +178,10 @@ def show():
         if st.button("📊 Relatório", use_container_width=True, key="btn_relatorio"):
             st.session_state['socio_action'] = 'report'
     
+    with col3:
+        if st.button("📥 Importar", use_container_width=True, key="btn_importar"):
+            st.session_state['socio_action'] = 'import'
+    
     # Verificar ação e renderizar conteúdo
     action = st.session_state.get('socio_action', 'list')
     
@@ -147,6 +191,8 @@ def show():
         show_edit_form(st.session_state.get('socio_id'))
     elif action == 'report':
         show_report()
+    elif action == 'import':
+        show_import_form()
     else:
         show_socios_list()
 
@@ -177,71 +223,112 @@ def show_socios_list():
         )
     
     with col3:
-        search_term = st.text_input("Buscar por nome")
+        search_term = st.text_input("Buscar por nome, CPF, e-mail ou telefone")
     
-    # Buscar sócios com cache
-    with st.spinner("Carregando sócios..."):
-        socios = get_socios_data()
+    col_tamanho, col_vazio = st.columns([1, 5])
+    with col_tamanho:
+        page_size = st.selectbox("Sócios por página", [25, 50, 100, 200], index=1)
+    
+    # Reiniciar a paginação quando os filtros mudarem
+    filtros = (comando_filtro, search_term.strip().lower(), page_size)
+    if st.session_state.get('socios_filtros') != filtros:
+        st.session_state['socios_filtros'] = filtros
+        st.session_state['socios_cursores'] = [None]
+        new_grid_key('socios_grid')
     
-    # Aplicar filtros localmente (mais rápido que SQL)
-    if comando_filtro != 0:
-        socios = [s for s in socios if s['comando_id'] == comando_filtro]
+    cursores = st.session_state['socios_cursores']
+    pagina = len(cursores) - 1
     
-    if search_term:
-        socios = [s for s in socios if search_term.lower() in s['nome_completo'].lower()]
+    with st.spinner("Carregando sócios..."):
+        if search_term.strip():
+            # Busca pelo índice: páginas são fatias do resultado ordenado por relevância
+            try:
+                resultados = get_search_index().search(search_term, comando_id=comando_filtro or None)
+            except RuntimeError as e:
+                st.error(str(e))
+                resultados = []
+            inicio = pagina * page_size
+            socios = get_socios_by_ids(tuple(resultados[inicio:inicio + page_size]))
+            tem_proxima = inicio + page_size < len(resultados)
+        else:
+            # Buscar apenas a página atual (filtros aplicados no SQL)
+            socios, tem_proxima = get_socios_page(comando_filtro, cursores[-1], page_size)
     
     if socios:
         st.subheader("📋 Lista de Sócios")
-        for socio in socios:
-            with st.container():
-                col_foto, col1, col2, col3, col4, col5 = st.columns([1, 3, 2, 2, 2, 1])
-                
-                with col_foto:
-                    # Mostrar foto do sócio
-                    show_socio_photo(socio.get('foto'), width=60, height=60)
-                
-                with col1:
-                    st.write(f"**{socio['nome_completo']}**")
-                    st.write(f"📧 {socio['email']}")
-                
-                with col2:
-                    st.write(f"🏛️ {socio['comando_nome']}")
-                    st.write(f"📱 {format_phone(socio['telefone'])}")
-                    if socio.get('cidade') and socio.get('estado'):
-                        st.write(f"📍 {socio['cidade']}/{socio['estado']}")
-                
-                with col3:
-                    st.write(f"📅 {format_date(socio['data_nascimento'])}")
-                    st.write(f"👕 {socio['tamanho_camisa']}")
-                
-                with col4:
-                    st.write(f"🆔 {format_cpf(socio['cpf'])}")
-                    if socio['plano_nome']:
-                        st.write(f"🎫 {socio['plano_nome']}")
-                    else:
-                        st.write("❌ Sem plano")
-                
-                with col5:
-                    col_edit, col_del = st.columns(2)
-                    with col_edit:
-                        if st.button("✏️", key=f"edit_{socio['id']}"):
-                            st.session_state['socio_action'] = 'edit'
-                            st.session_state['socio_id'] = socio['id']
-                            st.rerun()
-                    with col_del:
-                        if st.button("🗑️", key=f"del_{socio['id']}"):
-                            if delete_socio(socio['id']):
-                                show_success("Sócio excluído com sucesso!")
-                                # Limpar cache
-                                get_socios_data.clear()
-                                get_report_data.clear()
-                                st.rerun()
-                            else:
-                                show_error("Erro ao excluir sócio!")
-                
+        
+        # Tabela virtualizada: só as linhas visíveis são desenhadas no navegador
+        df = pd.DataFrame({
+            'Foto': [get_photo_data_uri(s.get('foto')) for s in socios],
+            'Nome': [s['nome_completo'] for s in socios],
+            'E-mail': [s['email'] for s in socios],
+            'Comando': [s['comando_nome'] or '' for s in socios],
+            'Telefone': [format_phone(s['telefone']) for s in socios],
+            'Cidade/UF': [f"{s['cidade']}/{s['estado']}" if s.get('cidade') and s.get('estado') else '' for s in socios],
+            'Nascimento': [format_date(s['data_nascimento']) for s in socios],
+            'Camisa': [s['tamanho_camisa'] for s in socios],
+            'CPF': [format_cpf(s['cpf']) for s in socios],
+            'Plano': [s['plano_nome'] or 'Sem plano' for s in socios]
+        })
+        
+        evento = st.dataframe(
+            df,
+            use_container_width=True,
+            hide_index=True,
+            on_select="rerun",
+            selection_mode="single-row",
+            key=grid_key('socios_grid'),
+            column_config={
+                'Foto': st.column_config.ImageColumn('Foto', width="small")
+            }
+        )
+        
+        # Ações sobre a linha selecionada
+        linhas = evento.selection.rows
+        socio = socios[linhas[0]] if linhas and linhas[0] < len(socios) else None
+        
+        col_foto, col_info, col_edit, col_del = st.columns([1, 4, 1, 1])
+        with col_foto:
+            if socio:
+                show_socio_photo(socio.get('foto'), width=60, height=60)
+        with col_info:
+            if socio:
+                st.write(f"**{socio['nome_completo']}**")
+                st.write(f"📍 {format_endereco_completo(socio)}")
+            else:
+                st.caption("Selecione um sócio na tabela para editar ou excluir.")
+        with col_edit:
+            if st.button("✏️ Editar", use_container_width=True, key="btn_editar_socio", disabled=socio is None):
+                st.session_state['socio_action'] = 'edit'
+                st.session_state['socio_id'] = socio['id']
+                st.rerun()
+        with col_del:
+            if st.button("🗑️ Excluir", use_container_width=True, key="btn_excluir_socio", disabled=socio is None):
+                if delete_socio(socio['id']):
+                    show_success("Sócio excluído com sucesso!")
+                    st.rerun()
+                else:
+                    show_error("Erro ao excluir sócio!")
+        
         st.markdown("---")
     else:
         st.info("Nenhum sócio encontrado com os filtros aplicados.")
+    
+    # Navegação entre páginas
+    col_ant, col_pag, col_prox = st.columns([1, 4, 1])
+    with col_ant:
+        if st.button("⬅️ Anterior", use_container_width=True, key="btn_socios_anterior", disabled=pagina == 0):
+            cursores.pop()
+            new_grid_key('socios_grid')
+            st.rerun()
+    with col_pag:
+        st.markdown(f"<div style='text-align: center;'>Página {pagina + 1}</div>", unsafe_allow_html=True)
+    with col_prox:
+        if st.button("Próxima ➡️", use_container_width=True, key="btn_socios_proxima", disabled=not tem_proxima):
+            ultimo = socios[-1]
+            cursores.append((ultimo['nome_completo'], ultimo['id']))
+            new_grid_key('socios_grid')
+            st.rerun()
 
 def show_create_form():
     """Mostrar formulário de criação de sócio"""
@@ -489,14 +576,12 @@ def show_create_form():
                 # Processar dados de endereço
                 cep_limpo = ''.join(filter(str.isdigit, cep)) if cep else None
                 
-                # Processar foto
-                foto_path = None
+                # Validar foto (o processamento roda em segundo plano após o cadastro)
                 if foto_uploaded:
-                    with st.spinner("Salvando foto..."):
-                        foto_path, error = save_socio_photo(foto_uploaded)
-                        if error:
-                            st.error(f"Erro ao salvar foto: {error}")
-                            return
+                    error = check_photo_upload(foto_uploaded)
+                    if error:
+                        st.error(f"Erro ao salvar foto: {error}")
+                        return
                 
                 # Salvar no banco
                 plano_id_final = plano_id if plano_id != 0 else None
@@ -510,11 +595,10 @@ def show_create_form():
                     'estado': estado if estado else None
                 }
                 
-                if create_socio(nome_completo.strip(), cpf_limpo, data_nascimento, email.strip().lower(), telefone_limpo, tamanho_camisa, comando_id, foto_path, plano_id_final, endereco_data, data_cadastro_personalizada):
+                if create_socio(nome_completo.strip(), cpf_limpo, data_nascimento, email.strip().lower(), telefone_limpo, tamanho_camisa, comando_id, None, plano_id_final, endereco_data, data_cadastro_personalizada):
+                    if foto_uploaded:
+                        queue_socio_photo(foto_uploaded, cpf_limpo)
                     show_success("✅ Sócio cadastrado com sucesso!")
-                    # Limpar cache
-                    get_socios_data.clear()
-                    get_report_data.clear()
                     st.session_state['socio_action'] = 'list'
                     st.rerun()
                 else:
@@ -543,8 +627,7 @@ def show_edit_form(socio_id):
     st.markdown("---")
     
     # Buscar dados do sócio
-    socio_query = "SELECT * FROM socios WHERE id = %s"
-    socio = db.execute_query_one(socio_query, (socio_id,))
+    socio = db.execute_prepared_one('socio_por_id', (socio_id,))
     
     if not socio:
         st.error("Sócio não encontrado para edição.")
@@ -823,34 +906,13 @@ def show_edit_form(socio_id):
                 # Processar dados do plano
                 plano_id_final = plano_id if plano_id != 0 else None
                 
-                # Calcular datas do plano se houver mudança
-                data_adesao_plano = socio.get('data_adesao_plano')
-                data_vencimento_plano = socio.get('data_vencimento_plano')
-                
-                if plano_id_final != socio.get('plano_id'):  # Plano mudou
-                    if plano_id_final:
-                        data_adesao_plano = date.today()
-                        plano_info = db.execute_query_one("SELECT periodicidade FROM planos WHERE id = %s", (plano_id_final,))
-                        if plano_info:
-                            if plano_info['periodicidade'] == 'Mensal':
-                                data_vencimento_plano = data_adesao_plano + timedelta(days=30)
-                            elif plano_info['periodicidade'] == 'Trimestral':
-                                data_vencimento_plano = data_adesao_plano + timedelta(days=90)
-                            elif plano_info['periodicidade'] == 'Anual':
-                                data_vencimento_plano = data_adesao_plano + timedelta(days=365)
-                    else:  # Plano removido
-                        data_adesao_plano = None
-                        data_vencimento_plano = None
-                
-                # Processar nova foto
+                # Validar nova foto (substitui a atual em segundo plano após a atualização)
                 foto_final = socio.get('foto')  # Manter foto atual por padrão
                 if nova_foto_uploaded:
-                    with st.spinner("Salvando nova foto..."):
-                        nova_foto_path, error = save_socio_photo(nova_foto_uploaded, socio_id)
-                        if error:
-                            st.error(f"Erro ao salvar nova foto: {error}")
-                            return
-                        foto_final = nova_foto_path
+                    error = check_photo_upload(nova_foto_uploaded)
+                    if error:
+                        st.error(f"Erro ao salvar nova foto: {error}")
+                        return
                 
                 # Preparar dados de endereço
                 endereco_data = {
@@ -864,11 +926,10 @@ def show_edit_form(socio_id):
                 }
                 
                 # Atualizar sócio
-                if update_socio_complete(socio_id, nome_completo.strip(), cpf_limpo, data_nascimento, email.strip().lower(), telefone_limpo, tamanho_camisa, comando_id, foto_final, plano_id_final, data_adesao_plano, data_vencimento_plano, endereco_data):
+                if update_socio_complete(socio_id, nome_completo.strip(), cpf_limpo, data_nascimento, email.strip().lower(), telefone_limpo, tamanho_camisa, comando_id, foto_final, plano_id_final, endereco_data):
+                    if nova_foto_uploaded:
+                        queue_socio_photo(nova_foto_uploaded, cpf_limpo)
                     show_success("✅ Sócio atualizado com sucesso!")
-                    # Limpar cache
-                    get_socios_data.clear()
-                    get_report_data.clear()
                     st.session_state['socio_action'] = 'list'
                     st.rerun()
                 else:
@@ -884,6 +945,83 @@ def show_edit_form(socio_id):
                 st.session_state['socio_action'] = 'list'
                 st.rerun()
 
+def show_import_form():
+    """Importar sócios em lote a partir de CSV/XLSX"""
+    from utils.socios_import import import_socios, errors_to_csv, REQUIRED_COLUMNS
+    
+    st.subheader("📥 Importar Sócios")
+    
+    if st.button("⬅️ Voltar", key="btn_voltar_import"):
+        st.session_state['socio_action'] = 'list'
+        st.session_state.pop('socios_import_resultado', None)
+        st.rerun()
+    
+    st.markdown("---")
+    st.info(
+        "Envie um arquivo CSV ou XLSX com cabeçalho. Colunas obrigatórias: "
+        f"{', '.join(REQUIRED_COLUMNS)}. Opcionais: tamanho_camisa, plano, cep, endereco, "
+        "numero, complemento, bairro, cidade, estado. Comando e plano podem ser informados por id ou nome."
+    )
+    
+    arquivo = st.file_uploader("Arquivo", type=['csv', 'xlsx'], key="socios_import_arquivo")
+    
+    if arquivo is not None and st.button("🚀 Importar", type="primary", key="btn_executar_import"):
+        progresso = st.progress(0.0, text="Importando...")
+        tamanho = max(arquivo.size, 1)
+        
+        def on_progress(resultado):
+            # Posição aproximada no arquivo (o leitor avança por blocos)
+            posicao = min(arquivo.tell() / tamanho, 1.0)
+            progresso.progress(posicao, text=f"{resultado['total']} linhas lidas, {resultado['importados']} importadas")
+        
+        try:
+            inicio = time.time()
+            resultado = import_socios(arquivo, arquivo.name, on_progress=on_progress)
+            resultado['tempo'] = time.time() - inicio
+        except ValueError as e:
+            progresso.empty()
+            show_error(str(e))
+            return
+        
+        for socio in resultado['inseridos']:
+            index_socio(socio['id'], socio['nome_completo'], socio['cpf'], socio['email'],
+                        socio['telefone'], socio['comando_id'])
+        if resultado['importados']:
+            invalidate('socios')
+            refresh_dashboard_resumo()
+        
+        progresso.progress(1.0, text="Importação concluída")
+        resultado.pop('inseridos')
+        st.session_state['socios_import_resultado'] = resultado
+    
+    resultado = st.session_state.get('socios_import_resultado')
+    if resultado:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Linhas lidas", resultado['total'])
+        with col2:
+            st.metric("Importados", resultado['importados'])
+        with col3:
+            st.metric("Com erro", len(resultado['erros']))
+        st.caption(f"Tempo: {resultado['tempo']:.1f}s")
+        
+        if resultado['erros']:
+            st.warning("Algumas linhas não foram importadas:")
+            st.dataframe(
+                pd.DataFrame(resultado['erros'], columns=['Linha', 'Erro']).head(1000),
+                use_container_width=True,
+                hide_index=True
+            )
+            st.download_button(
+                "⬇️ Baixar relatório de erros",
+                data=errors_to_csv(resultado['erros']),
+                file_name="erros_importacao.csv",
+                mime="text/csv",
+                key="btn_download_erros_import"
+            )
+        else:
+            show_success("Todas as linhas foram importadas!")
+
 def show_report():
     """Mostrar relatório de sócios"""
     st.subheader("📊 Relatório de Sócios")
@@ -895,15 +1033,15 @@ def show_report():
     
     st.markdown("---")
     
-    # Buscar dados para relatório com cache
+    # Buscar dados para relatório com cache (DataFrame lido por coluna)
     with st.spinner("Gerando relatório..."):
         report_data = get_report_data()
     
-    if report_data:
+    if not report_data.empty:
         # Resumo geral
         st.subheader("📈 Resumo Geral")
-        total_socios = sum(item['total_socios'] for item in report_data)
-        total_comandos = len([item for item in report_data if item['total_socios'] > 0])
+        total_socios = int(report_data['total_socios'].sum())
+        total_comandos = int((report_data['total_socios'] > 0).sum())
         
         col1, col2, col3 = st.columns(3)
         with col1:
@@ -917,7 +1055,7 @@ def show_report():
         
         # Tabela detalhada
         st.subheader("📋 Relatório por Comando")
-        df = pd.DataFrame(report_data)
+        df = report_data.copy()
         
         # Renomear colunas para melhor visualização
         df.columns = ['Comando', 'Total', 'PP', 'P', 'M', 'G', 'GG', 'XG', 'XXG']
@@ -947,13 +1085,8 @@ def show_report():
         # Relatório de tamanhos
         st.subheader("👕 Distribuição por Tamanho de Camisa")
         tamanhos_data = {
-            'PP': sum(item['tamanho_pp'] for item in report_data),
-            'P': sum(item['tamanho_p'] for item in report_data),
-            'M': sum(item['tamanho_m'] for item in report_data),
-            'G': sum(item['tamanho_g'] for item in report_data),
-            'GG': sum(item['tamanho_gg'] for item in report_data),
-            'XG': sum(item['tamanho_xg'] for item in report_data),
-            'XXG': sum(item['tamanho_xxg'] for item in report_data)
+            tamanho: int(report_data[f"tamanho_{tamanho.lower()}"].sum())
+            for tamanho in ['PP', 'P', 'M', 'G', 'GG', 'XG', 'XXG']
         }
         
         # Filtrar tamanhos com pelo menos 1 sócio
@@ -977,11 +1110,9 @@ def show_report():
         st.subheader("🎫 Distribuição por Plano de Sócio")
         
         # Buscar dados de planos com cache
-        planos_report_data = get_planos_report_data()
+        df_planos = get_planos_report_data()
         
-        if planos_report_data:
-            # Criar DataFrame para planos
-            df_planos = pd.DataFrame(planos_report_data)
+        if not df_planos.empty:
             
             # Exibir tabela de planos
             col1, col2 = st.columns(2)
@@ -1031,7 +1162,7 @@ def show_report():
         else:
             st.info("Nenhum dado de plano encontrado para exibir relatório.")
         
-        # Lista detalhada de sócios
+        # Lista detalhada de sócios: prévia na tela, lista completa pela exportação
         st.subheader("👥 Lista Detalhada de Sócios")
         socios_detalhados_query = """
         SELECT 
@@ -1048,33 +1179,41 @@ def show_report():
         FROM socios s
         LEFT JOIN comandos c ON s.comando_id = c.id
         LEFT JOIN planos p ON s.plano_id = p.id
-        ORDER BY s.nome_completo
+        ORDER BY s.nome_completo, s.id
+        LIMIT %s
         """
         
         with st.spinner("Carregando lista detalhada..."):
-            socios_detalhados = db.execute_query(socios_detalhados_query, fetch=True)
-        
-        if socios_detalhados:
-            # Criar DataFrame para melhor visualização
-            df_socios = pd.DataFrame(socios_detalhados)
-            df_socios['CPF'] = df_socios['cpf'].apply(format_cpf)
-            df_socios['Telefone'] = df_socios['telefone'].apply(format_phone)
-            df_socios['Data Nascimento'] = df_socios['data_nascimento'].apply(format_date)
-            
-            # Preparar coluna de plano com valor formatado
-            def format_plano(row):
-                if row['valor_plano'] > 0:
-                    return f"{row['plano_nome']} - R$ {row['valor_plano']:.2f} ({row['periodicidade_plano']})"
-                else:
-                    return row['plano_nome']
+            try:
+                df_socios = db.fetch_frame(socios_detalhados_query, (PREVIEW_LINHAS,))
+            except Exception as e:
+                st.error(f"Erro ao carregar lista detalhada: {e}")
+                df_socios = pd.DataFrame()
+        
+        if not df_socios.empty:
+            # Formatação por coluna
+            df_socios['CPF'] = df_socios['cpf'].map(format_cpf)
+            df_socios['Telefone'] = df_socios['telefone'].map(format_phone)
+            df_socios['Data Nascimento'] = df_socios['data_nascimento'].dt.strftime('%d/%m/%Y')
             
-            df_socios['Plano Completo'] = df_socios.apply(format_plano, axis=1)
+            # Coluna de plano com valor formatado (só para planos com valor)
+            com_valor = df_socios['valor_plano'] > 0
+            df_socios['Plano Completo'] = df_socios['plano_nome'].where(
+                ~com_valor,
+                df_socios['plano_nome'] + " - R$ " + df_socios['valor_plano'].map('{:.2f}'.format)
+                + " (" + df_socios['periodicidade_plano'] + ")"
+            )
             
             # Selecionar e renomear colunas
             df_display = df_socios[['nome_completo', 'CPF', 'email', 'Telefone', 'Data Nascimento', 'tamanho_camisa', 'comando_nome', 'Plano Completo']].copy()
             df_display.columns = ['Nome', 'CPF', 'Email', 'Telefone', 'Data Nascimento', 'Tamanho Camisa', 'Comando', 'Plano']
             
             st.dataframe(df_display, use_container_width=True)
+            if len(df_socios) == PREVIEW_LINHAS:
+                st.caption(f"Mostrando os primeiros {PREVIEW_LINHAS} sócios. Exporte para obter a lista completa.")
+            
+            st.markdown("**📤 Exportar lista completa**")
+            show_export_widget('socios', key="exportar_socios_relatorio")
         else:
             st.info("Nenhum sócio cadastrado.")
     else:
@@ -1102,79 +1241,34 @@ def validate_socio_form(nome, cpf, email, telefone, data_nascimento):
 def create_socio(nome, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, foto, plano_id, endereco_data, data_cadastro=None):
     """Criar novo sócio"""
     try:
-        # Verificar se CPF já existe
-        cpf_check = "SELECT id FROM socios WHERE cpf = %s"
-        existing = db.execute_query_one(cpf_check, (cpf,))
-        
-        if existing:
-            st.error("CPF já cadastrado!")
-            return False
-        
-        # Verificar se email já existe
-        email_check = "SELECT id FROM socios WHERE email = %s"
-        existing_email = db.execute_query_one(email_check, (email,))
-        
-        if existing_email:
-            st.error("E-mail já cadastrado!")
-            return False
-        
-        # Calcular datas do plano se houver
-        data_adesao_plano = None
-        data_vencimento_plano = None
-        
-        if plano_id:
-            data_adesao_plano = date.today()
-            # Buscar periodicidade do plano
-            plano_info = db.execute_query_one("SELECT periodicidade FROM planos WHERE id = %s", (plano_id,))
-            if plano_info:
-                if plano_info['periodicidade'] == 'Mensal':
-                    data_vencimento_plano = data_adesao_plano + timedelta(days=30)
-                elif plano_info['periodicidade'] == 'Trimestral':
-                    data_vencimento_plano = data_adesao_plano + timedelta(days=90)
-                elif plano_info['periodicidade'] == 'Anual':
-                    data_vencimento_plano = data_adesao_plano + timedelta(days=365)
-        
-        # Usar data fornecida ou data atual se não fornecida
-        if data_cadastro is None:
-            data_cadastro = date.today()
-        
-        # Inserir sócio
-        insert_query = """
-        INSERT INTO socios (nome_completo, foto, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, 
-                           plano_id, data_adesao_plano, data_vencimento_plano,
-                           cep, endereco, numero, complemento, bairro, cidade, estado)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        params = (nome, foto, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, 
-                 plano_id, data_adesao_plano, data_vencimento_plano,
-                 endereco_data['cep'], endereco_data['endereco'], endereco_data['numero'],
-                 endereco_data['complemento'], endereco_data['bairro'], endereco_data['cidade'],
-                 endereco_data['estado'])
-        
-        if db.execute_query(insert_query, params):
-            return True
-        else:
-            return False
-        
+        # Uma instrução: o UNIQUE de CPF/e-mail recusa duplicados e as datas do plano saem do banco
+        novo_socio = insert_socio(nome, cpf, data_nascimento, email, telefone, tamanho_camisa,
+                                  comando_id, foto, plano_id, endereco_data)
+    except RegistroDuplicado as e:
+        st.error("CPF já cadastrado!" if e.campo == 'cpf' else "E-mail já cadastrado!")
+        return False
     except Exception as e:
         st.error(f"Erro ao criar sócio: {e}")
         return False
+    
+    # Atualizar índice de busca
+    index_socio(novo_socio['id'], nome, cpf, email, telefone, comando_id)
+    invalidate('socios')
+    refresh_dashboard_resumo()
+    return True
 
 def update_socio(socio_id, nome, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, foto):
     """Atualizar sócio"""
     try:
         # Verificar se CPF já existe em outro sócio
-        cpf_check = "SELECT id FROM socios WHERE cpf = %s AND id != %s"
-        existing = db.execute_query_one(cpf_check, (cpf, socio_id))
+        existing = db.execute_prepared_one('socio_cpf_em_uso', (cpf, socio_id))
         
         if existing:
             st.error("CPF já cadastrado em outro sócio!")
             return False
         
         # Verificar se email já existe em outro sócio
-        email_check = "SELECT id FROM socios WHERE email = %s AND id != %s"
-        existing_email = db.execute_query_one(email_check, (email, socio_id))
+        existing_email = db.execute_prepared_one('socio_email_em_uso', (email, socio_id))
         
         if existing_email:
             st.error("E-mail já cadastrado em outro sócio!")
@@ -1191,6 +1285,9 @@ def update_socio(socio_id, nome, cpf, data_nascimento, email, telefone, tamanho_
         params = (nome, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, socio_id)
         
         if db.execute_query(update_query, params):
+            index_socio(socio_id, nome, cpf, email, telefone, comando_id)
+            invalidate('socios')
+            refresh_dashboard_resumo()
             return True
         else:
             return False
@@ -1199,60 +1296,42 @@ def update_socio(socio_id, nome, cpf, data_nascimento, email, telefone, tamanho_
         st.error(f"Erro ao atualizar sócio: {e}")
         return False
 
-def update_socio_complete(socio_id, nome, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, foto, plano_id, data_adesao_plano, data_vencimento_plano, endereco_data):
-    """Atualizar sócio com todos os campos (versão completa)"""
+def update_socio_complete(socio_id, nome, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, foto, plano_id, endereco_data):
+    """Atualizar sócio com todos os campos (versão completa)
+    
+    Se o plano mudar, a adesão passa a ser hoje e o vencimento é calculado
+    pela periodicidade do novo plano, na mesma instrução.
+    """
     try:
-        # Verificar se CPF já existe em outro sócio
-        cpf_check = "SELECT id FROM socios WHERE cpf = %s AND id != %s"
-        existing_cpf = db.execute_query_one(cpf_check, (cpf, socio_id))
-        
-        if existing_cpf:
-            st.error("CPF já cadastrado para outro sócio!")
-            return False
-        
-        # Verificar se Email já existe em outro sócio
-        email_check = "SELECT id FROM socios WHERE email = %s AND id != %s"
-        existing_email = db.execute_query_one(email_check, (email, socio_id))
-        
-        if existing_email:
-            st.error("Email já cadastrado para outro sócio!")
-            return False
-
-        # Query completa com todos os campos
-        update_query = """
-        UPDATE socios 
-        SET nome_completo = %s, foto = %s, cpf = %s, data_nascimento = %s, 
-            email = %s, telefone = %s, tamanho_camisa = %s, comando_id = %s,
-            plano_id = %s, data_adesao_plano = %s, data_vencimento_plano = %s,
-            cep = %s, endereco = %s, numero = %s, complemento = %s, 
-            bairro = %s, cidade = %s, estado = %s
-        WHERE id = %s
-        """
-        
-        params = (
-            nome, foto, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id,
-            plano_id, data_adesao_plano, data_vencimento_plano,
-            endereco_data['cep'], endereco_data['endereco'], endereco_data['numero'],
-            endereco_data['complemento'], endereco_data['bairro'], endereco_data['cidade'],
-            endereco_data['estado'], socio_id
-        )
-        
-        if db.execute_query(update_query, params):
-            # Limpar cache
-            get_socios_data.clear()
-            get_report_data.clear()
-            return True
-        else:
-            return False
+        atualizado = update_socio_row(socio_id, nome, cpf, data_nascimento, email, telefone, tamanho_camisa,
+                                      comando_id, foto, plano_id, endereco_data)
+    except RegistroDuplicado as e:
+        st.error("CPF já cadastrado para outro sócio!" if e.campo == 'cpf' else "Email já cadastrado para outro sócio!")
+        return False
     except Exception as e:
         st.error(f"Erro ao atualizar sócio: {e}")
         return False
+    
+    if not atualizado:
+        return False
+    index_socio(socio_id, nome, cpf, email, telefone, comando_id)
+    invalidate('socios')
+    refresh_dashboard_resumo()
+    return True
 
 def delete_socio(socio_id):
     """Excluir sócio"""
     try:
+        socio = db.execute_prepared_one('socio_foto_por_id', (socio_id,))
         delete_query = "DELETE FROM socios WHERE id = %s"
-        return db.execute_query(delete_query, (socio_id,))
+        if db.execute_query(delete_query, (socio_id,)):
+            if socio and socio['foto']:
+                release_photo(socio['foto'])
+            unindex_socio(socio_id)
+            invalidate('socios')
+            refresh_dashboard_resumo()
+            return True
+        return False
     except Exception as e:
         st.error(f"Erro ao excluir sócio: {e}")
         return False
\ No newline at end of file
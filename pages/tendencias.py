@@ -0,0 +1,78 @@
+import streamlit as st
+import pandas as pd
+from datetime import date
+from utils.helpers import format_currency
+from utils.relatorios import get_trends
+
+# Medidas de faturas_monthly exibidas nos gráficos
+MEDIDAS = {
+    'valor_emitido': "Valor emitido (por vencimento)",
+    'valor_recebido': "Valor recebido (por pagamento)",
+    'valor_atrasado': "Valor em atraso (por vencimento)",
+    'faturas': "Faturas emitidas",
+    'recebidas': "Faturas recebidas"
+}
+
+AGRUPAMENTOS = {
+    None: "Total",
+    'comando': "Por comando",
+    'plano': "Por plano",
+    'forma_pagamento': "Por forma de pagamento"
+}
+
+def show():
+    st.title("📈 Tendências")
+    st.markdown("---")
+
+    # Filtros: anos, granularidade, agrupamento e medida
+    hoje = date.today()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        ano_inicial, ano_final = st.slider(
+            "Anos",
+            min_value=hoje.year - 10,
+            max_value=hoje.year,
+            value=(hoje.year - 4, hoje.year),
+            key="tendencias_anos"
+        )
+    with col2:
+        granularidade = st.radio("Granularidade", ['mes', 'ano'], format_func=lambda x: "Mensal" if x == 'mes' else "Anual",
+                                 horizontal=True, key="tendencias_granularidade")
+    with col3:
+        dimensao = st.selectbox("Agrupar", list(AGRUPAMENTOS.keys()), format_func=lambda x: AGRUPAMENTOS[x],
+                                key="tendencias_dimensao")
+    with col4:
+        medida = st.selectbox("Medida", list(MEDIDAS.keys()), format_func=lambda x: MEDIDAS[x], key="tendencias_medida")
+
+    df = get_trends(date(ano_inicial, 1, 1), date(ano_final + 1, 1, 1), dimensao, granularidade)
+
+    if df.empty:
+        st.info("Nenhuma fatura no período selecionado.")
+        return
+
+    df['periodo'] = pd.to_datetime(df['periodo'])
+
+    # Totais do período
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Valor emitido", format_currency(df['valor_emitido'].sum()))
+    with col2:
+        st.metric("Valor recebido", format_currency(df['valor_recebido'].sum()))
+    with col3:
+        st.metric("Valor em atraso", format_currency(df['valor_atrasado'].sum()))
+
+    # Uma série por grupo (ou uma só para o total)
+    if dimensao:
+        grafico = df.pivot_table(index='periodo', columns='grupo', values=medida, aggfunc='sum').fillna(0)
+    else:
+        grafico = df.set_index('periodo')[[medida]]
+
+    st.subheader(MEDIDAS[medida])
+    if granularidade == 'ano':
+        grafico.index = grafico.index.year.astype(str)
+        st.bar_chart(grafico)
+    else:
+        st.line_chart(grafico)
+
+    with st.expander("📋 Dados"):
+        st.dataframe(grafico, use_container_width=True)
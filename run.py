@@ -99,6 +99,14 @@ def main():
         create_placeholder_files()
         
         print("\n✅ Verificações concluídas!")
+
+        # Aplicar as migrações pendentes do banco
+        if subprocess.run([sys.executable, "migrar.py"]).returncode != 0:
+            print("\n❌ Falha ao aplicar as migrações do banco!")
+            print("💡 Execute: python migrar.py --status")
+            input("Pressione Enter para sair...")
+            return
+
         print("🚀 Iniciando Streamlit...")
         print("=" * 50)
         
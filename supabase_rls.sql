@@ -0,0 +1,19 @@
+-- ========================================
+-- UT-SOCIOS - RLS do Supabase (opcional)
+-- As tabelas são criadas por `python migrar.py` (pasta migrations/);
+-- este arquivo só habilita o Row Level Security depois das migrações.
+-- ========================================
+
+-- Habilitar RLS nas tabelas
+ALTER TABLE usuarios ENABLE ROW LEVEL SECURITY;
+ALTER TABLE comandos ENABLE ROW LEVEL SECURITY;
+ALTER TABLE planos ENABLE ROW LEVEL SECURITY;
+ALTER TABLE socios ENABLE ROW LEVEL SECURITY;
+ALTER TABLE faturas ENABLE ROW LEVEL SECURITY;
+
+-- Políticas de acesso (permitir tudo para facilitar desenvolvimento)
+CREATE POLICY "Allow all operations on usuarios" ON usuarios FOR ALL USING (true);
+CREATE POLICY "Allow all operations on comandos" ON comandos FOR ALL USING (true);
+CREATE POLICY "Allow all operations on planos" ON planos FOR ALL USING (true);
+CREATE POLICY "Allow all operations on socios" ON socios FOR ALL USING (true);
+CREATE POLICY "Allow all operations on faturas" ON faturas FOR ALL USING (true);
@@ -50,7 +50,7 @@ def test_connection():
                     print(f"   - {table_name}")
             else:
                 print("⚠️  Nenhuma tabela encontrada")
-                print("💡 Execute: python setup_database.py")
+                print("💡 Execute: python migrar.py")
             
             # Verificar usuários
             users_query = "SELECT COUNT(*) as total FROM usuarios"
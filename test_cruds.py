@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config.database import db
 from utils.validators import validate_cpf, validate_email, validate_phone
+from config.migracoes import pending_migrations, verify_indexes
 
 def test_database_connection():
     """Testar conexão com banco de dados"""
@@ -181,13 +182,36 @@ def test_validators():
     print("  ✅ Todos os validadores funcionando perfeitamente!")
     return True
 
+def test_indices():
+    """Testar se as consultas das páginas usam os índices (EXPLAIN)"""
+    print("\n🗂️ Testando índices...")
+
+    pendentes = pending_migrations()
+    if pendentes:
+        print(f"  ❌ {len(pendentes)} migrações pendentes! Execute: python migrar.py")
+        return False
+
+    falhas = 0
+    for descricao, indice, ok, plano in verify_indexes():
+        if ok:
+            print(f"  ✅ {descricao}: {indice}")
+        else:
+            falhas += 1
+            print(f"  ❌ {descricao}: plano não usa {indice}")
+            print("     " + plano.replace("\n", "\n     "))
+
+    if falhas:
+        return False
+    print("  ✅ Todas as consultas usam os índices esperados!")
+    return True
+
 def main():
     """Executar todos os testes"""
     print("🧪 INICIANDO TESTES DO SISTEMA UT-SOCIOS")
     print("=" * 50)
     
     tests_passed = 0
-    total_tests = 4
+    total_tests = 5
     
     # Teste 1: Conexão com banco
     if test_database_connection():
@@ -205,6 +229,10 @@ def main():
     if test_validators():
         tests_passed += 1
     
+    # Teste 5: Índices
+    if test_indices():
+        tests_passed += 1
+    
     print("\n" + "=" * 50)
     print(f"📊 RESULTADO DOS TESTES: {tests_passed}/{total_tests}")
     
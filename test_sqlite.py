@@ -0,0 +1,1231 @@
+#!/usr/bin/env python3
+"""
+Testes do backend SQLite e das otimizações de acesso ao banco
+
+Rodam sem servidor, num banco SQLite em memória criado pelas migrações,
+independente do DB_BACKEND configurado. As partes do pool do PostgreSQL
+são testadas com conexões falsas (só precisam do psycopg2 instalado).
+"""
+
+import sys
+import os
+import io
+import gc
+import threading
+import time
+import tempfile
+import shutil
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import config.database
+from config.database_sqlite import Database, translate, split_statements, split_values, MAX_PARAMETROS
+from config.consultas import to_positional
+from config.colunar import build_frame, build_arrow
+from config.dialeto import get_sql_dialect
+from utils.cache import TableVersions, read_db_versions, bump_db_versions, cached_query, invalidate
+import utils.search_index
+from utils.search_index import SearchIndex, VERSAO_INDICE
+import pages.faturas
+import utils.socios_cadastro
+from utils.socios_cadastro import duplicated_field, insert_socio, update_socio_row, RegistroDuplicado
+import utils.socios_import
+from utils.socios_import import import_socios, validate_chunk
+import utils.faturamento
+from utils.faturamento import gerar_faturas, marcar_atrasadas, add_months
+from utils.dashboard_resumo import AtualizacaoAgendada
+import utils.exportacao
+from utils.exportacao import export_to_file, export_for_download, remove_old_exports, ExportacaoGrande
+import utils.relatorios
+from utils.relatorios import get_comando_report, is_month_aligned, period_range
+import utils.photo_manager
+from utils.photo_manager import (store_photo, get_photo_variant, read_photo_bytes, get_photo_data_uri, variant_path,
+                                 release_photo, collect_orphan_photos)
+
+banco = Database(':memory:')
+
+@contextmanager
+def banco_global(*modulos):
+    """Usar o banco de teste como o db global (e o importado pelos módulos informados)"""
+    alvos = [config.database, *modulos]
+    anteriores = [m.db for m in alvos]
+    for m in alvos:
+        m.db = banco
+    try:
+        yield banco
+    finally:
+        for m, anterior in zip(alvos, anteriores):
+            m.db = anterior
+
+@contextmanager
+def variaveis_ambiente(**valores):
+    """Definir variáveis de ambiente (None remove) e restaurar as anteriores"""
+    anteriores = {v: os.environ.get(v) for v in valores}
+    try:
+        for v, valor in valores.items():
+            os.environ.pop(v, None)
+            if valor is not None:
+                os.environ[v] = valor
+        yield
+    finally:
+        for v, valor in anteriores.items():
+            os.environ.pop(v, None)
+            if valor is not None:
+                os.environ[v] = valor
+
+def _novo_socio(n, comando_id=1, plano_id=1, **colunas):
+    """Inserir um sócio de teste; retorna o id"""
+    valores = {
+        'nome_completo': f"Sócio Teste {n}", 'cpf': f"{n:011d}", 'data_nascimento': date(1990, 1, 1),
+        'email': f"socio{n}@teste.com", 'telefone': "11999999999", 'tamanho_camisa': "M",
+        'comando_id': comando_id, 'plano_id': plano_id,
+    }
+    valores.update(colunas)
+    linha = banco.execute_returning(
+        f"INSERT INTO socios ({', '.join(valores)}) VALUES ({', '.join(['%s'] * len(valores))}) RETURNING id",
+        tuple(valores.values())
+    )
+    return linha['id']
+
+def _cpf(base):
+    """CPF válido (11 dígitos) a partir dos 9 primeiros"""
+    digitos = [int(d) for d in f"{base:09d}"]
+    for tamanho in (9, 10):
+        resto = sum(d * (tamanho + 1 - i) for i, d in enumerate(digitos)) * 10 % 11
+        digitos.append(resto % 10)
+    return ''.join(map(str, digitos))
+
+@contextmanager
+def pasta_fotos():
+    """UPLOAD_DIR temporário para os testes de fotos"""
+    anterior = utils.photo_manager.UPLOAD_DIR
+    pasta = tempfile.mkdtemp(prefix="fotos_")
+    utils.photo_manager.UPLOAD_DIR = pasta
+    try:
+        yield pasta
+    finally:
+        utils.photo_manager.UPLOAD_DIR = anterior
+        shutil.rmtree(pasta, ignore_errors=True)
+
+def _imagem(largura, altura, cor=(200, 30, 30), formato='PNG'):
+    """Bytes de uma imagem lisa, como viria do upload"""
+    from PIL import Image
+    saida = io.BytesIO()
+    Image.new('RGB', (largura, altura), cor).save(saida, format=formato)
+    return saida.getvalue()
+
+def _dimensoes(caminho):
+    from PIL import Image
+    with Image.open(caminho) as imagem:
+        return imagem.size
+
+def _postgres():
+    """Database do PostgreSQL (sem conectar) ou None sem o psycopg2"""
+    try:
+        from config.database_postgresql import Database as PostgresDatabase
+    except ImportError:
+        print("  ⚠️ psycopg2 não instalado, teste ignorado")
+        return None
+    with variaveis_ambiente(DATABASE_URL=None, DB_POOL_MIN=None, DB_POOL_MAX='5'):
+        return PostgresDatabase()
+
+class _CursorFalso:
+    """Cursor do psycopg2 que só registra as instruções"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.executadas.append(query.split(' (')[0])
+        if query.startswith("EXECUTE") and self.conn.perder_preparadas:
+            import psycopg2
+            self.conn.perder_preparadas = False
+            raise psycopg2.errors.InvalidSqlStatementName("prepared statement does not exist")
+
+    def fetchone(self):
+        return {'id': 1}
+
+    def fetchall(self):
+        return [{'id': 1}]
+
+    def close(self):
+        pass
+
+class _ConexaoFalsa:
+    """Conexão do psycopg2 sem servidor (quebrada=True: o ROLLBACK falha)"""
+
+    autocommit = True
+    perder_preparadas = False
+
+    def __init__(self, status=None, quebrada=False, closed=0):
+        from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+        self.status = TRANSACTION_STATUS_IDLE if status is None else status
+        self.quebrada = quebrada
+        self.closed = closed
+        self.executadas = []
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        import psycopg2
+        if self.quebrada:
+            raise psycopg2.OperationalError("server closed the connection unexpectedly")
+        self.executadas.append("ROLLBACK")
+
+    def cursor(self, cursor_factory=None):
+        return _CursorFalso(self)
+
+class _PoolFalso:
+    """ThreadedConnectionPool que entrega as conexões informadas, na ordem"""
+
+    closed = False
+
+    def __init__(self, *conexoes):
+        self.conexoes = list(conexoes)
+        self.devolvidas = []
+
+    def getconn(self):
+        return self.conexoes.pop(0)
+
+    def putconn(self, conn, close=False):
+        self.devolvidas.append((conn, close))
+
+def test_postgres_pool():
+    """Testar o pool do PostgreSQL com conexões falsas (tamanho, saúde e descarte)"""
+    print("\n🏊 Testando o pool de conexões do PostgreSQL...")
+    pg = _postgres()
+    if pg is None:
+        return
+    from psycopg2.extensions import TRANSACTION_STATUS_INERROR, TRANSACTION_STATUS_UNKNOWN
+
+    # Sem DB_POOL_MIN o pool mantém todas as conexões devolvidas; o mínimo nunca passa do máximo
+    assert pg.pool_min == pg.pool_max == 5
+    with variaveis_ambiente(DATABASE_URL=None, DB_POOL_MIN='50', DB_POOL_MAX='5'):
+        from config.database_postgresql import Database as PostgresDatabase
+        assert PostgresDatabase().pool_min == 5
+
+    # Transação abortada é desfeita; conexão que falha no ROLLBACK ou perdida é recusada
+    abortada = _ConexaoFalsa(TRANSACTION_STATUS_INERROR)
+    assert pg._conexao_saudavel(abortada) and "ROLLBACK" in abortada.executadas
+    assert pg._conexao_saudavel(_ConexaoFalsa(TRANSACTION_STATUS_INERROR, quebrada=True)) is False
+    assert pg._conexao_saudavel(_ConexaoFalsa(TRANSACTION_STATUS_UNKNOWN)) is False
+    assert pg._conexao_saudavel(_ConexaoFalsa(closed=1)) is False
+
+    # A conexão quebrada é descartada e o empréstimo usa a seguinte
+    quebrada, boa = _ConexaoFalsa(closed=1), _ConexaoFalsa()
+    pg.pool = _PoolFalso(quebrada, boa)
+    with pg.connection() as conn:
+        assert conn is boa
+        assert pg.pool_stats()['em_uso'] == 1
+    assert pg.pool.devolvidas == [(quebrada, True), (boa, False)]
+    stats = pg.pool_stats()
+    assert stats['checkouts'] == 1 and stats['descartadas'] == 1 and stats['em_uso'] == 0
+    print("  ✅ Pool de conexões OK")
+
+def test_search_index():
+    """Testar a busca por n-gramas (acentos, máscaras, prefixos, filtros e remoção)"""
+    print("\n🔎 Testando o índice de busca...")
+    index = SearchIndex()
+    index.add(1, "José da Silva", "123.456.789-01", "jose@teste.com", "(11) 98888-7777", comando_id=1)
+    index.add(2, "Maria Joselita Souza", "98765432100", "maria@teste.com", "11977776666", comando_id=2)
+    index.add(3, "João Santos", "11122233344", "joao@teste.com", None, comando_id=1)
+    assert len(index) == 3
+
+    assert index.search("jose")[0] == 1  # Sem acento; nome começando pela busca vem primeiro
+    assert set(index.search("JOSÉ")) == {1, 2}
+    assert index.search("123.456") == [1] and index.search("98888-77") == [1]
+    assert index.search("silva", comando_id=2) == []
+    assert index.search("j s") == [3, 1, 2]  # Iniciais: prefixos de palavras, em ordem de nome
+    assert index.search("jo", limit=2) == [3, 1]
+    assert index.search("j") == []  # Abaixo de MIN_QUERY_LENGTH
+    assert index.search("xyzw") == []
+
+    # Reindexar troca os n-gramas antigos; remover limpa as listas vazias
+    index.add(1, "Pedro Alves", "12345678901", None, None, comando_id=1)
+    assert index.search("silva") == [] and index.search("pedro") == [1]
+    for socio_id in (1, 2, 3):
+        index.remove(socio_id)
+    index.remove(99)
+    assert len(index) == 0 and not index._postings
+    print("  ✅ Índice de busca OK")
+
+def test_search_index_versions():
+    """Testar a recarga do índice quando outro processo altera sócios (VERSAO_INDICE)"""
+    print("\n🔄 Testando versões do índice de busca...")
+    utils.search_index._get_loaded_index.clear()
+    with banco_global():
+        jose = _novo_socio(4001, nome_completo="José Versão")
+        index = utils.search_index.get_search_index()
+        assert index.search("versao") == [jose]
+
+        # O processo que grava atualiza o próprio índice e publica a versão nova, sem recarregar
+        antes = read_db_versions(banco).get(VERSAO_INDICE, 0)
+        ana = _novo_socio(4002, nome_completo="Ana Versão")
+        utils.search_index.index_socio(ana, "Ana Versão", f"{4002:011d}", None, None, 1)
+        assert read_db_versions(banco)[VERSAO_INDICE] == antes + 1
+        invalidate(VERSAO_INDICE)  # Força a releitura de cache_versions
+        assert utils.search_index.get_search_index() is index
+        assert set(index.search("versao")) == {jose, ana}
+
+        # Escrita de outro processo: só a versão no banco muda, e o índice é recarregado
+        banco.execute_query("DELETE FROM socios WHERE id = %s", (jose,))
+        bump_db_versions(VERSAO_INDICE, database=banco)
+        invalidate(VERSAO_INDICE)
+        recarregado = utils.search_index.get_search_index()
+        assert recarregado is not index and recarregado.search("versao") == [ana]
+
+        utils.search_index.unindex_socio(ana)
+        assert read_db_versions(banco)[VERSAO_INDICE] == antes + 3
+        banco.execute_query("DELETE FROM socios WHERE id = %s", (ana,))
+    utils.search_index._get_loaded_index.clear()
+    print("  ✅ Versões do índice de busca OK")
+
+def test_cache_invalidation():
+    """Testar a invalidação do cache por escritas locais e de outros processos"""
+    print("\n🧊 Testando invalidação do cache...")
+    # Escritas de outro processo chegam pelos gatilhos de cache_versions
+    versoes = TableVersions(check_interval=0, read_versions=lambda: read_db_versions(banco))
+    antes = versoes.get(('comandos', 'socios'))
+    banco.execute_query("INSERT INTO comandos (nome) VALUES (%s)", ("Comando Cache",))
+    depois = versoes.get(('comandos', 'socios'))
+    assert depois[0][0] > antes[0][0] and depois[1] == antes[1]
+    banco.execute_query("UPDATE comandos SET nome = %s WHERE nome = %s", ("Comando Cache 2", "Comando Cache"))
+    assert versoes.get(('comandos',))[0][0] > depois[0][0]
+
+    # Versões sem gatilho (ex.: índice de busca) são criadas e incrementadas por bump_db_versions
+    bump_db_versions('teste_indice', database=banco)
+    bump_db_versions('teste_indice', database=banco)
+    assert read_db_versions(banco)['teste_indice'] == 2
+
+    # Dentro do intervalo a versão do banco não é relida, mas bump() força a releitura
+    lento = TableVersions(check_interval=3600, read_versions=lambda: read_db_versions(banco))
+    inicial = lento.get(('comandos',))
+    banco.execute_query("DELETE FROM comandos WHERE nome = %s", ("Comando Cache 2",))
+    assert lento.get(('comandos',)) == inicial
+    lento.bump(('comandos',))
+    assert lento.get(('comandos',))[0][0] > inicial[0][0]
+    assert lento.get(('comandos',))[0][1] == inicial[0][1] + 1
+
+    # cached_query: nova leitura depois de invalidate()
+    chamadas = []
+
+    @cached_query('comandos')
+    def contar_comandos():
+        chamadas.append(1)
+        return banco.execute_query_one("SELECT COUNT(*) AS total FROM comandos")['total']
+
+    with banco_global():
+        total = contar_comandos()
+        assert contar_comandos() == total and len(chamadas) == 1
+        banco.execute_query("INSERT INTO comandos (nome) VALUES (%s)", ("Comando Cache 3",))
+        invalidate('comandos')
+        assert contar_comandos() == total + 1 and len(chamadas) == 2
+        banco.execute_query("DELETE FROM comandos WHERE nome = %s", ("Comando Cache 3",))
+        invalidate('comandos')
+    print("  ✅ Invalidação do cache OK")
+
+def test_keyset_pagination():
+    """Testar a paginação por chave (data_vencimento, id) da lista de faturas"""
+    print("\n📄 Testando paginação por chave das faturas...")
+    socio_id = _novo_socio(1001)
+    vencimentos = [date(2024, 1, 10), date(2024, 1, 10), date(2024, 2, 10), date(2024, 3, 10),
+                   date(2024, 3, 10), date(2024, 3, 10), date(2023, 12, 10)]
+    banco.execute_many(
+        "INSERT INTO faturas (socio_id, comando_id, plano_id, valor, descricao, data_vencimento, status) "
+        "VALUES (%s, 1, 1, 30, 'Paginação', %s, 'Pendente')",
+        [(socio_id, v) for v in vencimentos]
+    )
+    esperado = [l['id'] for l in banco.execute_query(
+        "SELECT id FROM faturas WHERE socio_id = %s ORDER BY data_vencimento DESC, id DESC", (socio_id,), fetch=True
+    )]
+
+    with banco_global(pages.faturas):
+        pagina = pages.faturas.get_faturas_page.uncached
+        ids, after, paginas = [], None, 0
+        while True:
+            faturas, tem_proxima = pagina(status='Pendente', after=after, page_size=3)
+            ids += [f['id'] for f in faturas if f['socio_id'] == socio_id]
+            paginas += 1
+            if not tem_proxima:
+                break
+            after = (faturas[-1]['data_vencimento'], faturas[-1]['id'])
+        # Filtro por período combinado com a chave
+        marco, _ = pagina(status='Pendente', inicio=date(2024, 3, 1), fim=date(2024, 4, 1), page_size=2)
+        resto, tem_proxima = pagina(status='Pendente', inicio=date(2024, 3, 1), fim=date(2024, 4, 1),
+                                    after=(marco[-1]['data_vencimento'], marco[-1]['id']), page_size=2)
+
+    assert ids == esperado, (ids, esperado)
+    assert paginas == 3
+    assert len(marco) == 2 and len(resto) == 1 and not tem_proxima
+    assert [f['id'] for f in marco + resto] == esperado[:3]
+    banco.execute_query("DELETE FROM faturas WHERE socio_id = %s", (socio_id,))
+    print("  ✅ Paginação por chave OK")
+
+def test_validate_import_chunk():
+    """Testar a validação vetorizada de um bloco da importação de sócios"""
+    print("\n📋 Testando validate_chunk...")
+    comandos = [{'id': 1, 'nome': "Comando Principal"}]
+    planos = [{'id': 1, 'nome': "Bronze", 'periodicidade': "Mensal"}]
+    linha = {'nome_completo': "Ana", 'cpf': _cpf(123456789), 'data_nascimento': "15/03/1990",
+             'email': "ANA@teste.com ", 'telefone': "(11) 98888-7777", 'comando': "comando principal",
+             'plano': "bronze", 'cep': ""}
+    df = pd.DataFrame([
+        linha,
+        {**linha, 'cpf': "111.111.111-11", 'email': "b@teste.com"},
+        {**linha, 'cpf': _cpf(223456789), 'email': "ana@teste.com"},
+        {**linha, 'cpf': _cpf(323456789), 'email': "c@teste.com", 'comando': "Outro"},
+        {**linha, 'cpf': _cpf(423456789), 'email': "d@teste.com", 'cep': "123"},
+        {**linha, 'cpf': _cpf(23456789)[1:], 'email': "e@teste.com", 'cep': "1310-100", 'data_nascimento': "1990-03-15",
+         'plano': "", 'comando': "1"},
+        {**linha, 'cpf': _cpf(523456789), 'email': "f@teste.com", 'data_nascimento': "31/02/1990"},
+    ])
+    validas, erros = validate_chunk(df, comandos, planos, first_line=2)
+    assert sorted(erros) == [(3, "CPF inválido"), (4, "E-mail repetido no arquivo"), (5, "Comando não encontrado"),
+                     (6, "CEP inválido"), (8, "Data de nascimento inválida")], erros
+    assert list(validas.index) == [2, 7]
+    ana, zero = validas.loc[2], validas.loc[7]
+    assert ana['email'] == "ana@teste.com" and ana['telefone'] == "11988887777" and ana['plano_id'] == 1
+    assert ana['data_nascimento'] == date(1990, 3, 15) and ana['data_vencimento_plano'] is not None
+    # Zeros à esquerda perdidos pela planilha voltam no CPF e no CEP
+    assert zero['cpf'] == _cpf(23456789) and zero['cpf'].startswith('0') and zero['cep'] == "01310100"
+    assert pd.isna(zero['plano_id']) and zero['comando_id'] == 1
+    print("  ✅ validate_chunk OK")
+
+def test_import_socios():
+    """Testar a importação de sócios de CSV e XLSX (CPF e CEP numéricos do Excel)"""
+    print("\n📥 Testando import_socios...")
+    existente = _novo_socio(5001, cpf=_cpf(500100100))
+    csv = (
+        "Nome;CPF;Data de Nascimento;E-mail;Celular;Comando;Plano\n"
+        f"Carlos;{_cpf(600100100)};01/02/1985;carlos@teste.com;11977776666;Comando Principal;Prata\n"
+        f"Repetido;{_cpf(500100100)};01/02/1985;repetido@teste.com;11977776666;1;\n"
+        "Inválido;123;01/02/1985;invalido@teste.com;11977776666;1;\n"
+    ).encode('utf-8-sig')
+    with banco_global(utils.socios_import):
+        resultado = import_socios(io.BytesIO(csv), "socios.csv", batch_size=2)
+    assert resultado['total'] == 3 and resultado['importados'] == 1
+    assert resultado['erros'] == [(3, "CPF ou e-mail já cadastrado"), (4, "CPF inválido")]
+    carlos = banco.execute_query_one("SELECT * FROM socios WHERE cpf = %s", (_cpf(600100100),))
+    assert carlos['plano_id'] == 2 and carlos['data_vencimento_plano'] is not None
+
+    from openpyxl import Workbook
+    workbook = Workbook()
+    planilha = workbook.active
+    planilha.append(["Nome Completo", "CPF", "Nascimento", "Email", "Telefone", "Comando", "CEP", "UF"])
+    # Como o Excel grava: CPF, CEP e telefone como número, data como data
+    cpf_inteiro, cpf_float = _cpf(23456789), _cpf(34567890)
+    planilha.append(["Zé", int(cpf_inteiro), datetime(1990, 5, 1), "ze@teste.com", 11966665555, 1, 1310100, "sp"])
+    planilha.append(["Bia", float(cpf_float), datetime(1991, 6, 2), "bia@teste.com", 11955554444, 1, None, None])
+    arquivo = io.BytesIO()
+    workbook.save(arquivo)
+    arquivo.seek(0)
+    with banco_global(utils.socios_import):
+        resultado = import_socios(arquivo, "socios.xlsx")
+    assert resultado['importados'] == 2 and not resultado['erros'], resultado['erros']
+    ze = banco.execute_query_one("SELECT * FROM socios WHERE email = %s", ("ze@teste.com",))
+    assert ze['cpf'] == cpf_inteiro and ze['cep'] == "01310100" and ze['estado'] == "SP"
+    assert ze['data_nascimento'] == date(1990, 5, 1) and ze['telefone'] == "11966665555"
+    bia = banco.execute_query_one("SELECT * FROM socios WHERE email = %s", ("bia@teste.com",))
+    assert bia['cpf'] == cpf_float and bia['cep'] is None
+
+    banco.execute_query("DELETE FROM socios WHERE id = %s OR email IN (%s, %s, %s)",
+                        (existente, "carlos@teste.com", "ze@teste.com", "bia@teste.com"))
+    print("  ✅ import_socios OK")
+
+def test_gerar_faturas():
+    """Testar a geração recorrente de faturas (duas instruções numa transação, sem writable CTE)"""
+    print("\n🧾 Testando gerar_faturas...")
+    trimestral = banco.execute_returning(
+        "INSERT INTO planos (nome, valor, periodicidade) VALUES ('Trimestral Teste', 90, 'Trimestral') RETURNING id")['id']
+    inativo = banco.execute_returning(
+        "INSERT INTO planos (nome, valor, periodicidade, ativo) VALUES ('Inativo Teste', 10, 'Mensal', FALSE) RETURNING id")['id']
+    mensal = _novo_socio(6001, plano_id=1, data_vencimento_plano=date(2024, 1, 31))
+    trimestre = _novo_socio(6002, plano_id=trimestral, data_vencimento_plano=date(2024, 2, 15))
+    ja_faturado = _novo_socio(6003, plano_id=1, data_vencimento_plano=date(2024, 3, 1))
+    ids = [mensal, trimestre, ja_faturado,
+           _novo_socio(6004, comando_id=None, data_vencimento_plano=date(2024, 1, 1)),  # Sem comando
+           _novo_socio(6005, plano_id=inativo, data_vencimento_plano=date(2024, 1, 1)),  # Plano inativo
+           _novo_socio(6006, plano_id=1, data_vencimento_plano=date(2024, 4, 1))]  # Depois da data limite
+    # Fatura do período já existente (ex.: lançada à mão): não duplica, mas o plano avança
+    banco.execute_query("INSERT INTO faturas (socio_id, comando_id, valor, data_vencimento, periodo) VALUES (%s, 1, 30, %s, %s)",
+                        (ja_faturado, date(2024, 3, 1), date(2024, 3, 1)))
+
+    def faturas_de(socio_id):
+        return [(f['periodo'], f['data_renovacao'], f['descricao'], f['valor'], f['status'])
+                for f in banco.execute_query("SELECT * FROM faturas WHERE socio_id = %s ORDER BY periodo", (socio_id,), fetch=True)]
+
+    def vencimento(socio_id):
+        return banco.execute_query_one("SELECT data_vencimento_plano FROM socios WHERE id = %s", (socio_id,))['data_vencimento_plano']
+
+    with banco_global(utils.faturamento):
+        assert get_sql_dialect().writable_cte is False
+
+        # Falha no UPDATE desfaz o INSERT do mesmo ciclo
+        banco._conexao().execute(
+            "CREATE TEMP TRIGGER falhar_renovacao BEFORE UPDATE OF data_vencimento_plano ON socios "
+            "BEGIN SELECT RAISE(ABORT, 'falha simulada'); END")
+        try:
+            gerar_faturas(ate=date(2024, 3, 5))
+            raise AssertionError("a falha do UPDATE não foi propagada")
+        except Exception as e:
+            assert 'falha simulada' in str(e)
+        finally:
+            banco._conexao().execute("DROP TRIGGER falhar_renovacao")
+        assert faturas_de(mensal) == [] and vencimento(mensal) == date(2024, 1, 31)
+
+        resultado = gerar_faturas(ate=date(2024, 3, 5))
+        # Ciclos: 31/01 (mensal, trimestre, já faturado ainda não), 29/02 (mensal), 01/03 (já faturado)
+        assert resultado == {'geradas': 3, 'renovados': 4, 'ciclos': 2}, resultado
+        assert gerar_faturas(ate=date(2024, 3, 5)) == {'geradas': 0, 'renovados': 0, 'ciclos': 0}
+        assert all(faturas_de(i) == [] for i in ids[3:])
+        assert vencimento(ids[3]) == date(2024, 1, 1) and vencimento(ids[5]) == date(2024, 4, 1)
+        # Sócios muito atrasados avançam no máximo max_ciclos por execução
+        assert gerar_faturas(ate=date(2024, 12, 31), max_ciclos=1)['ciclos'] == 1
+
+    # Meses de calendário: 31/01 + 1 mês = 29/02 (ano bissexto), não 30 dias
+    assert faturas_de(mensal)[:2] == [
+        (date(2024, 1, 31), date(2024, 2, 29), "Plano Bronze - 31/01/2024", 30, 'Pendente'),
+        (date(2024, 2, 29), date(2024, 3, 29), "Plano Bronze - 29/02/2024", 30, 'Pendente'),
+    ], faturas_de(mensal)
+    assert faturas_de(trimestre)[0] == (date(2024, 2, 15), date(2024, 5, 15), "Plano Trimestral Teste - 15/02/2024", 90, 'Pendente')
+    assert len(faturas_de(ja_faturado)) == 2 and vencimento(ja_faturado) == date(2024, 5, 1)
+    assert all(faturas_de(i) == [] for i in ids[3:5])
+
+    banco.execute_query(f"DELETE FROM faturas WHERE socio_id IN ({', '.join(['%s'] * len(ids))})", ids)
+    banco.execute_query(f"DELETE FROM socios WHERE id IN ({', '.join(['%s'] * len(ids))})", ids)
+    banco.execute_query("DELETE FROM planos WHERE id IN (%s, %s)", (trimestral, inativo))
+    print("  ✅ gerar_faturas OK")
+
+def test_marcar_atrasadas():
+    """Testar a marcação de atrasadas em lotes e a execução em segundo plano"""
+    print("\n⏰ Testando marcar_atrasadas...")
+    socio_id = _novo_socio(6101)
+    hoje = date.today()
+    casos = [('Pendente', hoje - timedelta(days=d)) for d in (1, 2, 3, 40, 400)] + [
+        ('Pendente', hoje), ('Pendente', hoje + timedelta(days=5)),  # Ainda não venceram
+        ('Pago', hoje - timedelta(days=10)), ('Atrasado', hoje - timedelta(days=90))]
+    for status, vencimento in casos:
+        banco.execute_query("INSERT INTO faturas (socio_id, comando_id, valor, data_vencimento, status) VALUES (%s, 1, 30, %s, %s)",
+                            (socio_id, vencimento, status))
+
+    def por_status():
+        return {f['data_vencimento']: (f['status'], f['atrasado_em'] is not None) for f in banco.execute_query(
+            "SELECT data_vencimento, status, atrasado_em FROM faturas WHERE socio_id = %s", (socio_id,), fetch=True)}
+
+    with banco_global(utils.faturamento):
+        # Lotes de 2: as 5 vencidas mudam em três UPDATEs
+        assert marcar_atrasadas(lote=2) == 5
+        assert marcar_atrasadas(lote=2) == 0
+    status = por_status()
+    assert all(status[hoje - timedelta(days=d)] == ('Atrasado', True) for d in (1, 2, 3, 40, 400)), status
+    assert status[hoje] == ('Pendente', False) and status[hoje + timedelta(days=5)] == ('Pendente', False)
+    assert status[hoje - timedelta(days=10)] == ('Pago', False)
+    assert status[hoje - timedelta(days=90)] == ('Atrasado', False)  # Já atrasada: não é reescrita
+
+    # As páginas só pedem a verificação: a ação roda numa thread à parte, no máximo uma vez por intervalo
+    execucoes = []
+    concluida = threading.Event()
+
+    def acao():
+        execucoes.append(threading.current_thread().name)
+        concluida.set()
+
+    verificador = AtualizacaoAgendada(acao, intervalo=60, nome="teste-atrasadas")
+    verificador.request()
+    assert concluida.wait(5)
+    verificador.request()
+    verificador.request()
+    assert execucoes == ["teste-atrasadas"]  # Os novos pedidos esperam o intervalo
+
+    banco.execute_query("DELETE FROM faturas WHERE socio_id = %s", (socio_id,))
+    banco.execute_query("DELETE FROM socios WHERE id = %s", (socio_id,))
+    print("  ✅ marcar_atrasadas OK")
+
+def test_photo_variants():
+    """Testar as variantes pré-dimensionadas das fotos"""
+    print("\n🖼️ Testando variantes das fotos...")
+    with pasta_fotos() as pasta:
+        caminho, erro = store_photo(_imagem(1600, 1000))
+        assert erro is None and caminho.startswith(pasta)
+        # O principal é limitado a 800px; as menores são geradas no upload
+        assert _dimensoes(caminho) == (800, 500)
+        assert _dimensoes(variant_path(caminho, 150)) == (150, 94)
+        assert _dimensoes(variant_path(caminho, 60)) == (60, 38)
+        assert not [n for _, _, nomes in os.walk(pasta) for n in nomes if n.endswith('.tmp')]
+
+        # A menor variante que cobre a largura, lida do disco sem decodificar
+        assert get_photo_variant(caminho, 50) == variant_path(caminho, 60)
+        assert get_photo_variant(caminho, 100) == variant_path(caminho, 150)
+        assert get_photo_variant(caminho, 2000) == caminho
+        with open(variant_path(caminho, 60), 'rb') as f:
+            assert read_photo_bytes(caminho, 60) == f.read()
+        assert get_photo_data_uri(caminho).startswith("data:image/jpeg;base64,/9j/")
+
+        # Foto pequena: as variantes maiores são o próprio arquivo
+        pequena, _ = store_photo(_imagem(100, 80, cor=(0, 0, 255)))
+        with open(pequena, 'rb') as f:
+            original = f.read()
+        assert read_photo_bytes(pequena, 150) == original and _dimensoes(variant_path(pequena, 60)) == (60, 48)
+
+        # Foto antiga, sem variantes: geradas na primeira leitura e guardadas
+        antiga = os.path.join(pasta, "socio_antigo.jpg")
+        with open(antiga, 'wb') as f:
+            f.write(_imagem(400, 400, formato='JPEG'))
+        assert get_photo_variant(antiga, 60) == variant_path(antiga, 60)
+        assert _dimensoes(variant_path(antiga, 60)) == (60, 60) and os.path.exists(variant_path(antiga, 150))
+
+        assert get_photo_variant(os.path.join(pasta, "inexistente.jpg"), 60) is None
+        assert store_photo(b"nao e imagem")[0] is None
+    print("  ✅ Variantes das fotos OK")
+
+def test_photo_store_and_gc():
+    """Testar o armazenamento por conteúdo, a troca da foto e a coleta de órfãs"""
+    print("\n📸 Testando armazenamento e coleta das fotos...")
+
+    def envelhecer(caminho, segundos=2 * 60 * 60):
+        for tamanho in utils.photo_manager.PHOTO_SIZES:
+            momento = time.time() - segundos
+            os.utime(variant_path(caminho, tamanho), (momento, momento))
+
+    def existe(caminho):
+        return all(os.path.exists(variant_path(caminho, t)) for t in utils.photo_manager.PHOTO_SIZES)
+
+    def foto_de(socio_id):
+        return banco.execute_query_one("SELECT foto FROM socios WHERE id = %s", (socio_id,))['foto']
+
+    ids = [_novo_socio(6201), _novo_socio(6202)]
+    cpf, outro_cpf = f"{6201:011d}", f"{6202:011d}"
+    vermelha, azul, verde = _imagem(300, 300), _imagem(300, 300, cor=(0, 0, 255)), _imagem(300, 300, cor=(0, 160, 0))
+    with pasta_fotos() as pasta, banco_global(utils.photo_manager):
+        # Mesmo conteúdo, mesmo arquivo: gravado uma vez e com a data renovada
+        primeira, _ = store_photo(vermelha)
+        envelhecer(primeira)
+        assert store_photo(vermelha)[0] == primeira
+        assert time.time() - os.path.getmtime(primeira) < 60
+        assert os.path.relpath(primeira, pasta).count(os.sep) == 2  # ab/cd/<sha256>.jpg
+
+        assert utils.photo_manager._process_socio_photo(vermelha, cpf) == primeira
+        assert utils.photo_manager._process_socio_photo(vermelha, outro_cpf) == primeira
+        assert foto_de(ids[0]) == foto_de(ids[1]) == primeira
+
+        # Trocada num sócio, ainda usada pelo outro: fica
+        envelhecer(primeira)
+        segunda = utils.photo_manager._process_socio_photo(azul, cpf)
+        assert foto_de(ids[0]) == segunda and existe(primeira)
+        # Trocada no último sócio que a usava: apagada com as variantes
+        assert utils.photo_manager._process_socio_photo(azul, outro_cpf) == segunda
+        assert not any(os.path.exists(variant_path(primeira, t)) for t in utils.photo_manager.PHOTO_SIZES)
+
+        # Foto gravada há menos de GC_GRACE_SECONDS: a troca não apaga, só a varredura
+        terceira = utils.photo_manager._process_socio_photo(verde, outro_cpf)
+        assert utils.photo_manager._process_socio_photo(verde, cpf) == terceira
+        assert existe(segunda) and not release_photo(segunda)
+        assert collect_orphan_photos() == 0
+        temporario = os.path.join(pasta, "perdido.jpg.tmp")
+        with open(temporario, 'wb') as f:
+            f.write(b"x")
+        assert collect_orphan_photos(grace_seconds=0) == 1
+        assert not existe(segunda) and existe(terceira) and not os.path.exists(temporario)
+        assert not release_photo(terceira)  # Referenciada
+
+        # Sócio inexistente: nada é alterado
+        sem_socio = utils.photo_manager._process_socio_photo(vermelha, "99999999999")
+        assert existe(sem_socio)  # Órfã até a próxima varredura
+        assert foto_de(ids[0]) == foto_de(ids[1]) == terceira
+
+        # Uploads simultâneos do mesmo sócio: a foto final fica, todas as trocadas saem
+        # (banco em arquivo: no em memória compartilhado os escritores recebem "table is locked" sem esperar)
+        pasta_banco = tempfile.mkdtemp(prefix="fotos_db_")
+        arquivo = Database(os.path.join(pasta_banco, "fotos.db"))
+        socio_arquivo = arquivo.execute_returning(
+            "INSERT INTO socios (nome_completo, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, plano_id, foto) "
+            "VALUES ('Sócio Fotos', %s, '1990-01-01', 'fotos@teste.com', '11999999999', 'M', 1, 1, %s) RETURNING id",
+            (cpf, terceira))['id']
+        anterior = utils.photo_manager.GC_GRACE_SECONDS, utils.photo_manager.db
+        utils.photo_manager.GC_GRACE_SECONDS, utils.photo_manager.db = 0, arquivo
+        try:
+            imagens = [_imagem(200, 200, cor=(i * 40, 0, 0)) for i in range(6)]
+            threads = [threading.Thread(target=utils.photo_manager._process_socio_photo, args=(imagem, cpf)) for imagem in imagens]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            final = arquivo.execute_query_one("SELECT foto FROM socios WHERE id = %s", (socio_arquivo,))['foto']
+        finally:
+            utils.photo_manager.GC_GRACE_SECONDS, utils.photo_manager.db = anterior
+            arquivo.disconnect()
+            shutil.rmtree(pasta_banco, ignore_errors=True)
+        restantes = {os.path.join(p, n) for p, _, nomes in os.walk(pasta) for n in nomes}
+        assert restantes == {variant_path(f, t) for f in (final, sem_socio) for t in utils.photo_manager.PHOTO_SIZES}, restantes
+    banco.execute_query("DELETE FROM socios WHERE id IN (%s, %s)", ids)
+    print("  ✅ Armazenamento e coleta das fotos OK")
+
+def test_prepared_statements():
+    """Testar as consultas registradas: PREPARE por conexão no PostgreSQL e execução no SQLite"""
+    print("\n📌 Testando consultas registradas...")
+    assert to_positional("SELECT id FROM socios WHERE cpf = %s AND id != %s") == \
+        "SELECT id FROM socios WHERE cpf = $1 AND id != $2"
+
+    # SQLite: mesma API, sem PREPARE explícito; estatísticas por nome
+    antes = {s['nome']: s['chamadas'] for s in banco.prepared_stats()}.get('plano_por_id', 0)
+    assert banco.execute_prepared_one('plano_por_id', (1,))['nome'] == 'Bronze'
+    assert [c['nome'] for c in banco.execute_prepared('comando_por_id', (1,))] == ['Comando Principal']
+    assert banco.execute_prepared_one('plano_por_id', (999,)) is None
+    assert {s['nome']: s['chamadas'] for s in banco.prepared_stats()}['plano_por_id'] == antes + 2
+    assert banco.execute_prepared('nao_registrada') is None  # Erro tratado como nas outras consultas
+
+    pg = _postgres()
+    if pg is None:
+        return
+    conn = _ConexaoFalsa()
+
+    @contextmanager
+    def connection():
+        yield conn
+    pg.connection = connection
+
+    # PREPARE uma vez por conexão; se a sessão perdeu a consulta, prepara de novo
+    pg.execute_prepared_one('plano_por_id', (1,))
+    pg.execute_prepared_one('plano_por_id', (1,))
+    conn.perder_preparadas = True
+    pg.execute_prepared_one('plano_por_id', (1,))
+    assert conn.executadas == [
+        "PREPARE plano_por_id AS SELECT * FROM planos WHERE id = $1",
+        "EXECUTE plano_por_id", "EXECUTE plano_por_id",
+        "EXECUTE plano_por_id", "PREPARE plano_por_id AS SELECT * FROM planos WHERE id = $1", "EXECUTE plano_por_id",
+    ], conn.executadas
+    assert pg.prepared_stats()[0]['nome'] == 'plano_por_id' and pg.prepared_stats()[0]['chamadas'] == 3
+
+    # O estado é da conexão: some ao descartá-la ou quando ela deixa de existir
+    pg._ultimo_uso[conn] = 1.0
+    pg._esquecer(conn)
+    assert conn not in pg._preparadas and conn not in pg._ultimo_uso
+    outra = _ConexaoFalsa()
+    pg._ultimo_uso[outra] = 1.0
+    pg._preparadas[outra] = {'plano_por_id'}
+    del outra
+    gc.collect()
+    assert len(pg._ultimo_uso) == 0 and len(pg._preparadas) == 0
+    print("  ✅ Consultas registradas OK")
+
+def test_comando_report():
+    """Testar o relatório por comando: meses completos (faturas_monthly) e intervalos quaisquer (faturas)"""
+    print("\n📑 Testando relatório por comando...")
+    assert is_month_aligned(date(2024, 1, 1), date(2024, 3, 1)) and is_month_aligned(None, None)
+    assert not is_month_aligned(date(2024, 1, 15), None)
+    assert period_range("Este mês", hoje=date(2024, 12, 20)) == (date(2024, 12, 1), date(2025, 1, 1))
+    assert period_range("Últimos 3 meses", hoje=date(2024, 5, 31)) == (date(2024, 2, 29), None)
+
+    comando = banco.execute_returning("INSERT INTO comandos (nome) VALUES ('Comando Relatório') RETURNING id")['id']
+    socios = [_novo_socio(6301), _novo_socio(6302, comando_id=comando)]
+    faturas = [
+        (socios[0], 1, 30, date(2024, 1, 10), 'Pago'),
+        (socios[0], 1, 30, date(2024, 1, 31), 'Atrasado'),
+        (socios[0], 1, 30, date(2024, 2, 10), 'Pendente'),
+        (socios[0], 1, 30, date(2024, 3, 1), 'Pago'),  # Fora de jan-fev
+        (socios[1], comando, 50, date(2024, 1, 20), 'Pago'),
+        (socios[1], comando, 50, date(2024, 2, 25), 'Pago'),
+    ]
+    banco.execute_many("INSERT INTO faturas (socio_id, comando_id, valor, data_vencimento, status) VALUES (%s, %s, %s, %s, %s)", faturas)
+
+    def relatorio(*args, **kwargs):
+        banco.reset_query_stats()
+        resultado = get_comando_report.uncached(*args, **kwargs)
+        consultas = " ".join(c['consulta'] for c in banco.query_stats())
+        origem = 'faturas_monthly' if 'faturas_monthly' in consultas else 'faturas'
+        linhas = {r['comando_id']: (r['total_faturas'], float(r['valor_total']), r['faturas_pagas'],
+                                    float(r['valor_pago']), r['faturas_atrasadas'])
+                  for r in resultado.to_dict('records') if r['comando_id'] in (1, comando)}
+        return origem, linhas, list(resultado['comando_id'])
+
+    def esperado(inicio, fim, comando_id):
+        selecionadas = [f for f in faturas if f[1] == comando_id and inicio <= f[3] < fim]
+        return (len(selecionadas), float(sum(f[2] for f in selecionadas)),
+                sum(f[4] == 'Pago' for f in selecionadas), float(sum(f[2] for f in selecionadas if f[4] == 'Pago')),
+                sum(f[4] == 'Atrasado' for f in selecionadas))
+
+    with banco_global(utils.relatorios):
+        # Meses completos: totais mensais mantidos pelos gatilhos
+        origem, linhas, ordem = relatorio(date(2024, 1, 1), date(2024, 3, 1))
+        assert origem == 'faturas_monthly'
+        assert linhas == {1: esperado(date(2024, 1, 1), date(2024, 3, 1), 1),
+                          comando: esperado(date(2024, 1, 1), date(2024, 3, 1), comando)}, linhas
+        assert ordem.index(comando) < ordem.index(1)  # Maior valor primeiro
+
+        # Intervalo que corta meses: lido de faturas, com as pontas exatas
+        origem, linhas, _ = relatorio(date(2024, 1, 15), date(2024, 2, 20))
+        assert origem == 'faturas'
+        assert linhas == {1: esperado(date(2024, 1, 15), date(2024, 2, 20), 1),
+                          comando: esperado(date(2024, 1, 15), date(2024, 2, 20), comando)}, linhas
+        assert linhas[comando] == (1, 50.0, 1, 50.0, 0)
+
+        # Filtro por comando; comando sem faturas no intervalo aparece zerado
+        _, linhas, ordem = relatorio(date(2024, 1, 1), date(2024, 2, 1), comando_id=comando)
+        assert ordem == [comando] and linhas[comando] == (1, 50.0, 1, 50.0, 0)
+        _, linhas, _ = relatorio(date(2023, 1, 1), date(2023, 2, 1), comando_id=comando)
+        assert linhas[comando] == (0, 0.0, 0, 0.0, 0)
+
+    banco.execute_query("DELETE FROM faturas WHERE socio_id IN (%s, %s)", socios)
+    banco.execute_query("DELETE FROM socios WHERE id IN (%s, %s)", socios)
+    banco.execute_query("DELETE FROM comandos WHERE id = %s", (comando,))
+    print("  ✅ Relatório por comando OK")
+
+def test_rollup_triggers():
+    """Testar se os gatilhos mantêm faturas_monthly igual à agregação de faturas"""
+    print("\n📊 Testando gatilhos de faturas_monthly...")
+    socio_id = _novo_socio(3001, plano_id=2)
+    banco.execute_many(
+        "INSERT INTO faturas (socio_id, comando_id, plano_id, valor, descricao, data_vencimento, data_pagamento, "
+        "status, forma_pagamento) VALUES (%s, 1, %s, %s, 'Rollup', %s, %s, %s, %s)",
+        [
+            (socio_id, 2, 50.10, date(2024, 1, 10), None, 'Pendente', None),
+            (socio_id, 2, 50.10, date(2024, 1, 20), date(2024, 2, 5), 'Pago', 'PIX'),
+            (socio_id, 2, 50.10, date(2024, 2, 10), None, 'Atrasado', None),
+            (socio_id, None, 19.99, date(2024, 2, 28), date(2024, 2, 28), 'Pago', 'Dinheiro'),
+            (socio_id, 2, 50.10, date(2024, 3, 10), None, 'Pendente', None),
+        ]
+    )
+    # Pagar, mudar de mês e de forma de pagamento, excluir
+    ids = [l['id'] for l in banco.execute_query("SELECT id FROM faturas WHERE socio_id = %s ORDER BY id", (socio_id,), fetch=True)]
+    banco.execute_query("UPDATE faturas SET status = 'Pago', data_pagamento = %s, forma_pagamento = 'PIX' WHERE id = %s",
+                        (date(2024, 3, 1), ids[2]))
+    banco.execute_query("UPDATE faturas SET data_vencimento = %s, valor = 45.50 WHERE id = %s", (date(2024, 4, 10), ids[0]))
+    banco.execute_query("DELETE FROM faturas WHERE id = %s", (ids[4],))
+
+    colunas = "mes, comando_id, plano_id, forma_pagamento"
+    medidas = ["faturas", "valor", "pagas", "valor_pago", "atrasadas", "valor_atrasado", "recebidas", "valor_recebido"]
+    agregado = f"""
+        SELECT {colunas}, SUM(faturas) AS faturas, ROUND(SUM(valor), 2) AS valor, SUM(pagas) AS pagas,
+               ROUND(SUM(valor_pago), 2) AS valor_pago, SUM(atrasadas) AS atrasadas,
+               ROUND(SUM(valor_atrasado), 2) AS valor_atrasado, SUM(recebidas) AS recebidas,
+               ROUND(SUM(valor_recebido), 2) AS valor_recebido
+        FROM (
+            SELECT date(data_vencimento, 'start of month') AS mes, comando_id, COALESCE(plano_id, 0) AS plano_id,
+                   COALESCE(forma_pagamento, '') AS forma_pagamento, 1 AS faturas, valor,
+                   status = 'Pago' AS pagas, CASE WHEN status = 'Pago' THEN valor ELSE 0 END AS valor_pago,
+                   status = 'Atrasado' AS atrasadas, CASE WHEN status = 'Atrasado' THEN valor ELSE 0 END AS valor_atrasado,
+                   0 AS recebidas, 0 AS valor_recebido
+            FROM faturas
+            UNION ALL
+            SELECT date(data_pagamento, 'start of month'), comando_id, COALESCE(plano_id, 0),
+                   COALESCE(forma_pagamento, ''), 0, 0, 0, 0, 0, 0, 1, valor
+            FROM faturas WHERE status = 'Pago' AND data_pagamento IS NOT NULL
+        ) t
+        GROUP BY {colunas}
+    """
+
+    def linhas(query):
+        resultado = {}
+        for l in banco.execute_query(query, fetch=True):
+            valores = tuple(round(float(l[m]), 2) for m in medidas)
+            if any(valores):  # Linhas zeradas podem ficar em faturas_monthly
+                resultado[(str(l['mes'])[:10], l['comando_id'], l['plano_id'], l['forma_pagamento'])] = valores
+        return resultado
+
+    esperado = linhas(agregado)
+    obtido = linhas(f"SELECT {colunas}, {', '.join(medidas)} FROM faturas_monthly")
+    assert obtido == esperado, (obtido, esperado)
+    assert esperado[('2024-03-01', 1, 2, 'PIX')][6:] == (1, 50.1)  # Recebida em março
+    banco.execute_query("DELETE FROM faturas WHERE socio_id = %s", (socio_id,))
+    assert linhas(f"SELECT {colunas}, {', '.join(medidas)} FROM faturas_monthly") == linhas(agregado)
+    print("  ✅ Gatilhos de faturas_monthly OK")
+
+def test_export():
+    """Testar a exportação em blocos (CSV, XLSX e Parquet), o limite de tamanho e os arquivos do download"""
+    print("\n📤 Testando exportação...")
+    import pyarrow.parquet as pq
+    from openpyxl import load_workbook
+
+    socio_id = _novo_socio(6401, cpf="12345678901", telefone="11987654321")
+    banco.execute_many(
+        "INSERT INTO faturas (socio_id, comando_id, valor, descricao, data_vencimento, status) VALUES (%s, 1, %s, 'Exportação', %s, %s)",
+        [(socio_id, 30 + i, date(2024, 1, 1 + i), 'Pago' if i % 2 else 'Pendente') for i in range(7)])
+
+    with banco_global(utils.exportacao):
+        # CSV em blocos de 3: todas as linhas, na ordem da listagem, com as máscaras aplicadas no SQL
+        progresso = []
+        arquivo, total = export_to_file('faturas', 'csv', date(2024, 1, 1), date(2024, 2, 1), chunk_size=3,
+                                        on_progress=progresso.append)
+        with arquivo:
+            linhas = arquivo.read().decode('utf-8-sig').splitlines()
+        assert total == 7 and progresso == [3, 6, 7]
+        assert linhas[0].split(';')[:3] == ["ID", "Sócio", "CPF"] and len(linhas) == 8
+        assert linhas[1].split(';')[2] == "123.456.789-01" and linhas[1].split(';')[6] == "07/01/2024"
+
+        # Filtros: status e período semiaberto
+        arquivo, total = export_to_file('faturas', 'csv', date(2024, 1, 3), date(2024, 1, 6), status='Pago')
+        arquivo.close()
+        assert total == 1  # Pagas nos dias 2, 4 e 6: o 2 é antes do início e o fim (dia 6) é exclusivo
+
+        # Parquet com tipos fixos e XLSX em modo write_only
+        arquivo, total = export_to_file('faturas', 'parquet', date(2024, 1, 1), date(2024, 2, 1), chunk_size=2)
+        with arquivo:
+            tabela = pq.read_table(arquivo)
+        assert total == 7 and tabela.num_rows == 7
+        assert str(tabela.schema.field("ID").type) == "int64" and str(tabela.schema.field("Valor").type) == "double"
+        assert sorted(tabela.column("Valor").to_pylist()) == [30.0 + i for i in range(7)]
+        arquivo, total = export_to_file('socios', 'xlsx', comando_id=1)
+        with arquivo:
+            planilha = load_workbook(arquivo, read_only=True).active
+            linhas = list(planilha.iter_rows(values_only=True))
+        assert linhas[0][:3] == ("ID", "Nome", "CPF") and len(linhas) == total + 1
+        assert ("123.456.789-01", "(11) 98765-4321") in {(l[2], l[4]) for l in linhas[1:]}
+
+        # Arquivo maior que o limite: para no bloco que passou e fecha o temporário
+        tamanho = []
+        try:
+            export_to_file('faturas', 'csv', chunk_size=1, max_mb=0.0002, on_progress=tamanho.append)
+            raise AssertionError("o limite de tamanho não foi aplicado")
+        except ExportacaoGrande as e:
+            assert "0.0002 MB" in str(e)
+        assert tamanho and tamanho[-1] < 7
+        try:
+            export_to_file('faturas', 'json')
+            raise AssertionError("formato inválido aceito")
+        except ValueError:
+            pass
+
+        # Download: arquivo no disco, numa pasta aleatória servida em app/static/exportacoes
+        anterior = utils.exportacao.EXPORT_DIR
+        utils.exportacao.EXPORT_DIR = tempfile.mkdtemp(prefix="exportacoes_")
+        try:
+            caminho, url, total = export_for_download('faturas', 'parquet', date(2024, 1, 1), date(2024, 2, 1))
+            pasta = os.path.basename(os.path.dirname(caminho))
+            assert total == 7 and len(pasta) >= 32 and os.path.getsize(caminho) > 0
+            assert url == f"app/static/exportacoes/{pasta}/{os.path.basename(caminho)}" and url.endswith(".parquet")
+            segundo, _, _ = export_for_download('faturas', 'csv')
+            assert os.path.dirname(segundo) != os.path.dirname(caminho)
+            try:
+                export_for_download('faturas', 'csv', max_mb=0.0001)
+                raise AssertionError("o limite de tamanho não foi aplicado")
+            except ExportacaoGrande:
+                pass
+            # O arquivo incompleto não fica para trás; os antigos expiram
+            assert len(os.listdir(utils.exportacao.EXPORT_DIR)) == 2
+            antigo = time.time() - 2 * utils.exportacao.EXPORT_TTL_SECONDS
+            os.utime(os.path.dirname(caminho), (antigo, antigo))
+            assert remove_old_exports() == 1 and not os.path.exists(caminho) and os.path.exists(segundo)
+        finally:
+            shutil.rmtree(utils.exportacao.EXPORT_DIR, ignore_errors=True)
+            utils.exportacao.EXPORT_DIR = anterior
+
+    banco.execute_query("DELETE FROM faturas WHERE socio_id = %s", (socio_id,))
+    banco.execute_query("DELETE FROM socios WHERE id = %s", (socio_id,))
+    print("  ✅ Exportação OK")
+
+def test_sqlite_translation():
+    """Testar a tradução das consultas do PostgreSQL para o SQLite"""
+    print("\n🔤 Testando tradução de consultas...")
+    assert translate("SELECT * FROM socios WHERE id = %s AND email = %(email)s") == \
+        "SELECT * FROM socios WHERE id = ? AND email = :email"
+    assert translate("SELECT * FROM socios WHERE nome_completo ILIKE %s") == \
+        "SELECT * FROM socios WHERE nome_completo LIKE ?"
+    assert translate("SELECT %s::date, created_at::timestamp FROM faturas FOR UPDATE SKIP LOCKED") == \
+        "SELECT ?, created_at FROM faturas "
+    assert translate("SELECT CURRENT_DATE") == "SELECT (date('now', 'localtime'))"
+    # Com parâmetros %% vira %; sem parâmetros o % é literal
+    assert translate("SELECT * FROM socios WHERE nome_completo LIKE 'A%%' AND id = %s") == \
+        "SELECT * FROM socios WHERE nome_completo LIKE 'A%' AND id = ?"
+    assert translate("SELECT 'a%%'", com_params=False) == "SELECT 'a%%'"
+    # Literais e comentários não são alterados
+    assert translate("SELECT 'x::int ILIKE' -- ::date CURRENT_DATE") == "SELECT 'x::int ILIKE' -- ::date CURRENT_DATE"
+    assert split_statements("CREATE TABLE t (x TEXT DEFAULT ';'); -- fim\n INSERT INTO t VALUES ('a;b');") == \
+        ["CREATE TABLE t (x TEXT DEFAULT ';')", "-- fim\n INSERT INTO t VALUES ('a;b')"]
+
+    # REFRESH MATERIALIZED VIEW não existe no SQLite: vira uma instrução vazia
+    assert banco.execute_query("REFRESH MATERIALIZED VIEW CONCURRENTLY dashboard_resumo")
+    linha = banco.execute_query_one("SELECT COUNT(*) AS total FROM planos WHERE nome ILIKE %s", ("bronze",))
+    assert linha['total'] == 1
+    print("  ✅ Tradução OK")
+
+def test_sqlite_connections_and_prepared():
+    """Testar conexão por thread e consultas registradas (execute_prepared) no SQLite"""
+    print("\n🔌 Testando conexões por thread e consultas registradas...")
+    assert banco.connect()
+    antes = {s['nome']: s['chamadas'] for s in banco.prepared_stats()}.get('plano_por_id', 0)
+    erros, conexoes = [], []
+
+    def trabalho():
+        try:
+            with banco.connection() as conn:
+                conexoes.append(conn._conn)  # A referência evita que o id() seja reaproveitado
+            for _ in range(50):
+                plano = banco.execute_prepared_one('plano_por_id', (1,))
+                if plano is None or plano['nome'] != 'Bronze':
+                    erros.append(plano)
+        except Exception as e:
+            erros.append(e)
+
+    threads = [threading.Thread(target=trabalho) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not erros, erros[:3]
+    assert len({id(c) for c in conexoes}) == 8  # Uma conexão por thread
+    del conexoes
+    depois = {s['nome']: s['chamadas'] for s in banco.prepared_stats()}['plano_por_id']
+    assert depois - antes == 400
+
+    # As conexões das threads encerradas são fechadas quando outra thread conecta
+    nova = threading.Thread(target=lambda: banco.execute_prepared('comando_por_id', (1,)))
+    nova.start()
+    nova.join()
+    assert len(banco._conexoes) <= 2
+    print("  ✅ Conexões e consultas registradas OK")
+
+def test_add_months():
+    """Testar o add_months do dialeto SQLite contra o cálculo em Python"""
+    print("\n📅 Testando add_months do dialeto...")
+    dialeto = get_sql_dialect(banco)
+    casos = [
+        (date(2024, 1, 31), 1, date(2024, 2, 29)),
+        (date(2023, 1, 31), 1, date(2023, 2, 28)),
+        (date(2024, 3, 31), -1, date(2024, 2, 29)),
+        (date(2024, 12, 15), 1, date(2025, 1, 15)),
+        (date(2024, 1, 15), -13, date(2022, 12, 15)),
+        (date(2024, 2, 29), 12, date(2025, 2, 28)),
+    ]
+    for inicio, meses, esperado in casos:
+        assert add_months(inicio, meses) == esperado, (inicio, meses)
+        linha = banco.execute_query_one(f'SELECT {dialeto.add_months("%s", "%s")} AS "dia [date]"', (inicio, meses))
+        assert linha['dia'] == esperado, (inicio, meses, linha['dia'])
+
+    # Todos os dias de dois anos, somando e subtraindo meses
+    for meses in (1, 3, 12, -1):
+        linhas = banco.execute_query(f"""
+            WITH RECURSIVE dias(dia) AS (
+                SELECT %s UNION ALL SELECT date(dia, '+1 day') FROM dias WHERE dia < %s
+            )
+            SELECT dia AS "dia [date]", {dialeto.add_months('dia', meses)} AS "somado [date]" FROM dias
+        """, (date(2023, 1, 1), date(2024, 12, 31)), fetch=True)
+        assert len(linhas) == 731
+        for l in linhas:
+            assert l['somado'] == add_months(l['dia'], meses), (l['dia'], meses, l['somado'])
+    print("  ✅ add_months OK")
+
+def test_batch_writes():
+    """Testar as escritas em lote (execute_values, copy_from_rows e execute_many)"""
+    print("\n📦 Testando escritas em lote...")
+    banco.execute_query("CREATE TABLE lote_teste (id INTEGER PRIMARY KEY, nome TEXT UNIQUE NOT NULL, valor REAL)")
+    try:
+        assert split_values("INSERT INTO t (a) VALUES %s ON CONFLICT DO NOTHING") == \
+            ("INSERT INTO t (a) VALUES ", " ON CONFLICT DO NOTHING")
+        assert split_values("UPDATE t SET a = 'x%%' FROM (VALUES %s) v") == ("UPDATE t SET a = 'x%%' FROM (VALUES ", ") v")
+        for invalida in ("INSERT INTO t VALUES (%s, %s)", "DELETE FROM t"):
+            try:
+                split_values(invalida)
+                raise AssertionError(f"consulta aceita: {invalida}")
+            except ValueError:
+                pass
+
+        # Mais linhas que o limite de parâmetros de uma instrução: quebradas em várias
+        quantidade = MAX_PARAMETROS // 2 + 10
+        linhas = [(f"item {i}", i * 1.5) for i in range(quantidade)]
+        assert banco.execute_values("INSERT INTO lote_teste (nome, valor) VALUES %s", linhas, chunk_size=quantidade) == quantidade
+
+        # RETURNING com fetch=True e template com expressão
+        retornadas = banco.execute_values(
+            "INSERT INTO lote_teste (nome, valor) VALUES %s RETURNING id, nome, valor",
+            [("a", 1), ("b", 2)], template="(upper(%s), %s * 10)", fetch=True)
+        assert [(r['nome'], r['valor']) for r in retornadas] == [("A", 10), ("B", 20)]
+
+        # Upsert: linhas existentes são atualizadas na mesma instrução
+        afetadas = banco.execute_values(
+            "INSERT INTO lote_teste (nome, valor) VALUES %s ON CONFLICT (nome) DO UPDATE SET valor = excluded.valor",
+            [("A", -1), ("C", 3)])
+        assert afetadas == 2
+        assert banco.execute_query_one("SELECT valor FROM lote_teste WHERE nome = 'A'")['valor'] == -1
+
+        # Um erro em qualquer bloco desfaz todos os blocos
+        total = banco.execute_query_one("SELECT COUNT(*) AS total FROM lote_teste")['total']
+        for escrever in (
+            lambda: banco.execute_values("INSERT INTO lote_teste (nome, valor) VALUES %s",
+                                         [("novo 1", 1), ("novo 2", 2), ("item 0", 0)], chunk_size=2),
+            lambda: banco.copy_from_rows('lote_teste', ['nome', 'valor'], [("novo 3", 3), ("novo 4", None), ("A", 0)], chunk_size=1),
+            lambda: banco.execute_many("INSERT INTO lote_teste (nome, valor) VALUES (%s, %s)", [("novo 5", 5), (None, 6)]),
+        ):
+            try:
+                escrever()
+                raise AssertionError("o erro do lote não foi propagado")
+            except AssertionError:
+                raise
+            except Exception:
+                pass
+            assert banco.execute_query_one("SELECT COUNT(*) AS total FROM lote_teste")['total'] == total
+
+        # copy_from_rows lê o iterável sob demanda, em blocos
+        lidas = []
+
+        def gerar():
+            for i in range(25):
+                lidas.append(i)
+                yield (f"copia {i}", None)
+        assert banco.copy_from_rows('lote_teste', ['nome', 'valor'], gerar(), chunk_size=10) == 25
+        assert lidas == list(range(25))
+        assert banco.copy_from_rows('lote_teste', ['nome', 'valor'], []) == 0
+        assert banco.execute_many("UPDATE lote_teste SET valor = %s WHERE nome = %s", [(7, "copia 1"), (8, "copia 2")]) == 2
+        assert banco.execute_query_one("SELECT COUNT(*) AS total FROM lote_teste WHERE nome LIKE 'copia %%'")['total'] == 25
+        assert banco.execute_query_one("SELECT SUM(valor) AS total FROM lote_teste WHERE nome LIKE 'copia %%'")['total'] == 15
+    finally:
+        banco.execute_query("DROP TABLE lote_teste")
+    print("  ✅ Escritas em lote OK")
+
+def test_duplicated_field():
+    """Testar a identificação do campo duplicado no cadastro de sócios"""
+    print("\n👯 Testando duplicated_field...")
+    _novo_socio(2001)
+    for coluna, valores in (('cpf', (f"{2001:011d}", "x@teste.com")), ('email', ("99999999999", "socio2001@teste.com"))):
+        try:
+            banco._conexao().execute(
+                "INSERT INTO socios (nome_completo, cpf, data_nascimento, email, telefone, tamanho_camisa) "
+                "VALUES ('Duplicado', ?, '1990-01-01', ?, '11999999999', 'M')", valores
+            )
+            raise AssertionError(f"{coluna} duplicado foi aceito")
+        except Exception as e:
+            assert duplicated_field(e) == coluna, (coluna, e)
+
+    # No PostgreSQL o nome vem da constraint (psycopg2: erro.diag.constraint_name)
+    class Diag:
+        constraint_name = 'socios_email_key'
+    class ErroPostgres(Exception):
+        diag = Diag()
+    assert duplicated_field(ErroPostgres("duplicate key value violates unique constraint")) == 'email'
+    assert duplicated_field(Exception("usuarios_email_key")) is None
+    assert duplicated_field(Exception("NOT NULL constraint failed: socios.telefone")) is None
+
+    with banco_global(utils.socios_cadastro):
+        try:
+            insert_socio("Duplicado", f"{2001:011d}", date(1990, 1, 1), "outro@teste.com", "11999999999", "M",
+                         1, None, 1, {})
+            raise AssertionError("CPF duplicado foi aceito")
+        except RegistroDuplicado as e:
+            assert e.campo == 'cpf'
+
+        # Cadastro numa única instrução: datas do plano calculadas pelo banco
+        hoje = date.today()
+        novo = insert_socio("Upsert Teste", f"{2002:011d}", date(1990, 1, 1), "upsert@teste.com", "11999999999", "M",
+                            1, None, 2, {'cidade': "Recife", 'estado': "PE"})
+        assert novo['data_adesao_plano'] == hoje and novo['data_vencimento_plano'] == add_months(hoje, 1)
+        sem_plano = insert_socio("Sem Plano Teste", f"{2003:011d}", date(1990, 1, 1), "semplano@teste.com",
+                                 "11999999999", "M", 1, None, None, {})
+        assert sem_plano['data_adesao_plano'] is None and sem_plano['data_vencimento_plano'] is None
+        linha = banco.execute_query_one("SELECT plano_id, cidade, estado FROM socios WHERE id = %s", (novo['id'],))
+        assert (linha['plano_id'], linha['cidade'], linha['estado']) == (2, "Recife", "PE")
+
+        # Atualização: e-mail de outro sócio é recusado; sócio inexistente retorna None
+        try:
+            update_socio_row(novo['id'], "Upsert Teste", f"{2002:011d}", date(1990, 1, 1), "socio2001@teste.com",
+                             "11999999999", "M", 1, None, 2, {})
+            raise AssertionError("e-mail duplicado foi aceito")
+        except RegistroDuplicado as e:
+            assert e.campo == 'email'
+        assert update_socio_row(999999, "X", "00000000000", date(1990, 1, 1), "x@x.com", "1", "M", 1, None, None, {}) is None
+    banco.execute_query("DELETE FROM socios WHERE cpf IN (%s, %s, %s)", (f"{2001:011d}", f"{2002:011d}", f"{2003:011d}"))
+    print("  ✅ duplicated_field OK")
+
+def test_columnar_fetch():
+    """Testar a leitura por coluna (fetch_frame e fetch_arrow)"""
+    print("\n🧮 Testando leitura por coluna...")
+    socio_id = _novo_socio(6501)
+    banco.execute_many(
+        "INSERT INTO faturas (socio_id, comando_id, valor, data_vencimento, data_pagamento, status) VALUES (%s, 1, %s, %s, %s, %s)",
+        [(socio_id, 10 + i, date(2024, 5, 1 + i), date(2024, 5, 2 + i) if i % 2 else None, 'Pago' if i % 2 else 'Pendente')
+         for i in range(7)])
+    query = """SELECT id, valor, data_vencimento, data_pagamento, status, status
+               FROM faturas WHERE socio_id = %s ORDER BY id"""
+
+    # Blocos menores que o resultado; nomes repetidos no SELECT não se sobrescrevem
+    frame = banco.fetch_frame(query, (socio_id,), chunk_size=3)
+    assert list(frame.columns) == ["id", "valor", "data_vencimento", "data_pagamento", "status", "status"]
+    assert len(frame) == 7 and list(frame['valor']) == [10.0 + i for i in range(7)]
+    assert str(frame['data_vencimento'].dtype).startswith('datetime64')
+    assert frame['data_vencimento'].iloc[0] == pd.Timestamp(2024, 5, 1)
+    assert frame['data_pagamento'].isna().sum() == 4 and frame['data_pagamento'].iloc[1] == pd.Timestamp(2024, 5, 3)
+    assert frame.iloc[:, 4].equals(frame.iloc[:, 5])
+
+    tabela = banco.fetch_arrow("SELECT id, valor, data_vencimento, status FROM faturas WHERE socio_id = %s ORDER BY id",
+                               (socio_id,), chunk_size=2)
+    assert tabela.num_rows == 7 and tabela.column_names == ["id", "valor", "data_vencimento", "status"]
+    assert str(tabela.schema.field("data_vencimento").type) == "date32[day]"
+    assert tabela.column("status").to_pylist()[:2] == ["Pendente", "Pago"]
+
+    # Sem linhas: colunas vazias com os nomes da consulta
+    vazio = banco.fetch_frame(query, (-1,))
+    assert vazio.empty and list(vazio.columns)[:2] == ["id", "valor"]
+    assert banco.fetch_arrow("SELECT id, status FROM faturas WHERE id = %s", (-1,)).num_rows == 0
+
+    # NUMERIC do PostgreSQL (Decimal) vira float64; datetime vira timestamp no Arrow
+    nomes = ["valor", "quando"]
+    colunas = [[Decimal("1.10"), None, Decimal("3")], [datetime(2024, 1, 1, 8), None, datetime(2024, 1, 2)]]
+    frame = build_frame(nomes, colunas)
+    assert str(frame['valor'].dtype) == 'float64' and frame['valor'].isna().iloc[1] and frame['valor'].iloc[0] == 1.1
+    tabela = build_arrow(nomes, colunas)
+    assert str(tabela.schema.field("valor").type) == "double" and str(tabela.schema.field("quando").type) == "timestamp[us]"
+    assert tabela.column("valor").to_pylist() == [1.1, None, 3.0]
+
+    # Erros da consulta são propagados (as páginas decidem como mostrar)
+    try:
+        banco.fetch_frame("SELECT coluna_inexistente FROM faturas")
+        raise AssertionError("o erro da consulta não foi propagado")
+    except AssertionError:
+        raise
+    except Exception:
+        pass
+    banco.execute_query("DELETE FROM faturas WHERE socio_id = %s", (socio_id,))
+    banco.execute_query("DELETE FROM socios WHERE id = %s", (socio_id,))
+    print("  ✅ Leitura por coluna OK")
+
+def main():
+    """Executar todos os testes"""
+    print("🧪 TESTES DO BACKEND SQLITE (banco em memória)")
+    print("=" * 50)
+
+    testes = [
+        test_postgres_pool,
+        test_search_index,
+        test_search_index_versions,
+        test_cache_invalidation,
+        test_keyset_pagination,
+        test_validate_import_chunk,
+        test_import_socios,
+        test_gerar_faturas,
+        test_marcar_atrasadas,
+        test_photo_variants,
+        test_photo_store_and_gc,
+        test_prepared_statements,
+        test_comando_report,
+        test_rollup_triggers,
+        test_export,
+        test_sqlite_translation,
+        test_sqlite_connections_and_prepared,
+        test_add_months,
+        test_batch_writes,
+        test_duplicated_field,
+        test_columnar_fetch,
+    ]
+    passou = 0
+    for teste in testes:
+        try:
+            teste()
+            passou += 1
+        except Exception as e:
+            print(f"  ❌ {teste.__name__}: {e!r}")
+
+    print("\n" + "=" * 50)
+    print(f"📊 RESULTADO DOS TESTES: {passou}/{len(testes)}")
+    return passou == len(testes)
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,130 @@
+"""
+Cache de consultas compartilhado entre sessões, invalidado por tabela
+
+Cada tabela tem um contador de versão. Funções decoradas com
+@cached_query('socios', 'planos') incluem as versões dessas tabelas na
+chave do cache, e toda escrita chama invalidate('socios'), que incrementa
+o contador. Assim uma leitura nunca devolve dados de antes de uma escrita
+e o TTL pode ser longo.
+
+As versões também ficam no banco (tabela cache_versions, incrementada por
+gatilhos em cada escrita; migração 0007): escritas de outros processos,
+como gerar_faturas.py, importar_socios.py ou outra réplica do app,
+invalidam o cache em até CACHE_CHECK_INTERVAL segundos.
+"""
+
+import os
+import threading
+import time
+import streamlit as st
+
+# TTL padrão: a invalidação por versão garante a consistência, o TTL só libera memória
+DEFAULT_TTL = 6 * 60 * 60  # 6 horas
+
+# Intervalo (segundos) entre leituras de cache_versions
+CHECK_INTERVAL = float(os.getenv('CACHE_CHECK_INTERVAL', '2'))
+
+def read_db_versions(database=None):
+    """{tabela: versao} gravadas no banco (erros são propagados)"""
+    if database is None:
+        from config.database import db as database
+    if not database.connect():
+        raise ConnectionError("Banco de dados indisponível")
+    with database.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT tabela, versao FROM cache_versions")
+            return {tabela: versao for tabela, versao in cursor.fetchall()}
+
+def bump_db_versions(*tables, database=None):
+    """Incrementar em cache_versions versões que não têm gatilho (ex.: o índice de busca)"""
+    if database is None:
+        from config.database import db as database
+    return database.execute_many(
+        "INSERT INTO cache_versions (tabela, versao) VALUES (%s, 1) "
+        "ON CONFLICT (tabela) DO UPDATE SET versao = cache_versions.versao + 1",
+        [(t,) for t in tables]
+    )
+
+def bump_db_version(table, database=None):
+    """Incrementar uma versão em cache_versions, retornando o valor novo (erros são propagados)"""
+    if database is None:
+        from config.database import db as database
+    linha = database.execute_returning(
+        "INSERT INTO cache_versions (tabela, versao) VALUES (%s, 1) "
+        "ON CONFLICT (tabela) DO UPDATE SET versao = cache_versions.versao + 1 RETURNING versao",
+        (table,)
+    )
+    return linha['versao']
+
+class TableVersions:
+    """Contadores de versão por tabela: os do banco e as escritas deste processo"""
+
+    def __init__(self, check_interval=CHECK_INTERVAL, read_versions=read_db_versions):
+        self._lock = threading.Lock()
+        self._versoes = {}
+        self._banco = {}
+        self._lido_em = None
+        self._check_interval = check_interval
+        self._read_versions = read_versions
+
+    def _atualizar(self):
+        """Reler cache_versions se a última leitura passou do intervalo"""
+        agora = time.monotonic()
+        if self._lido_em is not None and agora - self._lido_em < self._check_interval:
+            return
+        self._lido_em = agora
+        try:
+            self._banco = self._read_versions()
+        except Exception as e:
+            # Sem a tabela (migração pendente) ou sem banco: só as versões locais
+            print(f"Erro ao ler versões do cache: {e}")
+
+    def get(self, tables):
+        with self._lock:
+            self._atualizar()
+            return tuple((self._banco.get(t, 0), self._versoes.get(t, 0)) for t in tables)
+
+    def bump(self, tables):
+        with self._lock:
+            for t in tables:
+                self._versoes[t] = self._versoes.get(t, 0) + 1
+            # A escrita já incrementou o banco: a próxima leitura busca a versão nova
+            self._lido_em = None
+
+    def snapshot(self):
+        with self._lock:
+            return {t: (self._banco.get(t, 0), self._versoes.get(t, 0)) for t in set(self._banco) | set(self._versoes)}
+
+@st.cache_resource
+def get_table_versions():
+    """Contadores compartilhados por todas as sessões do processo"""
+    return TableVersions()
+
+def invalidate(*tables):
+    """Marcar tabelas como alteradas (chamar após toda escrita)"""
+    get_table_versions().bump(tables)
+
+def cached_query(*tables, ttl=DEFAULT_TTL):
+    """Decorator de cache para leituras que dependem das tabelas informadas"""
+    def decorator(func):
+        def versioned(versoes, *args, **kwargs):
+            return func(*args, **kwargs)
+
+        # O st.cache_data identifica a função por módulo + nome
+        versioned.__module__ = func.__module__
+        versioned.__name__ = func.__name__
+        versioned.__qualname__ = func.__qualname__
+        cached = st.cache_data(ttl=ttl)(versioned)
+
+        def wrapper(*args, **kwargs):
+            return cached(get_table_versions().get(tables), *args, **kwargs)
+
+        wrapper.__module__ = func.__module__
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = func.__qualname__
+        wrapper.__doc__ = func.__doc__
+        wrapper.tables = tables
+        wrapper.clear = cached.clear
+        wrapper.uncached = func
+        return wrapper
+    return decorator
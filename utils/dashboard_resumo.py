@@ -0,0 +1,76 @@
+"""
+Atualização do resumo do dashboard (view materializada dashboard_resumo)
+
+O REFRESH recalcula a view inteira, então não roda dentro de cada escrita:
+as páginas pedem a atualização e uma thread em segundo plano executa no
+máximo um REFRESH a cada DASHBOARD_REFRESH_INTERVAL segundos, agrupando
+os pedidos feitos nesse meio-tempo. O dashboard pode mostrar números de
+alguns segundos atrás; a virada do dia e os scripts (gerar_faturas.py)
+atualizam na hora com refresh_now().
+"""
+
+import os
+import threading
+import time
+import streamlit as st
+from config.database import db
+
+REFRESH_SQL = "REFRESH MATERIALIZED VIEW CONCURRENTLY dashboard_resumo"
+
+# Intervalo mínimo (segundos) entre dois REFRESH pedidos pelas páginas
+REFRESH_INTERVAL = float(os.getenv('DASHBOARD_REFRESH_INTERVAL', '10'))
+
+def refresh_now():
+    """Recalcular o resumo agora (bloqueia até o fim do REFRESH)"""
+    return db.execute_query(REFRESH_SQL)
+
+class AtualizacaoAgendada:
+    """Executar `acao` em segundo plano, no máximo uma vez a cada `intervalo` segundos
+
+    O primeiro pedido depois de um período sem atualizações executa na
+    hora; os seguintes esperam o intervalo e viram uma única execução.
+    Pedidos feitos durante a execução geram mais uma ao final.
+    """
+
+    def __init__(self, acao, intervalo=REFRESH_INTERVAL, nome="dashboard-resumo"):
+        self._acao = acao
+        self._intervalo = intervalo
+        self._nome = nome
+        self._lock = threading.Lock()
+        self._pendente = False
+        self._thread = None
+        self._ultima = None
+
+    def request(self):
+        with self._lock:
+            self._pendente = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._executar, name=self._nome, daemon=True)
+                self._thread.start()
+
+    def _executar(self):
+        while True:
+            with self._lock:
+                espera = self._ultima + self._intervalo - time.monotonic() if self._ultima else 0
+            if espera > 0:
+                time.sleep(espera)
+            with self._lock:
+                if not self._pendente:
+                    self._thread = None
+                    return
+                self._pendente = False
+            try:
+                self._acao()
+            except Exception as e:
+                print(f"Erro na atualização em segundo plano ({self._nome}): {e}")
+            with self._lock:
+                self._ultima = time.monotonic()
+
+@st.cache_resource
+def get_refresher():
+    """Atualização compartilhada por todas as sessões do processo"""
+    return AtualizacaoAgendada(refresh_now)
+
+def request_refresh():
+    """Pedir a atualização do resumo (chamar após escritas em sócios, faturas ou comandos)"""
+    get_refresher().request()
@@ -0,0 +1,339 @@
+"""
+Exportação de sócios e faturas para CSV, XLSX ou Parquet
+
+As linhas vêm do banco em blocos (db.iter_query, cursor no servidor) e
+cada bloco é gravado no arquivo antes de ler o próximo, então só um bloco
+de linhas fica na memória. A tela grava o arquivo em static/exportacoes,
+servido do disco pelo servidor estático do Streamlit (server.enableStaticServing),
+em vez do st.download_button, que guarda o arquivo inteiro na memória. Esses
+arquivos não passam pelo login: cada um fica numa pasta de nome aleatório e
+é apagado depois de EXPORT_TTL_SECONDS. O Streamlit não serve arquivos
+estáticos acima de 200 MB, por isso o arquivo é limitado a EXPORT_MAX_MB (a
+gravação para assim que passa do limite e a tela pede um período menor).
+A formatação (CPF, telefone, datas) é feita no SQL, com as funções do
+dialeto do banco (config/dialeto.py), sem montar um DataFrame com tudo.
+"""
+
+import csv
+import io
+import os
+import secrets
+import shutil
+import tempfile
+import time
+from datetime import date
+import streamlit as st
+from config.database import db
+from config.dialeto import Filtros, get_sql_dialect
+
+CHUNK_SIZE = 5000
+
+# Limite de linhas de uma planilha do Excel (cabeçalho incluso)
+MAX_LINHAS_XLSX = 1048576
+
+# Tamanho máximo do arquivo exportado (o servidor estático do Streamlit recusa acima de 200 MB)
+MAX_EXPORT_MB = float(os.getenv('EXPORT_MAX_MB', '200'))
+
+# Arquivos prontos para download, servidos em app/static/exportacoes/<pasta aleatória>/
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "exportacoes")
+EXPORT_TTL_SECONDS = 60 * 60  # Tempo até o arquivo exportado ser apagado
+
+class ExportacaoGrande(ValueError):
+    """Arquivo da exportação maior que o limite (MAX_EXPORT_MB)"""
+
+# O primeiro é o sugerido: Parquet é comprimido (500 mil faturas cabem em poucos MB)
+FORMATOS = {
+    'parquet': ("Parquet (recomendado para muitos dados)", "application/octet-stream"),
+    'csv': ("CSV", "text/csv"),
+    'xlsx': ("Excel (XLSX)", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+# Máscaras de exibição (as mesmas de format_cpf e format_phone) aplicadas no banco:
+# (coluna, expressão regular dos dígitos, substituição)
+MASCARAS = {
+    'cpf': ('s.cpf', r'^(\d{3})(\d{3})(\d{3})(\d{2})$', r'\1.\2.\3-\4'),
+    'telefone': ('s.telefone', r'^(\d{2})(\d{4,5})(\d{4})$', r'(\1) \2-\3'),
+}
+
+def _mascara(dialeto, nome):
+    coluna, padrao, substituto = MASCARAS[nome]
+    digitos = dialeto.regexp_replace(coluna, r'\D', '')
+    return dialeto.regexp_replace(digitos, padrao, substituto)
+
+# (rótulo, SQL, coluna de data filtrada pelo período, colunas numéricas)
+# As demais colunas são texto (datas já saem formatadas do SQL)
+EXPORTACOES = {
+    'socios': ("Sócios", """
+        SELECT
+            s.id AS "ID",
+            s.nome_completo AS "Nome",
+            {cpf} AS "CPF",
+            s.email AS "Email",
+            {telefone} AS "Telefone",
+            {data_nascimento} AS "Data Nascimento",
+            s.tamanho_camisa AS "Tamanho Camisa",
+            c.nome AS "Comando",
+            COALESCE(p.nome, 'Sem Plano') AS "Plano",
+            p.valor AS "Valor Plano",
+            p.periodicidade AS "Periodicidade",
+            {vencimento_plano} AS "Vencimento Plano",
+            s.cidade AS "Cidade",
+            s.estado AS "UF"
+        FROM socios s
+        LEFT JOIN comandos c ON s.comando_id = c.id
+        LEFT JOIN planos p ON s.plano_id = p.id
+        {where}
+        {ordem}
+    """, 's.created_at', {'ID': 'int', 'Valor Plano': 'float'}),
+    'faturas': ("Faturas", """
+        SELECT
+            f.id AS "ID",
+            s.nome_completo AS "Sócio",
+            {cpf} AS "CPF",
+            c.nome AS "Comando",
+            f.descricao AS "Descrição",
+            f.valor AS "Valor",
+            {vencimento} AS "Vencimento",
+            {pagamento} AS "Pagamento",
+            f.status AS "Status",
+            f.forma_pagamento AS "Forma de Pagamento"
+        FROM faturas f
+        INNER JOIN socios s ON f.socio_id = s.id
+        INNER JOIN comandos c ON f.comando_id = c.id
+        {where}
+        {ordem}
+    """, 'f.data_vencimento', {'ID': 'int', 'Valor': 'float'}),
+}
+
+# Ordem de cada exportação (a mesma das listagens)
+ORDENS = {
+    'socios': ('s.nome_completo', 's.id'),
+    'faturas': ('f.data_vencimento DESC', 'f.id'),
+}
+
+def build_export_query(tipo, inicio=None, fim=None, comando_id=0, status=None, dialeto=None):
+    """SQL e parâmetros da exportação (período semiaberto sobre a coluna de data)
+
+    Os parâmetros são sempre uma lista (mesmo vazia): os trechos do dialeto
+    escrevem % literal como %%.
+    """
+    _, sql, coluna_data, _ = EXPORTACOES[tipo]
+    dialeto = dialeto or get_sql_dialect()
+    filtros = Filtros().date_range(coluna_data, inicio, fim)
+    filtros.equals(f"{'s' if tipo == 'socios' else 'f'}.comando_id", comando_id or None)
+    if tipo == 'faturas':
+        filtros.equals('f.status', status or None)
+    sql = sql.format(
+        cpf=_mascara(dialeto, 'cpf'),
+        telefone=_mascara(dialeto, 'telefone'),
+        data_nascimento=dialeto.format_date('s.data_nascimento'),
+        vencimento_plano=dialeto.format_date('s.data_vencimento_plano'),
+        vencimento=dialeto.format_date('f.data_vencimento'),
+        pagamento=dialeto.format_date('f.data_pagamento'),
+        where=filtros.where(),
+        ordem=dialeto.order_by(*ORDENS[tipo]),
+    )
+    return sql, filtros.params
+
+def _valor(v):
+    """Valores do banco em tipos aceitos pelos escritores (Decimal vira float)"""
+    if v is None or isinstance(v, (str, int, float, date)):
+        return v
+    return float(v)
+
+def _write_csv(blocos, arquivo, on_progress, numericas):
+    texto = io.TextIOWrapper(arquivo, encoding='utf-8-sig', newline='')
+    writer = None
+    total = 0
+    for bloco in blocos:
+        if writer is None:
+            writer = csv.writer(texto, delimiter=';')
+            writer.writerow(bloco[0].keys())
+        writer.writerows(linha.values() for linha in bloco)
+        texto.flush()  # O tamanho conferido em on_progress é o do arquivo
+        total += len(bloco)
+        if on_progress:
+            on_progress(total)
+    texto.flush()
+    texto.detach()  # Manter o arquivo aberto para o download
+    return total
+
+def _write_xlsx(blocos, arquivo, on_progress, numericas):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ValueError("Instale o openpyxl para exportar arquivos XLSX: pip install openpyxl")
+
+    # write_only: as linhas vão direto para o arquivo, sem manter a planilha na memória
+    workbook = Workbook(write_only=True)
+    planilha, cabecalho, linhas_planilha = None, None, 0
+    total = 0
+    for bloco in blocos:
+        if cabecalho is None:
+            cabecalho = list(bloco[0].keys())
+        for linha in bloco:
+            if planilha is None or linhas_planilha >= MAX_LINHAS_XLSX:
+                planilha = workbook.create_sheet(f"Dados {len(workbook.worksheets) + 1}")
+                planilha.append(cabecalho)
+                linhas_planilha = 1
+            planilha.append([_valor(v) for v in linha.values()])
+            linhas_planilha += 1
+        total += len(bloco)
+        if on_progress:
+            on_progress(total)
+    if planilha is None:
+        workbook.create_sheet("Dados 1")
+    workbook.save(arquivo)
+    return total
+
+def _write_parquet(blocos, arquivo, on_progress, numericas):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Instale o pyarrow para exportar arquivos Parquet: pip install pyarrow")
+
+    tipos = {'int': pa.int64(), 'float': pa.float64()}
+    writer = None
+    total = 0
+    try:
+        for bloco in blocos:
+            if writer is None:
+                # Esquema fixo: um bloco só com nulos numa coluna não muda o tipo dela
+                schema = pa.schema([(nome, tipos.get(numericas.get(nome), pa.string())) for nome in bloco[0].keys()])
+                writer = pq.ParquetWriter(arquivo, schema)
+            colunas = {nome: [_valor(linha[nome]) for linha in bloco] for nome in schema.names}
+            writer.write_table(pa.table(colunas, schema=schema))
+            total += len(bloco)
+            if on_progress:
+                on_progress(total)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+_ESCRITORES = {'csv': _write_csv, 'xlsx': _write_xlsx, 'parquet': _write_parquet}
+
+def export_to_file(tipo, formato, inicio=None, fim=None, comando_id=0, status=None, chunk_size=CHUNK_SIZE,
+                   on_progress=None, max_mb=MAX_EXPORT_MB, arquivo=None):
+    """Gravar a exportação em `arquivo` (binário, aberto para escrita) ou num temporário
+
+    Retorna (arquivo aberto e posicionado no início, total de linhas). O
+    temporário é apagado ao ser fechado. Levanta ExportacaoGrande se o
+    arquivo passar de max_mb (conferido a cada bloco e no arquivo final).
+    """
+    if formato not in _ESCRITORES:
+        raise ValueError(f"Formato não suportado: {formato}")
+
+    limite = max_mb * 1024 * 1024 if max_mb else None
+
+    def conferir_tamanho(total=None):
+        if limite and file_size(arquivo) > limite:
+            raise ExportacaoGrande(
+                f"A exportação passou do limite de {max_mb:g} MB; escolha um período menor ou filtre por comando"
+            )
+        if total is not None and on_progress:
+            on_progress(total)
+
+    query, params = build_export_query(tipo, inicio, fim, comando_id, status)
+    if arquivo is None:
+        arquivo = tempfile.TemporaryFile(suffix=f".{formato}")
+    try:
+        blocos = db.iter_query(query, params, chunk_size=chunk_size)
+        try:
+            total = _ESCRITORES[formato](blocos, arquivo, conferir_tamanho, EXPORTACOES[tipo][3])
+        finally:
+            # Devolver a conexão ao pool mesmo se a gravação falhar no meio
+            if hasattr(blocos, 'close'):
+                blocos.close()
+        conferir_tamanho()
+    except Exception:
+        arquivo.close()
+        raise
+    arquivo.seek(0)
+    return arquivo, total
+
+def export_file_name(tipo, formato, hoje=None):
+    """Nome sugerido do arquivo (ex.: faturas_2025-01-31.csv)"""
+    return f"{tipo}_{(hoje or date.today()).isoformat()}.{formato}"
+
+def remove_old_exports(max_age=EXPORT_TTL_SECONDS):
+    """Apagar as pastas de EXPORT_DIR mais antigas que max_age segundos; retorna quantas"""
+    if not os.path.isdir(EXPORT_DIR):
+        return 0
+    limite = time.time() - max_age
+    apagadas = 0
+    for nome in os.listdir(EXPORT_DIR):
+        pasta = os.path.join(EXPORT_DIR, nome)
+        if os.path.isdir(pasta) and os.path.getmtime(pasta) < limite:
+            shutil.rmtree(pasta, ignore_errors=True)
+            apagadas += 1
+    return apagadas
+
+def export_for_download(tipo, formato, inicio=None, fim=None, comando_id=0, status=None, on_progress=None,
+                        max_mb=MAX_EXPORT_MB):
+    """Gravar a exportação em EXPORT_DIR, numa pasta de nome aleatório
+
+    Retorna (caminho do arquivo, URL relativa ao app, total de linhas). O
+    arquivo incompleto é apagado se a gravação falhar.
+    """
+    remove_old_exports()
+    pasta = os.path.join(EXPORT_DIR, secrets.token_urlsafe(24))
+    os.makedirs(pasta)
+    nome = export_file_name(tipo, formato)
+    caminho = os.path.join(pasta, nome)
+    try:
+        with open(caminho, 'w+b') as arquivo:
+            _, total = export_to_file(tipo, formato, inicio, fim, comando_id, status,
+                                      on_progress=on_progress, max_mb=max_mb, arquivo=arquivo)
+    except Exception:
+        shutil.rmtree(pasta, ignore_errors=True)
+        raise
+    return caminho, f"app/static/exportacoes/{os.path.basename(pasta)}/{nome}", total
+
+def file_size(arquivo):
+    """Tamanho em bytes de um arquivo aberto"""
+    return os.fstat(arquivo.fileno()).st_size
+
+def show_export_widget(tipo, inicio=None, fim=None, comando_id=0, status=None, key=None):
+    """Escolha do formato, geração do arquivo e botão de download"""
+    key = key or f"exportar_{tipo}"
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        formato = st.selectbox("Formato", list(FORMATOS.keys()), format_func=lambda f: FORMATOS[f][0],
+                               key=f"{key}_formato")
+    with col2:
+        st.write("")
+        gerar = st.button("📦 Gerar arquivo", use_container_width=True, key=f"{key}_gerar")
+
+    st.caption(f"Arquivos de até {MAX_EXPORT_MB:g} MB; para muitos dados prefira Parquet "
+               f"(comprimido) ou exporte por período.")
+
+    if not gerar:
+        return
+
+    progresso = st.empty()
+    try:
+        caminho, url, total = export_for_download(
+            tipo, formato, inicio, fim, comando_id, status,
+            on_progress=lambda n: progresso.caption(f"{n} linhas gravadas...")
+        )
+    except ExportacaoGrande as e:
+        progresso.empty()
+        st.warning(f"⚠️ {e}")
+        return
+    except Exception as e:
+        progresso.empty()
+        st.error(f"Erro ao exportar: {e}")
+        return
+
+    progresso.empty()
+    # Link para o arquivo no disco (servidor estático): o arquivo não é lido para a memória
+    base = st.get_option("server.baseUrlPath").strip("/")
+    tamanho = os.path.getsize(caminho)
+    st.markdown(
+        f'<a href="/{base + "/" if base else ""}{url}" download="{os.path.basename(caminho)}">'
+        f'⬇️ Baixar {EXPORTACOES[tipo][0].lower()} ({total} linhas, {tamanho / 1024 / 1024:.1f} MB)</a>',
+        unsafe_allow_html=True
+    )
+    st.caption(f"O link expira em {EXPORT_TTL_SECONDS // 60} minutos.")
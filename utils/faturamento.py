@@ -0,0 +1,195 @@
+"""
+Geração recorrente de faturas e controle de atraso
+
+Cada execução cobra o próximo ciclo de todo sócio com plano ativo cujo
+data_vencimento_plano cai até a data limite. No PostgreSQL uma única
+instrução INSERT ... SELECT cria as faturas e avança o vencimento do plano
+por meses de calendário (não 30/90/365 dias); nos bancos sem INSERT/UPDATE
+dentro de WITH são duas instruções (INSERT ... SELECT e UPDATE) na mesma
+transação, montadas pelo dialeto (config/dialeto.py). O índice único
+(socio_id, periodo) torna a geração idempotente.
+
+marcar_atrasadas() muda faturas Pendente vencidas para Atrasado e registra
+atrasado_em, para que as leituras filtrem só por status. Roda no cron
+(gerar_faturas.py) e, no app, numa thread em segundo plano pedida pelas
+páginas com request_marcar_atrasadas(): a renderização só lê.
+"""
+
+from datetime import date, timedelta
+import streamlit as st
+from config.database import db
+from config.dialeto import get_sql_dialect
+from utils.cache import invalidate
+from utils.dashboard_resumo import AtualizacaoAgendada, request_refresh
+
+# Configurações
+DIAS_ANTECEDENCIA = 10  # Faturas são geradas até 10 dias antes do vencimento do plano
+MAX_CICLOS = 12  # Sócios atrasados recebem no máximo 12 ciclos por execução
+LOTE_ATRASADAS = 5000  # Faturas atualizadas por UPDATE (transações curtas)
+INTERVALO_ATRASADAS = 60 * 60  # Verificação automática pelo app: no máximo de hora em hora
+
+MESES_PERIODICIDADE = {'Mensal': 1, 'Trimestral': 3, 'Anual': 12}
+
+GERAR_FATURAS_SQL = """
+WITH ciclo AS (
+    SELECT s.id AS socio_id, s.comando_id, p.id AS plano_id, p.valor, p.nome AS plano_nome,
+           s.data_vencimento_plano AS periodo,
+           (s.data_vencimento_plano + CASE p.periodicidade
+                WHEN 'Trimestral' THEN INTERVAL '3 months'
+                WHEN 'Anual' THEN INTERVAL '1 year'
+                ELSE INTERVAL '1 month'
+            END)::date AS proximo_vencimento
+    FROM socios s
+    INNER JOIN planos p ON p.id = s.plano_id
+    WHERE p.ativo
+      AND s.comando_id IS NOT NULL
+      AND s.data_vencimento_plano IS NOT NULL
+      AND s.data_vencimento_plano <= %s
+),
+geradas AS (
+    INSERT INTO faturas (socio_id, comando_id, plano_id, valor, descricao, data_vencimento,
+                         data_renovacao, periodo, status)
+    SELECT socio_id, comando_id, plano_id, valor,
+           'Plano ' || plano_nome || ' - ' || to_char(periodo, 'DD/MM/YYYY'),
+           periodo, proximo_vencimento, periodo, 'Pendente'
+    FROM ciclo
+    ON CONFLICT (socio_id, periodo) DO NOTHING
+    RETURNING id
+),
+renovados AS (
+    UPDATE socios s
+    SET data_vencimento_plano = c.proximo_vencimento
+    FROM ciclo c
+    WHERE s.id = c.socio_id
+    RETURNING s.id
+)
+SELECT (SELECT COUNT(*) FROM geradas) AS geradas,
+       (SELECT COUNT(*) FROM renovados) AS renovados
+"""
+
+# Ciclo (em meses) da periodicidade do plano p
+MESES_PLANO_SQL = "CASE p.periodicidade WHEN 'Trimestral' THEN 3 WHEN 'Anual' THEN 12 ELSE 1 END"
+
+# Mesmos sócios de GERAR_FATURAS_SQL (s = socios, p = planos)
+CICLO_WHERE_SQL = """p.ativo
+  AND s.comando_id IS NOT NULL
+  AND s.data_vencimento_plano IS NOT NULL
+  AND s.data_vencimento_plano <= %s"""
+
+MARCAR_ATRASADAS_SQL = """
+UPDATE faturas
+SET status = 'Atrasado', atrasado_em = NOW()
+WHERE id IN (
+    SELECT id FROM faturas
+    WHERE status = 'Pendente' AND data_vencimento < CURRENT_DATE
+    LIMIT %s
+    {trava}
+)
+RETURNING id
+"""
+
+def add_months(data, meses):
+    """Somar meses de calendário (31/01 + 1 mês = 28 ou 29/02)"""
+    mes = data.month - 1 + meses
+    ano = data.year + mes // 12
+    mes = mes % 12 + 1
+    dias_no_mes = (date(ano + mes // 12, mes % 12 + 1, 1) - timedelta(days=1)).day
+    return date(ano, mes, min(data.day, dias_no_mes))
+
+def next_due_date(data, periodicidade):
+    """Próximo vencimento do plano a partir de uma data"""
+    return add_months(data, MESES_PERIODICIDADE.get(periodicidade, 1))
+
+def cycle_statements(dialeto):
+    """INSERT das faturas e UPDATE dos vencimentos de um ciclo, para bancos sem writable CTE"""
+    proximo = dialeto.add_months('s.data_vencimento_plano', MESES_PLANO_SQL)
+    descricao = dialeto.concat("'Plano '", "p.nome", "' - '", dialeto.format_date('s.data_vencimento_plano'))
+    inserir = dialeto.insert_ignore(
+        'faturas',
+        ['socio_id', 'comando_id', 'plano_id', 'valor', 'descricao', 'data_vencimento',
+         'data_renovacao', 'periodo', 'status'],
+        f"""SELECT s.id, s.comando_id, p.id, p.valor, {descricao},
+       s.data_vencimento_plano, {proximo}, s.data_vencimento_plano, 'Pendente'
+FROM socios s
+INNER JOIN planos p ON p.id = s.plano_id
+WHERE {CICLO_WHERE_SQL}""",
+        ['socio_id', 'periodo']
+    )
+    # Sem UPDATE ... FROM (não é portável) e sem ler socios na subconsulta (o MySQL não deixa)
+    meses = f"(SELECT {MESES_PLANO_SQL} FROM planos p WHERE p.id = socios.plano_id)"
+    renovar = f"""UPDATE socios
+SET data_vencimento_plano = {dialeto.add_months('data_vencimento_plano', meses)}
+WHERE plano_id IN (SELECT id FROM planos WHERE ativo)
+  AND comando_id IS NOT NULL
+  AND data_vencimento_plano IS NOT NULL
+  AND data_vencimento_plano <= %s"""
+    return inserir, renovar
+
+def _gerar_ciclo(dialeto, ate):
+    """Um ciclo em duas instruções na mesma transação; retorna {'geradas', 'renovados'}"""
+    inserir, renovar = cycle_statements(dialeto)
+    with db.connection() as conn:
+        with conn.cursor() as cursor:
+            # As conexões estão em autocommit: abrir a transação explicitamente
+            cursor.execute("BEGIN")
+            try:
+                cursor.execute(inserir, (ate,))
+                geradas = cursor.rowcount
+                cursor.execute(renovar, (ate,))
+                renovados = cursor.rowcount
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+    return {'geradas': geradas, 'renovados': renovados}
+
+def gerar_faturas(ate=None, max_ciclos=MAX_CICLOS):
+    """Gerar as faturas dos planos que vencem até a data informada
+
+    Retorna {'geradas', 'renovados', 'ciclos'}. Cada ciclo é set-based;
+    sócios com vários ciclos em aberto avançam um por vez.
+    """
+    if ate is None:
+        ate = date.today() + timedelta(days=DIAS_ANTECEDENCIA)
+
+    dialeto = get_sql_dialect()
+    resultado = {'geradas': 0, 'renovados': 0, 'ciclos': 0}
+    for _ in range(max_ciclos):
+        if dialeto.writable_cte:
+            linha = db.execute_query_one(GERAR_FATURAS_SQL, (ate,))
+        else:
+            linha = _gerar_ciclo(dialeto, ate)
+        if not linha or not linha['renovados']:
+            break
+        resultado['geradas'] += linha['geradas']
+        resultado['renovados'] += linha['renovados']
+        resultado['ciclos'] += 1
+    return resultado
+
+def marcar_atrasadas(lote=LOTE_ATRASADAS):
+    """Mudar faturas pendentes vencidas para Atrasado; retorna quantas mudaram"""
+    query = MARCAR_ATRASADAS_SQL.format(trava=get_sql_dialect().skip_locked())
+    total = 0
+    while True:
+        atualizadas = db.execute_query(query, (lote,), fetch=True)
+        if not atualizadas:
+            break
+        total += len(atualizadas)
+        if len(atualizadas) < lote:
+            break
+    return total
+
+def _marcar_atrasadas_e_publicar():
+    """Marcar as atrasadas e, se alguma mudou, invalidar o cache e o resumo do dashboard"""
+    if marcar_atrasadas():
+        invalidate('faturas')
+        request_refresh()
+
+@st.cache_resource
+def get_verificador_atrasadas():
+    """Verificação compartilhada por todas as sessões do processo"""
+    return AtualizacaoAgendada(_marcar_atrasadas_e_publicar, INTERVALO_ATRASADAS, nome="faturas-atrasadas")
+
+def request_marcar_atrasadas():
+    """Pedir marcar_atrasadas() em segundo plano (no máximo uma vez por INTERVALO_ATRASADAS)"""
+    get_verificador_atrasadas().request()
@@ -231,3 +231,11 @@ def create_card(title, content):
         <div style="color: #ffffff;">{content}</div>
     </div>
     """, unsafe_allow_html=True)
+
+def grid_key(nome):
+    """Chave atual da tabela com seleção (muda a cada troca de página ou de filtros)"""
+    return f"{nome}_{st.session_state.get(f'{nome}_versao', 0)}"
+
+def new_grid_key(nome):
+    """Trocar a chave da tabela: a seleção da página anterior não vale para as novas linhas"""
+    st.session_state[f'{nome}_versao'] = st.session_state.get(f'{nome}_versao', 0) + 1
@@ -1,12 +1,25 @@
 """
 Utilitário para gerenciar fotos dos sócios
+
+As fotos são gravadas uma única vez por conteúdo, em
+uploads/socios/ab/cd/<sha256>.jpg (hash dos bytes já processados).
+O processamento roda num pool de threads e, ao terminar, grava o caminho
+em socios.foto. Arquivos sem referência em socios são apagados na troca
+da foto e pela varredura collect_orphan_photos().
 """
 
 import os
-import uuid
+import time
+import base64
+import hashlib
+import re
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
 from PIL import Image
 import io
+from config.database import db
+from config.dialeto import get_sql_dialect
+from utils.cache import invalidate
 
 # Configurações
 UPLOAD_DIR = "uploads/socios"
@@ -14,6 +27,12 @@ ALLOWED_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.bmp']
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 MAX_DIMENSIONS = (800, 800)  # Máximo 800x800 pixels
 
+# Variantes geradas no upload (lado maior em pixels); a de 800 é o arquivo principal
+PHOTO_SIZES = [60, 150, 800]
+
+PHOTO_WORKERS = 2  # Threads processando uploads
+GC_GRACE_SECONDS = 60 * 60  # Arquivos recém-gravados não são apagados pelo GC
+
 def ensure_upload_dir():
     """Garantir que o diretório de upload existe"""
     if not os.path.exists(UPLOAD_DIR):
@@ -56,51 +75,215 @@ def validate_image(image_bytes):
     except Exception as e:
         return None, f"Erro ao processar imagem: {str(e)}"
 
+def build_variants(image_bytes):
+    """Gerar as versões reduzidas (PHOTO_SIZES) de uma foto já processada"""
+    image = Image.open(io.BytesIO(image_bytes))
+    variants = {}
+    for size in PHOTO_SIZES:
+        if size >= max(image.size):
+            variants[size] = image_bytes
+            continue
+        copia = image.copy()
+        copia.thumbnail((size, size), Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        copia.save(output, format='JPEG', quality=85, optimize=True)
+        variants[size] = output.getvalue()
+    return variants
+
+def variant_path(photo_path, size):
+    """Caminho da variante de uma foto (socio_x.jpg -> socio_x_60.jpg)"""
+    if size == PHOTO_SIZES[-1]:
+        return photo_path
+    base, ext = os.path.splitext(photo_path)
+    return f"{base}_{size}{ext}"
+
+def get_photo_variant(photo_path, width):
+    """Menor variante que cobre a largura pedida (gerada na hora para fotos antigas)"""
+    if not photo_path or not os.path.exists(photo_path):
+        return None
+    size = next((s for s in PHOTO_SIZES if s >= width), PHOTO_SIZES[-1])
+    path = variant_path(photo_path, size)
+    if not os.path.exists(path):
+        # Fotos salvas antes das variantes: gerar uma vez e guardar
+        try:
+            with open(photo_path, 'rb') as f:
+                variants = build_variants(f.read())
+            for tamanho, dados in variants.items():
+                if tamanho != PHOTO_SIZES[-1]:
+                    with open(variant_path(photo_path, tamanho), 'wb') as f:
+                        f.write(dados)
+        except Exception as e:
+            print(f"Erro ao gerar variantes de {photo_path}: {e}")
+            return photo_path
+    return path
+
+def read_photo_bytes(photo_path, width=150):
+    """Bytes JPEG da variante adequada, lidos direto do disco (sem decodificar)"""
+    path = get_photo_variant(photo_path, width)
+    if not path:
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+def get_photo_data_uri(photo_path, width=60):
+    """Miniatura como data URI, para colunas de imagem em tabelas"""
+    dados = read_photo_bytes(photo_path, width)
+    if not dados:
+        return None
+    return "data:image/jpeg;base64," + base64.b64encode(dados).decode('ascii')
+
+def content_path(image_bytes):
+    """Caminho endereçado pelo conteúdo (sha256 dividido em dois níveis de pastas)"""
+    digest = hashlib.sha256(image_bytes).hexdigest()
+    return os.path.join(UPLOAD_DIR, digest[:2], digest[2:4], f"{digest}.jpg")
+
+def check_photo_upload(uploaded_file):
+    """Validar tipo e tamanho do upload; retorna a mensagem de erro ou None"""
+    if not is_allowed_file(uploaded_file.name):
+        return "Tipo de arquivo não permitido. Use JPG, PNG, GIF ou BMP."
+    if uploaded_file.size > MAX_FILE_SIZE:
+        return f"Arquivo muito grande. Máximo permitido: {MAX_FILE_SIZE // (1024*1024)}MB"
+    return None
+
+def store_photo(file_bytes):
+    """Processar a imagem e gravá-la (com variantes) se o conteúdo ainda não existir"""
+    processed_image, error = validate_image(file_bytes)
+    if error:
+        return None, error
+    
+    file_path = content_path(processed_image)
+    if os.path.exists(file_path):
+        # Mesmo conteúdo já armazenado: só renovar a data para o GC não apagar
+        os.utime(file_path)
+        return file_path, None
+    
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    for size, data in build_variants(processed_image).items():
+        # Gravar em arquivo temporário e renomear: leitores nunca veem arquivo pela metade
+        temp_path = variant_path(file_path, size) + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, variant_path(file_path, size))
+    return file_path, None
+
 def save_socio_photo(uploaded_file, socio_id=None):
-    """Salvar foto do sócio"""
+    """Salvar foto do sócio (processamento síncrono)"""
     try:
-        # Garantir que o diretório existe
-        ensure_upload_dir()
-        
-        # Validar arquivo
-        if not is_allowed_file(uploaded_file.name):
-            return None, "Tipo de arquivo não permitido. Use JPG, PNG, GIF ou BMP."
-        
-        # Verificar tamanho
-        if uploaded_file.size > MAX_FILE_SIZE:
-            return None, f"Arquivo muito grande. Máximo permitido: {MAX_FILE_SIZE // (1024*1024)}MB"
-        
-        # Ler bytes do arquivo
-        file_bytes = uploaded_file.read()
-        
-        # Validar e processar imagem
-        processed_image, error = validate_image(file_bytes)
+        error = check_photo_upload(uploaded_file)
         if error:
             return None, error
-        
-        # Gerar nome único para o arquivo
-        if socio_id:
-            filename = f"socio_{socio_id}_{uuid.uuid4().hex[:8]}.jpg"
-        else:
-            filename = f"socio_{uuid.uuid4().hex[:12]}.jpg"
-        
-        # Caminho completo
-        file_path = os.path.join(UPLOAD_DIR, filename)
-        
-        # Salvar arquivo
-        with open(file_path, 'wb') as f:
-            f.write(processed_image)
-        
-        return file_path, None
-        
+        return store_photo(uploaded_file.read())
     except Exception as e:
         return None, f"Erro ao salvar foto: {str(e)}"
 
+@st.cache_resource
+def get_photo_executor():
+    """Pool de threads compartilhado para processar fotos"""
+    return ThreadPoolExecutor(max_workers=PHOTO_WORKERS, thread_name_prefix="fotos")
+
+def _replace_photo(cpf, file_path):
+    """Gravar socios.foto com a linha travada; retorna (sócio existe, foto anterior)
+
+    Leitura e troca na mesma transação: dois uploads simultâneos do mesmo
+    sócio não leem a mesma foto anterior (a do primeiro não fica órfã).
+    """
+    dialeto = get_sql_dialect()
+    with db.connection() as conn:
+        with conn.cursor() as cursor:
+            # As conexões estão em autocommit: abrir a transação explicitamente
+            cursor.execute(dialeto.begin_write())
+            try:
+                cursor.execute(f"SELECT foto FROM socios WHERE cpf = %s {dialeto.lock_rows()}", (cpf,))
+                atual = cursor.fetchone()
+                if atual:
+                    cursor.execute("UPDATE socios SET foto = %s WHERE cpf = %s", (file_path, cpf))
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+    return atual is not None, atual[0] if atual else None
+
+def _process_socio_photo(file_bytes, cpf):
+    """Processar a foto em segundo plano e vinculá-la ao sócio"""
+    try:
+        file_path, error = store_photo(file_bytes)
+        if error:
+            print(f"Erro ao processar foto do CPF {cpf}: {error}")
+            return None
+        
+        existe, anterior = _replace_photo(cpf, file_path)
+        if existe:
+            invalidate('socios')
+            if anterior and anterior != file_path:
+                release_photo(anterior)
+        return file_path
+    except Exception as e:
+        print(f"Erro ao processar foto do CPF {cpf}: {e}")
+        return None
+
+def queue_socio_photo(uploaded_file, cpf):
+    """Enviar a foto para processamento em segundo plano (chamar após gravar o sócio)
+
+    Retorna (future, None) ou (None, mensagem de erro).
+    """
+    error = check_photo_upload(uploaded_file)
+    if error:
+        return None, error
+    uploaded_file.seek(0)
+    return get_photo_executor().submit(_process_socio_photo, uploaded_file.read(), cpf), None
+
+def release_photo(photo_path):
+    """Apagar a foto se nenhum sócio a referencia mais (contagem de referências)
+
+    Arquivos gravados ou reaproveitados há menos de GC_GRACE_SECONDS não são
+    apagados aqui (podem estar prestes a ser vinculados a outro sócio): uma
+    foto trocada dentro desse prazo só sai na varredura collect_orphan_photos()
+    (python limpar_fotos.py, agendado no cron).
+    """
+    if not photo_path or not os.path.exists(photo_path):
+        return False
+    # Conteúdo regravado há pouco pode estar prestes a ser vinculado a outro sócio
+    if time.time() - os.path.getmtime(photo_path) < GC_GRACE_SECONDS:
+        return False
+    referencias = db.execute_query_one("SELECT COUNT(*) AS total FROM socios WHERE foto = %s", (photo_path,))
+    if not referencias or referencias['total']:
+        return False
+    return delete_socio_photo(photo_path)
+
+def collect_orphan_photos(grace_seconds=GC_GRACE_SECONDS):
+    """Apagar fotos em UPLOAD_DIR que nenhum sócio referencia; retorna quantas foram apagadas"""
+    if not os.path.exists(UPLOAD_DIR):
+        return 0
+    
+    socios = db.execute_query("SELECT DISTINCT foto FROM socios WHERE foto IS NOT NULL", fetch=True)
+    if socios is None:
+        return 0  # Sem conexão: nunca apagar às cegas
+    referenciadas = {os.path.normpath(s['foto']) for s in socios}
+    
+    variante = re.compile(r'_(%s)\.jpg$' % '|'.join(str(size) for size in PHOTO_SIZES))
+    limite = time.time() - grace_seconds
+    apagadas = 0
+    for pasta, _, arquivos in os.walk(UPLOAD_DIR):
+        for nome in arquivos:
+            caminho = os.path.join(pasta, nome)
+            if variante.search(nome) or os.path.normpath(caminho) in referenciadas:
+                continue
+            if os.path.getmtime(caminho) > limite:
+                continue
+            if nome.endswith('.tmp'):
+                os.remove(caminho)
+            elif delete_socio_photo(caminho):
+                apagadas += 1
+    return apagadas
+
 def delete_socio_photo(photo_path):
     """Deletar foto do sócio"""
     try:
         if photo_path and os.path.exists(photo_path):
-            os.remove(photo_path)
+            for size in PHOTO_SIZES:
+                path = variant_path(photo_path, size)
+                if os.path.exists(path):
+                    os.remove(path)
             return True
         return False
     except Exception as e:
@@ -129,9 +312,8 @@ def show_socio_photo(photo_path, width=150, height=150):
         return
     
     try:
-        # Carregar e exibir imagem
-        image = Image.open(photo_path)
-        st.image(image, width=width, caption="Foto do Sócio")
+        # Variante do tamanho exibido, enviada como bytes (sem abrir com PIL)
+        st.image(read_photo_bytes(photo_path, width), width=width, caption="Foto do Sócio")
     except Exception as e:
         st.error(f"Erro ao carregar foto: {e}")
 
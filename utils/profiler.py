@@ -0,0 +1,163 @@
+"""
+Perfil de renderização das páginas
+
+Mede cada execução do roteador de páginas em main.main(), por página e
+ação (socio_action, fatura_action, ...): tempo total, tempo de banco,
+tempo de Python e quantidade de elementos Streamlit enviados ao navegador.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
+from config.instrumentacao import start_measurement, stop_measurement
+
+# Ativado com RENDER_PROFILE=1 (mede e mostra o painel de depuração na sidebar)
+PROFILE_ENABLED = os.getenv('RENDER_PROFILE', '0') == '1'
+
+# Chave da ação de cada página no session_state
+ACTION_KEYS = {
+    "👥 Sócios": 'socio_action',
+    "🏛️ Comandos": 'comando_action',
+    "💰 Faturas": 'fatura_action',
+    "🎫 Planos": 'plano_action',
+    "👤 Usuários": 'usuario_action'
+}
+
+_local = threading.local()
+_patch_lock = threading.Lock()
+
+def _install_element_counter():
+    """Contar elementos enviados (DeltaGenerator._enqueue) durante a medição da thread"""
+    with _patch_lock:
+        if getattr(DeltaGenerator._enqueue, '_contador', False):
+            return
+        original = DeltaGenerator._enqueue
+
+        def _enqueue(self, *args, **kwargs):
+            contagem = getattr(_local, 'elementos', None)
+            if contagem is not None:
+                _local.elementos = contagem + 1
+            return original(self, *args, **kwargs)
+
+        _enqueue._contador = True
+        DeltaGenerator._enqueue = _enqueue
+
+class RenderStats:
+    """Medições acumuladas por página/ação, compartilhadas entre as sessões"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paginas = {}
+
+    def record(self, medicao):
+        chave = (medicao['pagina'], medicao['acao'])
+        with self._lock:
+            stats = self._paginas.setdefault(chave, {
+                'pagina': medicao['pagina'], 'acao': medicao['acao'], 'execucoes': 0,
+                'tempo_total': 0.0, 'tempo_maximo': 0.0, 'tempo_db': 0.0,
+                'tempo_python': 0.0, 'consultas': 0, 'elementos': 0
+            })
+            stats['execucoes'] += 1
+            stats['tempo_total'] += medicao['tempo_total']
+            stats['tempo_maximo'] = max(stats['tempo_maximo'], medicao['tempo_total'])
+            stats['tempo_db'] += medicao['tempo_db']
+            stats['tempo_python'] += medicao['tempo_python']
+            stats['consultas'] += medicao['consultas']
+            stats['elementos'] += medicao['elementos']
+
+    def stats(self):
+        """Médias por página/ação, da mais lenta para a mais rápida"""
+        with self._lock:
+            resultado = []
+            for s in self._paginas.values():
+                n = s['execucoes']
+                resultado.append({
+                    'pagina': s['pagina'], 'acao': s['acao'], 'execucoes': n,
+                    'tempo_medio': s['tempo_total'] / n, 'tempo_maximo': s['tempo_maximo'],
+                    'db_medio': s['tempo_db'] / n, 'python_medio': s['tempo_python'] / n,
+                    'consultas_media': s['consultas'] / n, 'elementos_media': s['elementos'] / n
+                })
+        return sorted(resultado, key=lambda s: s['tempo_medio'], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._paginas.clear()
+
+@st.cache_resource
+def get_render_stats():
+    """Estatísticas compartilhadas por todas as sessões do processo"""
+    _install_element_counter()
+    return RenderStats()
+
+@contextmanager
+def profile_render(pagina):
+    """Medir a renderização de uma página (use em volta do roteamento)"""
+    stats = get_render_stats()
+    medicao = {'pagina': pagina, 'acao': None}
+    _local.elementos = 0
+    start_measurement()
+    inicio = time.perf_counter()
+    try:
+        yield medicao
+    finally:
+        tempo_total = time.perf_counter() - inicio
+        banco = stop_measurement() or {'tempo_db': 0.0, 'consultas': 0}
+        elementos = _local.elementos
+        _local.elementos = None
+
+        acao_key = ACTION_KEYS.get(pagina)
+        medicao.update({
+            'acao': st.session_state.get(acao_key, 'list') if acao_key else None,
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'tempo_total': tempo_total,
+            'tempo_db': banco['tempo_db'],
+            'tempo_python': max(tempo_total - banco['tempo_db'], 0.0),
+            'consultas': banco['consultas'],
+            'elementos': elementos
+        })
+        stats.record(medicao)
+        st.session_state['perfil_ultima_execucao'] = medicao
+
+def export_json():
+    """Medições acumuladas em JSON (para comparar entre versões)"""
+    return json.dumps({
+        'gerado_em': datetime.now().isoformat(timespec='seconds'),
+        'paginas': get_render_stats().stats()
+    }, ensure_ascii=False, indent=2)
+
+def show_profiler_panel(container):
+    """Painel de depuração com a última execução e as médias por página"""
+    medicao = st.session_state.get('perfil_ultima_execucao')
+    with container:
+        with st.expander("🐞 Perfil de renderização"):
+            if medicao:
+                acao = f" / {medicao['acao']}" if medicao['acao'] else ""
+                st.caption(f"{medicao['pagina']}{acao}")
+                st.write(f"Total: **{medicao['tempo_total'] * 1000:.0f} ms**")
+                st.write(f"Banco: {medicao['tempo_db'] * 1000:.0f} ms ({medicao['consultas']} consultas)")
+                st.write(f"Python: {medicao['tempo_python'] * 1000:.0f} ms")
+                st.write(f"Elementos: {medicao['elementos']}")
+            
+            stats = get_render_stats().stats()
+            if stats:
+                st.dataframe(
+                    [{
+                        'Página': s['pagina'] + (f" / {s['acao']}" if s['acao'] else ""),
+                        'Média (ms)': round(s['tempo_medio'] * 1000),
+                        'Banco (ms)': round(s['db_medio'] * 1000),
+                        'Elementos': round(s['elementos_media'])
+                    } for s in stats],
+                    hide_index=True
+                )
+                st.download_button(
+                    "⬇️ Exportar JSON",
+                    data=export_json(),
+                    file_name="perfil_renderizacao.json",
+                    mime="application/json",
+                    key="btn_exportar_perfil"
+                )
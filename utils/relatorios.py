@@ -0,0 +1,176 @@
+"""
+Relatórios de faturas por período
+
+Todo filtro de período vira um intervalo semiaberto sobre a coluna
+(data_vencimento >= inicio AND data_vencimento < fim, montado com
+config/dialeto.Filtros), que usa os índices de data, em vez de
+MONTH()/YEAR() aplicados à coluna, que obrigam a ler a tabela inteira.
+Os resultados ficam em cache por (intervalo, comando) e são invalidados
+pelas escritas em faturas e comandos.
+
+Intervalos de meses completos são lidos de faturas_monthly (totais por
+mês, comando, plano e forma de pagamento, mantidos por gatilhos em
+faturas): cinco anos de tendência são algumas centenas de linhas.
+
+Os relatórios devolvem DataFrames lidos por coluna (db.fetch_frame), já
+no formato usado pelas tabelas e gráficos das páginas.
+"""
+
+from datetime import date
+import pandas as pd
+import streamlit as st
+from config.database import db
+from config.dialeto import Filtros, get_sql_dialect
+from utils.cache import cached_query
+from utils.faturamento import add_months
+
+# Períodos rápidos dos filtros de faturas
+PERIODOS = ["Todos", "Este mês", "Últimos 3 meses", "Este ano"]
+
+def month_start(data):
+    """Primeiro dia do mês da data"""
+    return data.replace(day=1)
+
+def period_range(periodo, hoje=None):
+    """Intervalo (inicio, fim) de um período rápido; fim é exclusivo e None é aberto"""
+    hoje = hoje or date.today()
+    if periodo == "Este mês":
+        inicio = month_start(hoje)
+        return inicio, add_months(inicio, 1)
+    if periodo == "Últimos 3 meses":
+        return add_months(hoje, -3), None
+    if periodo == "Este ano":
+        return date(hoje.year, 1, 1), date(hoje.year + 1, 1, 1)
+    return None, None
+
+# Agrupamentos da página de tendências: coluna de faturas_monthly e tabela com o nome
+DIMENSOES = {
+    'comando': ('comando_id', "SELECT id, nome FROM comandos"),
+    'plano': ('plano_id', "SELECT id, nome FROM planos"),
+    'forma_pagamento': ('forma_pagamento', None),
+}
+
+def is_month_aligned(inicio, fim):
+    """Intervalo formado por meses completos (pode ser lido de faturas_monthly)"""
+    return all(d is None or d.day == 1 for d in (inicio, fim))
+
+def _monthly_filter(inicio, fim, comando_id):
+    filtros = Filtros().date_range('mes', inicio, fim).equals('comando_id', comando_id or None)
+    return filtros.where(), filtros.params
+
+@cached_query('faturas', 'comandos')
+def get_comando_report(inicio=None, fim=None, comando_id=0):
+    """Totais de faturas por comando com vencimento no intervalo"""
+    if is_month_aligned(inicio, fim):
+        where, params = _monthly_filter(inicio, fim, comando_id)
+        origem = f"""
+        SELECT comando_id,
+               SUM(faturas) AS total_faturas,
+               SUM(valor) AS valor_total,
+               SUM(pagas) AS faturas_pagas,
+               SUM(valor_pago) AS valor_pago,
+               SUM(atrasadas) AS faturas_atrasadas
+        FROM faturas_monthly
+        {where}
+        GROUP BY comando_id
+        """
+    else:
+        filtros = Filtros().date_range('data_vencimento', inicio, fim).equals('comando_id', comando_id or None)
+        where, params = filtros.where(), filtros.params
+        dialeto = get_sql_dialect()
+        origem = f"""
+        SELECT comando_id,
+               COUNT(*) AS total_faturas,
+               SUM(valor) AS valor_total,
+               {dialeto.count_where("status = 'Pago'")} AS faturas_pagas,
+               {dialeto.sum_where('valor', "status = 'Pago'")} AS valor_pago,
+               {dialeto.count_where("status = 'Atrasado'")} AS faturas_atrasadas
+        FROM faturas
+        {where}
+        GROUP BY comando_id
+        """
+
+    # Agregar as faturas primeiro e só então juntar os nomes dos comandos
+    query = f"""
+    SELECT c.id AS comando_id, c.nome AS comando,
+           COALESCE(r.total_faturas, 0) AS total_faturas,
+           COALESCE(r.valor_total, 0) AS valor_total,
+           COALESCE(r.faturas_pagas, 0) AS faturas_pagas,
+           COALESCE(r.valor_pago, 0) AS valor_pago,
+           COALESCE(r.faturas_atrasadas, 0) AS faturas_atrasadas
+    FROM comandos c
+    LEFT JOIN ({origem}) r ON r.comando_id = c.id
+    {"WHERE c.id = %s" if comando_id else ""}
+    ORDER BY valor_total DESC, c.nome
+    """
+    if comando_id:
+        params.append(comando_id)
+
+    try:
+        return db.fetch_frame(query, params)
+    except Exception as e:
+        st.error(f"Erro ao gerar relatório por comando: {e}")
+        return pd.DataFrame()
+
+@cached_query('faturas')
+def get_monthly_rollup(inicio=None, fim=None, comando_id=0):
+    """Totais por mês de vencimento no intervalo (para gráficos)
+
+    Meses parciais nas pontas do intervalo entram inteiros.
+    """
+    where, params = _monthly_filter(inicio and month_start(inicio), fim, comando_id)
+    query = f"""
+    SELECT mes,
+           SUM(faturas) AS total_faturas,
+           SUM(valor) AS valor_total,
+           SUM(pagas) AS faturas_pagas,
+           SUM(valor_pago) AS valor_pago,
+           SUM(atrasadas) AS faturas_atrasadas,
+           SUM(recebidas) AS faturas_recebidas,
+           SUM(valor_recebido) AS valor_recebido
+    FROM faturas_monthly
+    {where}
+    GROUP BY mes
+    HAVING SUM(faturas) <> 0 OR SUM(recebidas) <> 0
+    ORDER BY mes
+    """
+
+    try:
+        return db.fetch_frame(query, params)
+    except Exception as e:
+        st.error(f"Erro ao gerar totais mensais: {e}")
+        return pd.DataFrame()
+
+@cached_query('faturas', 'comandos', 'planos')
+def get_trends(inicio=None, fim=None, dimensao=None, granularidade='mes'):
+    """Totais por mês ou ano, opcionalmente separados por comando, plano ou forma de pagamento"""
+    where, params = _monthly_filter(inicio, fim, 0)
+    periodo = get_sql_dialect().truncate_date('year', 'mes') if granularidade == 'ano' else "mes"
+    coluna = DIMENSOES[dimensao][0] if dimensao else "NULL"
+
+    query = f"""
+    SELECT {periodo} AS periodo, {coluna} AS grupo,
+           SUM(valor) AS valor_emitido,
+           SUM(valor_recebido) AS valor_recebido,
+           SUM(valor_atrasado) AS valor_atrasado,
+           SUM(faturas) AS faturas,
+           SUM(recebidas) AS recebidas
+    FROM faturas_monthly
+    {where}
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+    """
+
+    try:
+        tendencias = db.fetch_frame(query, params)
+    except Exception as e:
+        st.error(f"Erro ao gerar tendências: {e}")
+        return pd.DataFrame()
+
+    # Trocar ids pelos nomes (comandos e planos são tabelas pequenas)
+    if dimensao and DIMENSOES[dimensao][1]:
+        nomes = {r['id']: r['nome'] for r in db.execute_query(DIMENSOES[dimensao][1], fetch=True) or []}
+        tendencias['grupo'] = tendencias['grupo'].map(nomes).fillna("Sem plano" if dimensao == 'plano' else "—")
+    elif dimensao:
+        tendencias['grupo'] = tendencias['grupo'].fillna("Não informada")
+    return tendencias
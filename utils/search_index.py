@@ -0,0 +1,241 @@
+"""
+Índice de busca de sócios por n-gramas (insensível a acentos e maiúsculas)
+
+Cobre nome, CPF, e-mail e telefone. O índice fica em memória, compartilhado
+entre as sessões do Streamlit, e é atualizado a cada cadastro, edição ou
+exclusão de sócio em vez de ser reconstruído. Cada n-grama guarda um set de
+ids, então atualizar ou remover um sócio custa O(n-gramas do sócio).
+
+Cada alteração também incrementa VERSAO_INDICE em cache_versions: os
+outros processos do app (e réplicas) recarregam o índice ao ver a versão
+nova, enquanto o processo que gravou só atualiza o seu.
+"""
+
+import math
+import re
+import threading
+import time
+import unicodedata
+import heapq
+from collections import Counter, defaultdict
+import streamlit as st
+from utils.cache import get_table_versions, bump_db_version
+
+# Configurações
+NGRAM_SIZE = 3
+MIN_QUERY_LENGTH = 2
+MIN_SCORE = 0.7  # Fração mínima dos n-gramas da busca que precisa estar no sócio
+RELOAD_INTERVAL = 3600  # Recarga de segurança (segundos), mesmo sem versão nova
+
+# Versão em cache_versions incrementada a cada sócio gravado (index_socio,
+# unindex_socio, importar_socios.py): os processos recarregam o índice ao vê-la mudar
+VERSAO_INDICE = 'socios_search_index'
+
+def normalize_text(text):
+    """Remover acentos, pontuação e maiúsculas"""
+    if not text:
+        return ""
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+
+def normalize_query(query):
+    """Normalizar termo de busca (CPF/telefone digitados com máscara viram só dígitos)"""
+    query = normalize_text(query)
+    if query and not re.search(r'[a-z]', query):
+        return query.replace(' ', '')
+    return query
+
+def _document_ngrams(text):
+    """N-gramas de cada palavra do texto, com espaço delimitando início e fim"""
+    grams = set()
+    for word in text.split():
+        padded = f" {word} "
+        for i in range(len(padded) - NGRAM_SIZE + 1):
+            grams.add(padded[i:i + NGRAM_SIZE])
+    return grams
+
+def _query_ngrams(query):
+    """N-gramas da busca (palavras incompletas casam como prefixo ou trecho)
+
+    Palavras curtas demais até para o n-grama de início (" a") ficam de
+    fora; search() as procura como prefixo de alguma palavra do sócio.
+    """
+    grams = set()
+    for word in query.split():
+        if len(word) >= NGRAM_SIZE:
+            for i in range(len(word) - NGRAM_SIZE + 1):
+                grams.add(word[i:i + NGRAM_SIZE])
+        elif len(word) == NGRAM_SIZE - 1:
+            grams.add(f" {word}")
+    return grams
+
+def _short_words(query):
+    """Palavras da busca sem n-grama (procuradas como prefixo)"""
+    return [word for word in query.split() if len(word) < NGRAM_SIZE - 1]
+
+def _has_prefixes(texto, prefixos):
+    """Cada prefixo começa alguma palavra do texto"""
+    palavras = texto.split()
+    return all(any(p.startswith(prefixo) for p in palavras) for prefixo in prefixos)
+
+class SearchIndex:
+    """Índice invertido n-grama -> ids de sócios"""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = defaultdict(set)
+        self._docs = {}  # id -> (texto indexado, nome normalizado, comando_id)
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, socio_id, nome, cpf=None, email=None, telefone=None, comando_id=None):
+        """Indexar (ou reindexar) um sócio"""
+        nome_normalizado = normalize_text(nome)
+        digitos_cpf = re.sub(r'[^0-9]', '', cpf or '')
+        digitos_telefone = re.sub(r'[^0-9]', '', telefone or '')
+        texto = ' '.join(p for p in [nome_normalizado, normalize_text(email), digitos_cpf, digitos_telefone] if p)
+
+        with self._lock:
+            self.remove(socio_id)
+            for gram in _document_ngrams(texto):
+                self._postings[gram].add(socio_id)
+            self._docs[socio_id] = (texto, nome_normalizado, comando_id)
+
+    def remove(self, socio_id):
+        """Remover um sócio do índice"""
+        with self._lock:
+            doc = self._docs.pop(socio_id, None)
+            if not doc:
+                return
+            for gram in _document_ngrams(doc[0]):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    continue
+                posting.discard(socio_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def search(self, query, limit=None, comando_id=None):
+        """Buscar sócios, retornando os ids ordenados por relevância"""
+        query = normalize_query(query)
+        if len(query.replace(' ', '')) < MIN_QUERY_LENGTH:
+            return []
+
+        grams = _query_ngrams(query)
+        prefixos = _short_words(query)
+        with self._lock:
+            if grams:
+                contagem = Counter()
+                for gram in grams:
+                    posting = self._postings.get(gram)
+                    if posting:
+                        contagem.update(posting)
+                minimo = max(1, math.ceil(len(grams) * MIN_SCORE))
+            else:
+                # Só palavras curtas (ex.: iniciais "j s"): varrer todos os sócios
+                contagem = dict.fromkeys(self._docs, 0)
+                minimo = 0
+
+            candidatos = []
+            for socio_id, acertos in contagem.items():
+                if acertos < minimo:
+                    continue
+                texto, nome, doc_comando_id = self._docs[socio_id]
+                if comando_id and doc_comando_id != comando_id:
+                    continue
+                if prefixos and not _has_prefixes(texto, prefixos):
+                    continue
+                # Trecho exato e nome começando pela busca sobem no ranking
+                bonus = (query in texto) + nome.startswith(query)
+                candidatos.append((acertos / len(grams) if grams else 1.0, bonus, nome, socio_id))
+
+        chave = lambda c: (-c[0], -c[1], c[2], c[3])
+        if limit:
+            candidatos = heapq.nsmallest(limit, candidatos, key=chave)
+        else:
+            candidatos.sort(key=chave)
+        return [c[3] for c in candidatos]
+
+class _IndiceCarregado:
+    """Índice do processo e a versão de VERSAO_INDICE que ele já contém"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.index = None
+        self.versao = 0
+        self.carregado_em = None
+
+@st.cache_resource
+def _get_loaded_index():
+    """Estado compartilhado por todas as sessões do processo"""
+    return _IndiceCarregado()
+
+def get_search_index():
+    """Índice de busca compartilhado, recarregado quando outro processo altera sócios"""
+    versao_banco, _ = get_table_versions().get((VERSAO_INDICE,))[0]
+    estado = _get_loaded_index()
+    with estado.lock:
+        # A versão só cresce: uma leitura atrasada (cache de CACHE_CHECK_INTERVAL) não recarrega
+        if (estado.index is None or versao_banco > estado.versao
+                or time.monotonic() - estado.carregado_em > RELOAD_INTERVAL):
+            try:
+                estado.index = _load_search_index()
+            except RuntimeError as e:
+                if estado.index is None:
+                    raise
+                # Sem banco: continuar com o índice anterior e tentar de novo na próxima busca
+                print(f"Erro ao recarregar o índice de busca: {e}")
+                return estado.index
+            estado.versao = max(estado.versao, versao_banco)
+            estado.carregado_em = time.monotonic()
+        return estado.index
+
+def _publish_change():
+    """Incrementar VERSAO_INDICE para os outros processos, sem recarregar o índice deste"""
+    try:
+        versao = bump_db_version(VERSAO_INDICE)
+    except Exception as e:
+        print(f"Erro ao publicar a versão do índice de busca: {e}")
+        return
+    estado = _get_loaded_index()
+    with estado.lock:
+        # Sem escrita de outro processo no meio, o índice local já está na versão nova;
+        # senão a próxima busca vê a versão maior e recarrega
+        if estado.index is not None and versao == estado.versao + 1:
+            estado.versao = versao
+
+def _load_search_index():
+    """Montar o índice com todos os sócios do banco"""
+    from config.database import db
+
+    index = SearchIndex()
+    socios = db.execute_query(
+        "SELECT id, nome_completo, cpf, email, telefone, comando_id FROM socios",
+        fetch=True
+    )
+    if socios is None:
+        # Exceção: get_search_index mantém o índice anterior (se houver)
+        raise RuntimeError("Não foi possível carregar o índice de busca de sócios")
+    for socio in socios:
+        index.add(socio['id'], socio['nome_completo'], socio['cpf'], socio['email'],
+                  socio['telefone'], socio['comando_id'])
+    return index
+
+def index_socio(socio_id, nome, cpf, email, telefone, comando_id):
+    """Atualizar um sócio no índice após cadastro ou edição"""
+    try:
+        get_search_index().add(socio_id, nome, cpf, email, telefone, comando_id)
+    except RuntimeError as e:
+        # Sem índice carregado: a próxima carga já lê o sócio do banco
+        print(f"Erro ao indexar sócio {socio_id}: {e}")
+    _publish_change()
+
+def unindex_socio(socio_id):
+    """Remover um sócio do índice após exclusão"""
+    try:
+        get_search_index().remove(socio_id)
+    except RuntimeError as e:
+        print(f"Erro ao remover sócio {socio_id} do índice: {e}")
+    _publish_change()
@@ -0,0 +1,100 @@
+"""
+Gravação de sócios numa única instrução
+
+O cadastro e a edição não consultam antes se o CPF ou o e-mail já existem:
+o INSERT/UPDATE conta com as restrições UNIQUE da tabela (sem corrida
+entre dois cadastros simultâneos) e a violação vira RegistroDuplicado. As
+datas do plano (adesão hoje, vencimento em meses de calendário conforme a
+periodicidade) são calculadas na mesma instrução, que as devolve com
+RETURNING junto com o id.
+"""
+
+import re
+from config.database import db
+from config.dialeto import get_sql_dialect
+from utils.faturamento import MESES_PLANO_SQL
+
+# Colunas com UNIQUE em socios; o nome aparece no erro do banco
+# (restrição socios_cpf_key no PostgreSQL, "UNIQUE constraint failed: socios.cpf" no SQLite)
+_RE_DUPLICADO = re.compile(r'socios[._](cpf|email)')
+
+COLUNAS_ENDERECO = ['cep', 'endereco', 'numero', 'complemento', 'bairro', 'cidade', 'estado']
+
+class RegistroDuplicado(Exception):
+    """CPF ou e-mail já usado por outro sócio (campo: 'cpf' ou 'email')"""
+
+    def __init__(self, campo):
+        super().__init__(f"{campo} já cadastrado")
+        self.campo = campo
+
+def duplicated_field(erro):
+    """'cpf' ou 'email' se o erro for a violação do UNIQUE da coluna, senão None"""
+    diag = getattr(erro, 'diag', None)
+    texto = getattr(diag, 'constraint_name', None) or str(erro)
+    encontrado = _RE_DUPLICADO.search(texto)
+    return encontrado.group(1) if encontrado else None
+
+def _gravar(query, params):
+    try:
+        return db.execute_returning(query, params)
+    except Exception as e:
+        campo = duplicated_field(e)
+        if campo:
+            raise RegistroDuplicado(campo) from e
+        raise
+
+def _params(nome, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, foto, plano_id, endereco_data):
+    params = {
+        'nome': nome, 'foto': foto, 'cpf': cpf, 'data_nascimento': data_nascimento, 'email': email,
+        'telefone': telefone, 'tamanho_camisa': tamanho_camisa, 'comando_id': comando_id, 'plano_id': plano_id
+    }
+    params.update({coluna: endereco_data.get(coluna) for coluna in COLUNAS_ENDERECO})
+    return params
+
+def insert_socio(nome, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, foto, plano_id, endereco_data):
+    """Cadastrar o sócio; retorna {'id', 'data_adesao_plano', 'data_vencimento_plano'}
+
+    Levanta RegistroDuplicado se o CPF ou o e-mail já estiver cadastrado.
+    """
+    vencimento = get_sql_dialect().add_months('CURRENT_DATE', MESES_PLANO_SQL)
+    query = f"""
+    INSERT INTO socios (nome_completo, foto, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id,
+                        plano_id, data_adesao_plano, data_vencimento_plano, {', '.join(COLUNAS_ENDERECO)})
+    SELECT %(nome)s, %(foto)s, %(cpf)s, %(data_nascimento)s, %(email)s, %(telefone)s, %(tamanho_camisa)s, %(comando_id)s,
+           p.id,
+           CASE WHEN p.id IS NOT NULL THEN CURRENT_DATE END,
+           CASE WHEN p.id IS NOT NULL THEN {vencimento} END,
+           {', '.join(f'%({coluna})s' for coluna in COLUNAS_ENDERECO)}
+    FROM (SELECT 1 AS um) novo
+    LEFT JOIN planos p ON p.id = %(plano_id)s
+    RETURNING id, data_adesao_plano, data_vencimento_plano
+    """
+    return _gravar(query, _params(nome, cpf, data_nascimento, email, telefone, tamanho_camisa,
+                                  comando_id, foto, plano_id, endereco_data))
+
+def update_socio_row(socio_id, nome, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, foto, plano_id, endereco_data):
+    """Atualizar todos os campos do sócio; retorna {'id', 'data_adesao_plano', 'data_vencimento_plano'}
+
+    As datas do plano só mudam se o plano mudar (novo plano: adesão hoje;
+    sem plano: sem datas). Retorna None se o sócio não existir e levanta
+    RegistroDuplicado se o CPF ou o e-mail for de outro sócio.
+    """
+    meses = f"(SELECT {MESES_PLANO_SQL} FROM planos p WHERE p.id = %(plano_id)s)"
+    query = f"""
+    UPDATE socios
+    SET nome_completo = %(nome)s, foto = %(foto)s, cpf = %(cpf)s, data_nascimento = %(data_nascimento)s,
+        email = %(email)s, telefone = %(telefone)s, tamanho_camisa = %(tamanho_camisa)s, comando_id = %(comando_id)s,
+        data_adesao_plano = CASE WHEN %(plano_id)s IS NULL THEN NULL
+                                 WHEN plano_id = %(plano_id)s THEN data_adesao_plano
+                                 ELSE CURRENT_DATE END,
+        data_vencimento_plano = CASE WHEN %(plano_id)s IS NULL THEN NULL
+                                     WHEN plano_id = %(plano_id)s THEN data_vencimento_plano
+                                     ELSE {get_sql_dialect().add_months('CURRENT_DATE', meses)} END,
+        plano_id = %(plano_id)s,
+        {', '.join(f'{coluna} = %({coluna})s' for coluna in COLUNAS_ENDERECO)}
+    WHERE id = %(socio_id)s
+    RETURNING id, data_adesao_plano, data_vencimento_plano
+    """
+    params = _params(nome, cpf, data_nascimento, email, telefone, tamanho_camisa, comando_id, foto, plano_id, endereco_data)
+    params['socio_id'] = socio_id
+    return _gravar(query, params)
@@ -0,0 +1,260 @@
+"""
+Importação em lote de sócios a partir de CSV ou XLSX
+
+O arquivo é lido em blocos. Cada bloco é validado de forma vetorizada
+(pandas + utils.validators), comparado com os CPFs/e-mails já cadastrados
+numa única consulta e inserido com db.execute_values (várias linhas por
+instrução).
+"""
+
+import io
+import os
+from datetime import date
+import pandas as pd
+from config.database import db
+from utils.validators import validate_cpf, validate_email, validate_phone, validate_cep
+from utils.search_index import normalize_text
+from utils.faturamento import next_due_date
+
+# Configurações
+BATCH_SIZE = 1000
+ALLOWED_EXTENSIONS = ['.csv', '.xlsx']
+TAMANHOS_CAMISA = ["PP", "P", "M", "G", "GG", "XG", "XXG"]
+
+# Nomes aceitos no cabeçalho (normalizados) -> coluna da tabela socios
+COLUMN_ALIASES = {
+    'nome': 'nome_completo', 'nome completo': 'nome_completo', 'nome_completo': 'nome_completo',
+    'cpf': 'cpf',
+    'data nascimento': 'data_nascimento', 'data de nascimento': 'data_nascimento',
+    'data_nascimento': 'data_nascimento', 'nascimento': 'data_nascimento',
+    'email': 'email', 'e mail': 'email',
+    'telefone': 'telefone', 'whatsapp': 'telefone', 'celular': 'telefone',
+    'tamanho camisa': 'tamanho_camisa', 'tamanho da camisa': 'tamanho_camisa',
+    'tamanho_camisa': 'tamanho_camisa', 'camisa': 'tamanho_camisa',
+    'comando': 'comando', 'comando id': 'comando', 'comando_id': 'comando',
+    'plano': 'plano', 'plano id': 'plano', 'plano_id': 'plano',
+    'cep': 'cep', 'endereco': 'endereco', 'rua': 'endereco', 'numero': 'numero',
+    'complemento': 'complemento', 'bairro': 'bairro', 'cidade': 'cidade',
+    'estado': 'estado', 'uf': 'estado'
+}
+
+REQUIRED_COLUMNS = ['nome_completo', 'cpf', 'data_nascimento', 'email', 'telefone', 'comando']
+
+INSERT_COLUMNS = [
+    'nome_completo', 'cpf', 'data_nascimento', 'email', 'telefone', 'tamanho_camisa', 'comando_id',
+    'plano_id', 'data_adesao_plano', 'data_vencimento_plano',
+    'cep', 'endereco', 'numero', 'complemento', 'bairro', 'cidade', 'estado'
+]
+
+def _cell_text(valor):
+    """Célula do XLSX como texto (número inteiro guardado como float sai sem o .0)"""
+    if valor is None:
+        return ''
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+def read_chunks(file, filename, chunk_size=BATCH_SIZE):
+    """Ler o arquivo em blocos de DataFrame (todas as colunas como texto)"""
+    ext = os.path.splitext(filename.lower())[1]
+
+    if ext == '.csv':
+        # Aceita separador vírgula ou ponto e vírgula (Excel em português)
+        amostra = file.read(4096)
+        file.seek(0)
+        if isinstance(amostra, bytes):
+            amostra = amostra.decode('utf-8-sig', errors='ignore')
+        sep = ';' if amostra.count(';') > amostra.count(',') else ','
+        yield from pd.read_csv(file, sep=sep, dtype=str, keep_default_na=False,
+                               chunksize=chunk_size, encoding='utf-8-sig')
+    elif ext == '.xlsx':
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ValueError("Instale o openpyxl para importar arquivos XLSX: pip install openpyxl")
+        workbook = load_workbook(file, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(h) if h is not None else '' for h in next(rows, [])]
+        bloco = []
+        for row in rows:
+            bloco.append([_cell_text(v) for v in row])
+            if len(bloco) >= chunk_size:
+                yield pd.DataFrame(bloco, columns=header)
+                bloco = []
+        if bloco:
+            yield pd.DataFrame(bloco, columns=header)
+        workbook.close()
+    else:
+        raise ValueError("Tipo de arquivo não permitido. Use CSV ou XLSX.")
+
+def normalize_columns(df):
+    """Renomear colunas do arquivo para os nomes da tabela socios"""
+    renomear = {}
+    for coluna in df.columns:
+        chave = normalize_text(coluna)
+        if chave in COLUMN_ALIASES:
+            renomear[coluna] = COLUMN_ALIASES[chave]
+    df = df.rename(columns=renomear)
+    faltando = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+    if faltando:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(faltando)}")
+    return df
+
+def _lookup(series, by_id, by_name):
+    """Resolver comando/plano informado por id ou por nome"""
+    texto = series.str.strip()
+    ids = pd.to_numeric(texto, errors='coerce')
+    por_id = ids.map(lambda i: i if i in by_id else None)
+    por_nome = texto.map(lambda n: by_name.get(normalize_text(n)))
+    return por_id.where(por_id.notna(), por_nome)
+
+def _zero_pad(digitos, tamanho, minimo=1):
+    """Completar com zeros à esquerda os valores com `minimo` a `tamanho` dígitos (vazios ficam vazios)"""
+    return digitos.where(digitos.str.len() < minimo, digitos.str.zfill(tamanho))
+
+def validate_chunk(df, comandos, planos, first_line):
+    """Validar um bloco, retornando (linhas válidas, erros [(linha, mensagem)])"""
+    df = df.copy()
+    df.index = range(first_line, first_line + len(df))
+
+    for coluna in ['tamanho_camisa', 'plano', 'cep', 'endereco', 'numero', 'complemento', 'bairro', 'cidade', 'estado']:
+        if coluna not in df.columns:
+            df[coluna] = ''
+    df = df.fillna('').astype(str)
+
+    df['nome_completo'] = df['nome_completo'].str.strip()
+    # CPF e CEP digitados como número no Excel perdem os zeros à esquerda
+    df['cpf'] = _zero_pad(df['cpf'].str.replace(r'[^0-9]', '', regex=True), 11)
+    df['email'] = df['email'].str.strip().str.lower()
+    df['telefone'] = df['telefone'].str.replace(r'[^0-9]', '', regex=True)
+    # O menor CEP é 01000-000: como número tem 7 dígitos; menos que isso é erro de digitação
+    df['cep'] = _zero_pad(df['cep'].str.replace(r'[^0-9]', '', regex=True), 8, minimo=7)
+    df['tamanho_camisa'] = df['tamanho_camisa'].str.strip().str.upper().replace('', 'M')
+    df['estado'] = df['estado'].str.strip().str.upper()
+    # Datas no formato brasileiro (dd/mm/aaaa) ou ISO (aaaa-mm-dd, como vem do Excel)
+    nascimento = df['data_nascimento'].str.strip().str[:10]
+    df['data_nascimento'] = pd.to_datetime(nascimento, format='%Y-%m-%d', errors='coerce').fillna(
+        pd.to_datetime(nascimento, format='%d/%m/%Y', errors='coerce')).dt.date
+
+    comandos_por_id = {c['id']: c['id'] for c in comandos}
+    comandos_por_nome = {normalize_text(c['nome']): c['id'] for c in comandos}
+    planos_por_id = {p['id']: p for p in planos}
+    planos_por_nome = {normalize_text(p['nome']): p['id'] for p in planos}
+    df['comando_id'] = _lookup(df['comando'], comandos_por_id, comandos_por_nome)
+    df['plano_id'] = _lookup(df['plano'], planos_por_id, planos_por_nome)
+
+    # Cada verificação gera uma máscara de linhas inválidas
+    verificacoes = [
+        (df['nome_completo'] == '', "Nome completo é obrigatório"),
+        (~df['cpf'].map(validate_cpf), "CPF inválido"),
+        (df['data_nascimento'].isna() | (df['data_nascimento'] > date.today()), "Data de nascimento inválida"),
+        (~df['email'].map(validate_email), "E-mail inválido"),
+        (~df['telefone'].map(validate_phone), "Telefone inválido"),
+        (~df['tamanho_camisa'].isin(TAMANHOS_CAMISA), "Tamanho da camisa inválido"),
+        (df['comando_id'].isna(), "Comando não encontrado"),
+        ((df['plano'].str.strip() != '') & df['plano_id'].isna(), "Plano não encontrado"),
+        ((df['cep'] != '') & ~df['cep'].map(validate_cep), "CEP inválido"),
+        (df['cpf'].duplicated(keep='first'), "CPF repetido no arquivo"),
+        (df['email'].duplicated(keep='first'), "E-mail repetido no arquivo")
+    ]
+
+    erros = []
+    invalidas = pd.Series(False, index=df.index)
+    for mascara, mensagem in verificacoes:
+        mascara = mascara.fillna(True) & ~invalidas  # Um erro por linha
+        erros.extend((linha, mensagem) for linha in df.index[mascara])
+        invalidas |= mascara
+
+    validas = df[~invalidas].copy()
+
+    # Datas do plano (mesma regra do faturamento recorrente)
+    hoje = date.today()
+    periodicidade = validas['plano_id'].map(lambda p: planos_por_id[p]['periodicidade'] if p in planos_por_id else None)
+    validas['data_adesao_plano'] = validas['plano_id'].map(lambda p: hoje if pd.notna(p) else None)
+    validas['data_vencimento_plano'] = periodicidade.map(lambda p: next_due_date(hoje, p) if p else None)
+
+    return validas, erros
+
+def find_existing(cpfs, emails):
+    """CPFs e e-mails já cadastrados, numa única consulta"""
+    if not cpfs and not emails:
+        return set(), set()
+    query = f"""
+    SELECT cpf, email FROM socios
+    WHERE cpf IN ({', '.join(['%s'] * len(cpfs)) or 'NULL'})
+       OR email IN ({', '.join(['%s'] * len(emails)) or 'NULL'})
+    """
+    result = db.execute_query(query, list(cpfs) + list(emails), fetch=True) or []
+    return {r['cpf'] for r in result}, {r['email'] for r in result}
+
+def insert_batch(df):
+    """Inserir um bloco de sócios; retorna as linhas efetivamente inseridas"""
+    if df.empty:
+        return []
+
+    def valor(v):
+        if v is None or (isinstance(v, float) and pd.isna(v)) or v == '':
+            return None
+        return int(v) if isinstance(v, float) else v
+
+    registros = [tuple(valor(v) for v in row) for row in df[INSERT_COLUMNS].itertuples(index=False)]
+    query = f"""
+    INSERT INTO socios ({', '.join(INSERT_COLUMNS)}) VALUES %s
+    ON CONFLICT DO NOTHING
+    RETURNING id, nome_completo, cpf, email, telefone, comando_id
+    """
+    return db.execute_values(query, registros, chunk_size=len(registros), fetch=True)
+
+def import_socios(file, filename, batch_size=BATCH_SIZE, on_progress=None):
+    """Importar sócios de um arquivo CSV/XLSX
+
+    Retorna {'total', 'importados', 'erros': [(linha, mensagem)], 'inseridos'}.
+    As linhas são numeradas como na planilha (cabeçalho = linha 1).
+    """
+    comandos = db.execute_query("SELECT id, nome FROM comandos", fetch=True) or []
+    planos = db.execute_query("SELECT id, nome, periodicidade FROM planos", fetch=True) or []
+
+    resultado = {'total': 0, 'importados': 0, 'erros': [], 'inseridos': []}
+    vistos_cpf, vistos_email = set(), set()
+    primeira_linha = 2
+
+    for bloco in read_chunks(file, filename, batch_size):
+        bloco = normalize_columns(bloco)
+        validas, erros = validate_chunk(bloco, comandos, planos, primeira_linha)
+        resultado['erros'].extend(erros)
+
+        # Duplicados em blocos anteriores do mesmo arquivo
+        repetidas = validas['cpf'].isin(vistos_cpf) | validas['email'].isin(vistos_email)
+        resultado['erros'].extend((linha, "CPF ou e-mail repetido no arquivo") for linha in validas.index[repetidas])
+        validas = validas[~repetidas]
+        vistos_cpf.update(validas['cpf'])
+        vistos_email.update(validas['email'])
+
+        # Duplicados no banco
+        cpfs_existentes, emails_existentes = find_existing(set(validas['cpf']), set(validas['email']))
+        ja_cadastradas = validas['cpf'].isin(cpfs_existentes) | validas['email'].isin(emails_existentes)
+        resultado['erros'].extend((linha, "CPF ou e-mail já cadastrado") for linha in validas.index[ja_cadastradas])
+        validas = validas[~ja_cadastradas]
+
+        inseridos = insert_batch(validas)
+        # Conflitos de cadastros simultâneos (ON CONFLICT DO NOTHING)
+        cpfs_inseridos = {r['cpf'] for r in inseridos}
+        nao_inseridas = ~validas['cpf'].isin(cpfs_inseridos)
+        resultado['erros'].extend((linha, "CPF ou e-mail já cadastrado") for linha in validas.index[nao_inseridas])
+
+        resultado['inseridos'].extend(inseridos)
+        resultado['importados'] += len(inseridos)
+        resultado['total'] += len(bloco)
+        primeira_linha += len(bloco)
+
+        if on_progress:
+            on_progress(resultado)
+
+    resultado['erros'].sort()
+    return resultado
+
+def errors_to_csv(erros):
+    """Relatório de erros (linha, mensagem) em CSV"""
+    buffer = io.StringIO()
+    pd.DataFrame(erros, columns=['linha', 'erro']).to_csv(buffer, index=False)
+    return buffer.getvalue().encode('utf-8-sig')